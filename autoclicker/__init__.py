@@ -0,0 +1,37 @@
+"""
+Python Auto Clicker.
+
+The click engine and settings can be imported without pulling in tkinter;
+the GUI lives in autoclicker.gui and is only loaded when it is launched.
+The names below are imported from their modules the first time they are
+used, so importing the package itself costs next to nothing and `python -m
+autoclicker` only loads what the chosen command needs.
+"""
+import importlib
+
+# Public name -> module it lives in
+_EXPORTS = {
+    'AsyncClicker': 'aio',
+    'KeyboardBackend': 'backends', 'MouseBackend': 'backends', 'PynputBackend': 'backends',
+    'PynputKeyboardBackend': 'backends', 'RecordingBackend': 'backends',
+    'ClickEngine': 'engine',
+    'ClickJob': 'jobs', 'JobScheduler': 'jobs',
+    'MacroPlayer': 'macro', 'MacroRecorder': 'macro',
+    'ProcessEngine': 'process',
+    'ProfileStore': 'profiles',
+    'DeadlineScheduler': 'scheduler',
+    'ClickSettings': 'settings', 'get_click_interval': 'settings', 'read_config': 'settings',
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,573 @@
+"""
+Command line entry point.
+
+    python -m autoclicker                 launch the GUI
+    python -m autoclicker run [options]   click headless, without loading tkinter
+    python -m autoclicker jobs [NAME...]  run the jobs saved in the config file side by side
+    python -m autoclicker bench [options] measure click timing against a fake mouse
+    python -m autoclicker record FILE     record mouse and keyboard input into a macro
+    python -m autoclicker play FILE       play a recorded macro back
+    python -m autoclicker script FILE     check a click script and list its compiled ops
+    python -m autoclicker sessions PATH...
+                                          summarize session logs
+    python -m autoclicker control SOCKET COMMAND...
+                                          send commands to a running clicker's control socket
+
+The headless runner reads the same auto_clicker_settings.cfg keys as the GUI;
+options given on the command line override the values from the file.
+"""
+import argparse
+import sys
+import time
+
+from .settings import ClickSettings, read_config
+
+# Seconds between two refreshes of the headless status line
+STATUS_REFRESH = 0.25
+
+def build_parser():
+    """Creates the argument parser for the command line interface."""
+    parser = argparse.ArgumentParser(prog='python -m autoclicker', description="Python Auto Clicker")
+    subparsers = parser.add_subparsers(dest='command')
+    gui = subparsers.add_parser('gui', help="launch the graphical interface (default)")
+    gui.add_argument('--timings', action='store_true',
+                     help="print how long the imports, first paint and hotkey arming took")
+
+    run = subparsers.add_parser('run', help="click headless using the saved settings")
+    run.add_argument('--config', help="settings file to read (default: the one the GUI uses)")
+    run.add_argument('--profile', help="settings profile to use (default: the one selected in the GUI)")
+    speed = run.add_mutually_exclusive_group()
+    speed.add_argument('--cps', type=float, help="clicks per second")
+    speed.add_argument('--cpm', type=float, help="clicks per minute")
+    speed.add_argument('--ms', type=float, help="interval between clicks in milliseconds")
+    speed.add_argument('--seconds', type=float, help="interval between clicks in seconds")
+    run.add_argument('--count', type=int, help="stop after this many clicks (default: infinite)")
+    run.add_argument('--at', metavar='X,Y', help="click at a fixed screen position")
+    run.add_argument('--sequence', metavar='TARGETS',
+                     help="click a sequence of targets, e.g. '100,200;300,400,right,double,0.5,3'")
+    run.add_argument('--button', choices=['left', 'right', 'middle', 'x1', 'x2'], help="mouse button to click")
+    click = run.add_mutually_exclusive_group()
+    click.add_argument('--double', action='store_true', help="double-click instead of single click")
+    click.add_argument('--hold', type=float, metavar='SECONDS', help="press and hold the button this long on each click")
+    click.add_argument('--drag', metavar='X,Y', help="drag from the click location to this position on each click")
+    click.add_argument('--burst', type=int, metavar='N', help="click N times as fast as possible on each click")
+    run.add_argument('--drag-time', type=float, metavar='SECONDS', help="how long each drag takes")
+    run.add_argument('--delay', type=float, help="pre-start delay in seconds")
+    run.add_argument('--random', metavar='MIN,MAX', help="random interval range in seconds")
+    run.add_argument('--distribution', choices=['uniform', 'normal', 'exponential', 'lognormal'],
+                     help="distribution of random intervals")
+    run.add_argument('--seed', type=int, help="seed for reproducible random intervals")
+    run.add_argument('--precise', action='store_true', help="busy-wait before each click for sub-millisecond timing")
+    run.add_argument('--catch-up', choices=['skip', 'burst'], help="policy for clicks missed while stalled")
+    run.add_argument('--adaptive', action='store_true', help="correct the rate for slow or jittery mouse calls")
+    run.add_argument('--motion', choices=['off', 'bezier', 'minimum_jerk'],
+                     help="move the cursor to fixed or sequence targets along a humanized path")
+    run.add_argument('--motion-time', type=float, help="seconds before each click the movement starts")
+    run.add_argument('--motion-rate', type=float, help="cursor moves per second along the path")
+    run.add_argument('--motion-jitter', type=float, help="hand tremor along the path in pixels")
+    run.add_argument('--trigger', choices=['off', 'color', 'template', 'change'],
+                     help="only click when a screen region matches or changes")
+    run.add_argument('--region', metavar='X,Y,W,H', help="screen region the trigger watches")
+    run.add_argument('--color', metavar='COLOR', help="color a color trigger looks for, as #rrggbb or r,g,b")
+    run.add_argument('--template', metavar='FILE', help="PPM image a template trigger compares the region with")
+    run.add_argument('--tolerance', type=int, help="largest difference per color channel still counted as equal")
+    run.add_argument('--trigger-rate', type=float, help="times per second the region is sampled")
+    run.add_argument('--trigger-action', choices=['click', 'next'],
+                     help="hold clicks until the trigger fires, or move to the next sequence target when it does")
+    run.add_argument('--script', metavar='FILE', help="run a click script instead of the click settings")
+    run.add_argument('--keys', help="press keys on every tick instead of clicking, e.g. 'space', 'ctrl+c' or '\"text\" enter'")
+    run.add_argument('--dry-run', action='store_true', help="record clicks in memory instead of moving the real mouse")
+    run.add_argument('--process', action='store_true', help="click from a separate child process")
+    run.add_argument('--metrics-port', type=int, help="serve Prometheus metrics on 127.0.0.1 at this port")
+    run.add_argument('--metrics-file', help="write Prometheus metrics to this file every few seconds")
+    run.add_argument('--trace', metavar='FILE',
+                     help="record the duration of every phase of every click and save it on stop "
+                          "(Chrome trace JSON if FILE ends in .json, CSV otherwise)")
+    run.add_argument('--trace-size', type=int, default=100000,
+                     help="clicks kept in the trace; older ones are dropped (default: %(default)s)")
+    run.add_argument('--session-log', metavar='DIR', help="log every click of the run to a new file in this directory")
+    run.add_argument('--control-socket', metavar='PATH', help="accept control commands on this Unix domain socket")
+    run.add_argument('--quiet', action='store_true', help="only print the final summary")
+
+    jobs = subparsers.add_parser('jobs', help="run the jobs saved in the config file side by side")
+    jobs.add_argument('names', nargs='*', metavar='NAME', help="jobs to run (default: all of them)")
+    jobs.add_argument('--config', help="settings file to read (default: the one the GUI uses)")
+    jobs.add_argument('--dry-run', action='store_true', help="record clicks in memory instead of moving the real mouse")
+    jobs.add_argument('--quiet', action='store_true', help="only print the final summary")
+
+    bench = subparsers.add_parser('bench', help="benchmark click timing with an in-memory mouse")
+    bench.add_argument('--repeats', type=int, default=1, help="times to run each case (default: %(default)s)")
+    bench.add_argument('--quick', action='store_true', help="run a tenth of the clicks per case")
+    bench.add_argument('--output', metavar='FILE', help="write the results to a JSON baseline")
+    bench.add_argument('--compare', metavar='FILE', help="fail if the results regress against a baseline")
+    bench.add_argument('--reaction', action='store_true', help="also measure how fast screen triggers react")
+
+    record = subparsers.add_parser('record', help="record mouse and keyboard input into a macro file")
+    record.add_argument('file', help="macro file to create")
+    record.add_argument('--stop-key', default='esc', help="key that ends the recording (default: %(default)s)")
+    record.add_argument('--no-moves', action='store_true', help="only record clicks, scrolls and keys")
+    record.add_argument('--delay', type=float, default=0.0, help="seconds to wait before recording")
+
+    play = subparsers.add_parser('play', help="play a recorded macro file")
+    play.add_argument('file', help="macro file to play")
+    play.add_argument('--speed', type=float, default=1.0, help="playback speed, 0.25 to 10 (default: %(default)s)")
+    play.add_argument('--repeat', type=int, default=1, help="times to play the macro, 0 for forever (default: %(default)s)")
+    play.add_argument('--delay', type=float, default=0.0, help="seconds to wait before playing")
+    play.add_argument('--precise', action='store_true', help="busy-wait before each event for sub-millisecond timing")
+    play.add_argument('--dry-run', action='store_true', help="record events in memory instead of driving the real devices")
+
+    script = subparsers.add_parser('script', help="check a click script, or write the click settings as one")
+    script.add_argument('file', nargs='?', help="script to compile and list")
+    script.add_argument('--export', action='store_true', help="print the click settings as a script instead")
+    script.add_argument('--config', help="settings file to read for --export (default: the one the GUI uses)")
+    script.add_argument('--profile', help="settings profile to export (default: the one selected in the GUI)")
+
+    sessions = subparsers.add_parser('sessions', help="summarize session logs")
+    sessions.add_argument('paths', nargs='+', metavar='PATH', help="session log files or directories of them")
+    sessions.add_argument('--bucket', type=float, default=3600.0,
+                          help="seconds per row of the clicks-over-time table (default: %(default)s)")
+
+    control = subparsers.add_parser('control', help="send commands to a running clicker's control socket")
+    control.add_argument('socket', help="path of the control socket")
+    control.add_argument('commands', nargs='+', metavar='COMMAND',
+                         help="commands such as start, stop, pause, resume, 'interval 20 cps', 'location 500 300' or stats")
+    return parser
+
+def settings_from_args(args):
+    """Merges the config file with the command line overrides into ClickSettings."""
+    values = read_config(args.config, args.profile)
+    for unit in ('cps', 'cpm', 'ms', 'seconds'):
+        value = getattr(args, unit)
+        if value is not None:
+            values['interval'] = str(value)
+            values['interval_unit'] = unit
+    if args.count is not None:
+        values['repeat'] = 'count'
+        values['repeat_count'] = str(args.count)
+    if args.at:
+        try:
+            x, y = args.at.split(',')
+        except ValueError:
+            raise ValueError("--at expects a position like 500,300")
+        values['location'] = 'fixed'
+        values['fixed_location_x'] = x.strip()
+        values['fixed_location_y'] = y.strip()
+    if args.random:
+        try:
+            low, high = args.random.split(',')
+        except ValueError:
+            raise ValueError("--random expects a range like 0.1,0.5")
+        values['random_interval_enabled'] = 'True'
+        values['random_interval_min'] = low.strip()
+        values['random_interval_max'] = high.strip()
+    if args.distribution:
+        values['random_distribution'] = args.distribution
+    if args.seed is not None:
+        values['random_seed'] = str(args.seed)
+    if args.sequence:
+        values['location'] = 'sequence'
+        values['sequence'] = args.sequence
+    if args.button:
+        values['mouse_button'] = args.button
+    if args.double:
+        values['click_type'] = 'double'
+    if args.hold is not None:
+        values['click_type'] = 'hold'
+        values['hold_time'] = str(args.hold)
+    if args.drag:
+        values['click_type'] = 'drag'
+        values['drag_to'] = args.drag
+    if args.drag_time is not None:
+        values['hold_time'] = str(args.drag_time)
+    if args.burst is not None:
+        values['click_type'] = 'burst'
+        values['burst_count'] = str(args.burst)
+    if args.delay is not None:
+        values['pre_start_delay'] = str(args.delay)
+    if args.precise:
+        values['precise_timing'] = 'True'
+    if args.catch_up:
+        values['catch_up'] = args.catch_up
+    if args.adaptive:
+        values['adaptive_rate'] = 'True'
+    if args.motion:
+        values['motion'] = args.motion
+    for key in ('motion_time', 'motion_rate', 'motion_jitter'):
+        if getattr(args, key) is not None:
+            values[key] = str(getattr(args, key))
+    for key, value in (('trigger', args.trigger), ('trigger_region', args.region), ('trigger_color', args.color),
+                       ('trigger_template', args.template), ('trigger_tolerance', args.tolerance),
+                       ('trigger_rate', args.trigger_rate), ('trigger_action', args.trigger_action)):
+        if value is not None:
+            values[key] = str(value)
+    if args.script:
+        values['script'] = args.script
+    if args.keys:
+        values['keys'] = args.keys
+    return ClickSettings.from_config(values)
+
+def run_headless(args):
+    """Runs the click engine in the foreground until done or interrupted."""
+    from .engine import ClickEngine
+    from .metrics import MetricsServer, start_exporters
+    from .telemetry import StatusPoller
+
+    try:
+        settings = settings_from_args(args)
+    except ValueError as e:
+        print(f"Invalid input: {e}", file=sys.stderr)
+        return 2
+
+    # Highest rate the backend allowed whenever adaptive mode fell short of the target
+    limits = []
+
+    def show(status):
+        if status.state == 'limited' and status.detail:
+            limits.append(status.detail)
+        if args.quiet:
+            return
+        if status.state == 'starting':
+            print(f"Starting in {status.detail}s...", flush=True)
+        elif status.state == 'paused':
+            print("\nPaused", flush=True)
+        elif status.state == 'limited':
+            limit = f"~{status.detail:.0f}" if status.detail else "the"
+            print(f"\rClicking... {status.clicks} clicks (~{status.cps:.2f} CPS, limited to {limit} CPS by the mouse backend, "
+                  f"Ctrl+C to stop)", end='', flush=True)
+        elif status.state == 'clicking':
+            print(f"\rClicking... {status.clicks} clicks (~{status.cps:.2f} CPS, Ctrl+C to stop)", end='', flush=True)
+
+    trace = None
+    if args.trace:
+        if args.process:
+            print("Invalid input: --trace can't be combined with --process", file=sys.stderr)
+            return 2
+        from .trace import PhaseTrace
+        try:
+            trace = PhaseTrace(args.trace_size, args.trace)
+        except ValueError as e:
+            print(f"Invalid input: {e}", file=sys.stderr)
+            return 2
+
+    session_log = None
+    if args.session_log:
+        from .sessionlog import SessionLog
+        session_log = SessionLog(args.session_log)
+
+    backend = None
+    if args.process:
+        from .process import ProcessEngine
+        backend_factory = None
+        if args.dry_run:
+            from .backends import RecordingBackend
+            backend_factory = RecordingBackend
+        engine = ProcessEngine(backend_factory, session_log)
+    else:
+        if args.dry_run:
+            from .backends import RecordingBackend
+            backend = RecordingBackend()
+        engine = ClickEngine(backend=backend, trace=trace, session_log=session_log)
+    poller = StatusPoller(engine)
+    try:
+        exporters = start_exporters(engine, args.metrics_port, args.metrics_file)
+    except (OSError, ValueError) as e:
+        print(f"Could not start metrics export: {e}", file=sys.stderr)
+        engine.close()
+        return 2
+    for exporter in exporters:
+        if isinstance(exporter, MetricsServer) and not args.quiet:
+            print(f"Serving metrics at {exporter.url}", flush=True)
+    if args.control_socket:
+        from .control import ControlServer, ControlTarget
+        try:
+            exporters.append(ControlServer(args.control_socket, ControlTarget(engine, lambda: settings)).start())
+        except OSError as e:
+            print(f"Could not open the control socket: {e}", file=sys.stderr)
+            for exporter in exporters:
+                exporter.stop()
+            engine.close()
+            return 2
+        if not args.quiet:
+            print(f"Listening for control commands on {args.control_socket}", flush=True)
+    engine.start(settings)
+    try:
+        # Wait in short slices so Ctrl+C is delivered on every platform,
+        # and refresh the status line between them. With a control socket the
+        # runner stays up after a run ends, as it may be started again.
+        while True:
+            finished = engine.wait(STATUS_REFRESH)
+            show(poller.poll())
+            if finished and not args.control_socket:
+                break
+    except KeyboardInterrupt:
+        engine.stop()
+    finally:
+        for exporter in exporters:
+            try:
+                exporter.stop()
+            except OSError as e:
+                print(f"Could not stop {type(exporter).__name__}: {e}", file=sys.stderr)
+    if not args.quiet:
+        print()
+    for exporter in exporters:
+        if getattr(exporter, 'error', None):
+            print(f"Could not write the metrics file: {exporter.error}", file=sys.stderr)
+    try:
+        error = engine.status.current()[2]
+        if error:
+            print(f"Error: {error}", file=sys.stderr)
+        summary = f"Stopped after {engine.clicks_done} clicks (~{engine.achieved_cps():.2f} CPS)"
+        if engine.control_latency is not None:
+            summary += f", stop took {engine.control_latency * 1000:.3f} ms"
+        if engine.random_seed is not None:
+            summary += f", random seed {engine.random_seed}"
+        print(summary)
+        if limits:
+            print(f"The target speed was out of reach: the mouse backend allowed at most ~{min(limits):.0f} CPS")
+        if error:
+            return 1
+        for title, histogram in (('interval', engine.metrics.interval), ('lateness', engine.metrics.lateness),
+                                 ('backend call', engine.metrics.backend)):
+            if histogram.count:
+                p50, p99 = histogram.percentiles((0.5, 0.99))
+                print(f"  {title:<13} p50 {p50 * 1000:.3f} ms  p99 {p99 * 1000:.3f} ms  max {histogram.max * 1000:.3f} ms")
+        burst = engine.metrics.burst
+        if burst.count:
+            p50, p99 = burst.percentiles((0.5, 0.99))
+            if p50 > 0 and burst.min:
+                print(f"Burst rate over {burst.count} bursts: ~{1 / p50:.0f} CPS at p50, ~{1 / p99:.0f} CPS at p99, "
+                      f"~{1 / burst.min:.0f} CPS at best")
+        if trace is not None and len(trace):
+            means = trace.phase_means()
+            print(f"Trace of the last {len(trace)} clicks written to {args.trace}; mean per click: "
+                  + ", ".join(f"{name} {value * 1e6:.1f} us" for name, value in means.items()))
+        if backend is not None:
+            intervals = backend.click_intervals()
+            if intervals:
+                mean = sum(intervals) / len(intervals)
+                print(f"Recorded {len(backend.click_times())} clicks, mean interval {mean * 1000:.3f} ms "
+                      f"(min {min(intervals) * 1000:.3f} ms, max {max(intervals) * 1000:.3f} ms)")
+            key_presses = backend.kinds.count(backend.KEY_PRESS)
+            if key_presses:
+                print(f"Recorded {key_presses} key presses")
+        return 0
+    finally:
+        # Frees the shared memory of a ProcessEngine, so only after the summary
+        engine.close()
+
+def run_jobs(args):
+    """Runs several saved jobs on one timer thread until they finish or are interrupted."""
+    from .jobs import JobScheduler
+    from .settings import config_path, read_jobs
+
+    config_file = args.config or config_path()
+    saved = read_jobs(config_file)
+    unknown = set(args.names) - {name for name, _ in saved}
+    if unknown:
+        print(f"Invalid input: no job named {', '.join(sorted(unknown))} in {config_file}", file=sys.stderr)
+        return 2
+    if not saved:
+        print(f"Invalid input: {config_file} has no [JOB <name>] sections", file=sys.stderr)
+        return 2
+    backend = None
+    if args.dry_run:
+        from .backends import RecordingBackend
+        backend = RecordingBackend()
+    scheduler = JobScheduler(backend)
+    for name, values in saved:
+        if args.names and name not in args.names:
+            continue
+        try:
+            scheduler.add_job(ClickSettings.from_config(values), name)
+        except ValueError as e:
+            print(f"Invalid input in job {name}: {e}", file=sys.stderr)
+            return 2
+
+    scheduler.start_all()
+    try:
+        while any(job.clicking for job in scheduler.jobs):
+            for job in scheduler.jobs:
+                job.wait(STATUS_REFRESH / len(scheduler.jobs))
+            if not args.quiet:
+                line = ", ".join(f"{job.name}: {job.clicks_done}" for job in scheduler.jobs)
+                print(f"\rClicks - {line} (Ctrl+C to stop)", end='', flush=True)
+    except KeyboardInterrupt:
+        pass
+    scheduler.shutdown()
+    if not args.quiet:
+        print()
+    failed = False
+    for job in scheduler.jobs:
+        error = job.status.current()[2]
+        p50, p99 = job.metrics.lateness.percentiles((0.5, 0.99))
+        print(f"{job.name}: {job.clicks_done} clicks (~{job.achieved_cps():.2f} CPS), "
+              f"lateness p50 {p50 * 1000:.3f} ms  p99 {p99 * 1000:.3f} ms" + (f", error: {error}" if error else ""))
+        failed = failed or bool(error)
+    return 1 if failed else 0
+
+def run_bench(args):
+    """Runs the benchmark suite and optionally records or checks a baseline."""
+    from . import bench
+
+    results = bench.run_suite(repeats=args.repeats, scale=0.1 if args.quick else 1.0)
+    if args.reaction:
+        print()
+        bench.run_reaction_suite()
+    if args.output:
+        bench.write_baseline(results, args.output)
+        print(f"Baseline written to {args.output}")
+    if args.compare:
+        regressions = bench.compare(results, args.compare)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+def run_record(args):
+    """Records a macro until the stop key or Ctrl+C is pressed."""
+    from .macro import MacroRecorder
+
+    if args.delay > 0:
+        print(f"Recording in {args.delay}s...", flush=True)
+        time.sleep(args.delay)
+    recorder = MacroRecorder(args.file, stop_key=args.stop_key, record_moves=not args.no_moves).start()
+    print(f"Recording to {args.file}, press {args.stop_key} to stop", flush=True)
+    try:
+        while not recorder.wait(STATUS_REFRESH):
+            pass
+    except KeyboardInterrupt:
+        pass
+    count = recorder.stop()
+    print(f"Recorded {count} events")
+    return 0
+
+def run_play(args):
+    """Plays a macro in the foreground until done or interrupted."""
+    from .macro import MacroPlayer, macro_info
+
+    mouse = keyboard = None
+    if args.dry_run:
+        from .backends import RecordingBackend
+        mouse = keyboard = RecordingBackend()
+    try:
+        count, duration = macro_info(args.file)
+        player = MacroPlayer(mouse, keyboard, speed=args.speed, precise=args.precise)
+    except (OSError, ValueError) as e:
+        print(f"Invalid input: {e}", file=sys.stderr)
+        return 2
+    print(f"Playing {count} events ({duration / args.speed:.1f}s at {args.speed:g}x), Ctrl+C to stop", flush=True)
+    if args.delay > 0:
+        time.sleep(args.delay)
+    player.start(args.file, args.repeat)
+    try:
+        while player.thread.is_alive():
+            player.thread.join(STATUS_REFRESH)
+    except KeyboardInterrupt:
+        player.stop()
+    p50, p99 = player.lateness.percentiles((0.5, 0.99))
+    print(f"Played {player.events_played} events ({player.moves_merged} late moves merged), "
+          f"lateness p50 {p50 * 1000:.3f} ms  p99 {p99 * 1000:.3f} ms  max {player.lateness.max * 1000:.3f} ms")
+    return 0
+
+def run_script(args):
+    """Compiles a click script and prints its ops, or prints the click settings as a script."""
+    from .script import read_script, script_from_settings
+
+    try:
+        if args.export:
+            print(script_from_settings(ClickSettings.from_config(read_config(args.config, args.profile))), end='')
+            return 0
+        if not args.file:
+            print("Name a script to check, or use --export.", file=sys.stderr)
+            return 2
+        program = read_script(args.file)
+    except ValueError as e:
+        print(f"Invalid input: {e}", file=sys.stderr)
+        return 2
+    print(program.disassemble())
+    print(f"{len(program)} ops, {program.counters} repeat counters")
+    return 0
+
+def format_duration(seconds):
+    """Formats a duration as hours, minutes and seconds, leaving out leading zero units."""
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m {seconds}s"
+
+def run_sessions(args):
+    """Prints totals, clicks over time and timing percentiles of session logs."""
+    from .sessionlog import summarize
+
+    if args.bucket <= 0:
+        print("Invalid input: --bucket must be positive", file=sys.stderr)
+        return 2
+    try:
+        summary = summarize(args.paths, args.bucket)
+    except (OSError, ValueError) as e:
+        print(f"Could not read the session logs: {e}", file=sys.stderr)
+        return 2
+    if not summary.sessions:
+        print("No session logs found.")
+        return 1
+    print(f"{summary.sessions} sessions from {time.strftime('%Y-%m-%d %H:%M', time.localtime(summary.first))} "
+          f"to {time.strftime('%Y-%m-%d %H:%M', time.localtime(summary.last))}, "
+          f"{summary.errors} ended with an error, {summary.unfinished} never finished")
+    keys = f" and {summary.keystrokes} key strokes" if summary.key_ticks else ""
+    print(f"{summary.clicks} clicks{keys} in {format_duration(summary.clicking_time)} of clicking "
+          f"(~{summary.average_cps():.2f} CPS), paused {summary.pauses} times for {format_duration(summary.paused_time)}")
+    for name, histogram in (('lateness', summary.lateness), ('interval', summary.interval)):
+        p50, p90, p99, p999 = histogram.percentiles((0.5, 0.9, 0.99, 0.999))
+        print(f"  {name:<10}p50 {p50 * 1000:.3f} ms  p90 {p90 * 1000:.3f} ms  p99 {p99 * 1000:.3f} ms  "
+              f"p99.9 {p999 * 1000:.3f} ms  max {histogram.max * 1000:.3f} ms")
+    print(f"Clicks per {format_duration(args.bucket)}:")
+    for start in sorted(summary.buckets):
+        clicks = summary.buckets[start]
+        print(f"  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start))}  {clicks:>10}  "
+              f"(~{clicks / args.bucket:.2f} CPS)")
+    return 0
+
+def run_control(args):
+    """Sends commands to a control socket and prints the responses."""
+    from .control import send_commands
+
+    try:
+        responses = send_commands(args.socket, args.commands)
+    except OSError as e:
+        print(f"Could not reach {args.socket}: {e}", file=sys.stderr)
+        return 2
+    for response in responses:
+        print(response)
+    return 1 if any(response.startswith('err') for response in responses) else 0
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == 'run':
+        return run_headless(args)
+    if args.command == 'jobs':
+        return run_jobs(args)
+    if args.command == 'bench':
+        return run_bench(args)
+    if args.command == 'record':
+        return run_record(args)
+    if args.command == 'play':
+        return run_play(args)
+    if args.command == 'script':
+        return run_script(args)
+    if args.command == 'sessions':
+        return run_sessions(args)
+    if args.command == 'control':
+        return run_control(args)
+    # Startup is timed from here, so the report covers importing tkinter and the GUI
+    started_at = time.perf_counter()
+    from .gui import main as gui_main
+    gui_main(started_at, show_timings=getattr(args, 'timings', False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+asyncio interface for embedding the clicker in other programs.
+
+    scheduler = JobScheduler()
+    async with AsyncClicker(settings, scheduler) as clicker:
+        task = asyncio.create_task(clicker.run())
+        async for status in clicker.stream_stats(0.5):
+            print(status.clicks, status.cps)
+
+Each AsyncClicker is a ClickJob on a JobScheduler, so any number of
+clickers driven from one event loop share that scheduler's single timer
+thread; none of them starts a thread of its own, and awaiting never blocks
+the loop. Clickers created without a scheduler share one module-wide
+scheduler that drives the real mouse.
+
+The event loop is woken through a StatusChannel listener, which the timer
+thread calls on state changes only (start, pause, stop and so on), never per
+click. Click counts are read from the job when stats are streamed, exactly
+like a StatusPoller does for the GUI.
+"""
+import asyncio
+import threading
+
+from .jobs import JobScheduler
+from .settings import ClickSettings
+from .telemetry import Status, StatusPoller
+
+_shared_scheduler = None
+_shared_lock = threading.Lock()
+
+def shared_scheduler():
+    """The JobScheduler used by AsyncClickers created without one, created on first use."""
+    global _shared_scheduler
+    with _shared_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = JobScheduler()
+        return _shared_scheduler
+
+def _to_settings(settings):
+    """Accepts ClickSettings or a dict of config file values."""
+    if settings is None or isinstance(settings, ClickSettings):
+        return settings
+    return ClickSettings.from_config(settings)
+
+class AsyncClicker:
+    """
+    One clicking session controlled with coroutines.
+
+    settings may be ClickSettings or a dict of config file values (see
+    ClickSettings.from_config), and can also be given, or replaced, by
+    run() and start(). The job behind the clicker is available as job, for
+    its metrics or to watch it with a StatusPoller.
+
+    Control coroutines return once the timer thread has acted on the
+    request. Cancelling one of them doesn't undo the request, except for
+    run(): cancelling it stops the clicker.
+    """
+    def __init__(self, settings=None, scheduler=None, name=None):
+        self.scheduler = scheduler if scheduler is not None else shared_scheduler()
+        self.job = self.scheduler.add_job(_to_settings(settings), name)
+        self._loop = None
+        self._waiters = set()
+        self.job.status.subscribe(self._on_publish)
+
+    def __repr__(self):
+        return f"AsyncClicker({self.job.name!r})"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+    # --- Stats ---
+    @property
+    def clicking(self):
+        return self.job.clicking
+
+    @property
+    def paused(self):
+        return self.job.paused
+
+    @property
+    def clicks_done(self):
+        return self.job.clicks_done
+
+    @property
+    def metrics(self):
+        return self.job.metrics
+
+    def status(self):
+        """A Status snapshot of the clicker; cps is 0, as it needs a previous poll to compare with."""
+        job = self.job
+        state, detail, error = job.status.current()
+        return Status(state, detail, job.clicks_done, 0.0, job.achieved_cps(), error)
+
+    async def stream_stats(self, interval=0.25):
+        """
+        Yields a Status every interval seconds and on every state change while
+        the clicker runs, ending with the status it stopped with. If it isn't
+        running, yields the current status once.
+        """
+        self._bind_loop()
+        poller = StatusPoller(self.job)
+        while True:
+            status = poller.poll()
+            yield status
+            if self._stopped():
+                return
+            await self._changed(interval)
+
+    # --- Control ---
+    def start(self, settings=None):
+        """Starts clicking without waiting. Returns False if already running."""
+        self._bind_loop()
+        settings = _to_settings(settings)
+        if settings is None and self.job.settings is None:
+            raise ValueError("No click settings given.")
+        return self.job.start(settings)
+
+    async def run(self, settings=None):
+        """
+        Clicks until stopped or the repeat count is reached and returns the
+        final Status; its error field holds the message of an exception that
+        ended the run. Cancelling run() stops the clicker.
+        """
+        self.start(settings)
+        try:
+            await self.wait()
+        except asyncio.CancelledError:
+            self.job.stop()
+            raise
+        return self.status()
+
+    async def wait(self):
+        """Waits until the clicker has stopped."""
+        self._bind_loop()
+        while not self._stopped():
+            await self._changed()
+
+    async def stop(self):
+        """Stops clicking and waits until the clicker has stopped."""
+        self.job.stop()
+        await self.wait()
+
+    async def pause(self):
+        """Pauses clicking and waits until the clicker has paused."""
+        self._bind_loop()
+        self.job.pause()
+        while self.job.clicking and self.job.status.current()[0] != 'paused':
+            await self._changed()
+
+    async def resume(self):
+        """Resumes clicking after pause() and waits until the clicker is running again."""
+        self._bind_loop()
+        self.job.resume()
+        while self.job.clicking and self.job.status.current()[0] == 'paused':
+            await self._changed()
+
+    async def close(self):
+        """Stops the clicker and removes its job from the scheduler."""
+        await self.stop()
+        self.job.status.unsubscribe(self._on_publish)
+        if self.job in self.scheduler.jobs:
+            self.scheduler.remove_job(self.job)
+
+    # --- Waking the event loop ---
+    def _stopped(self):
+        return not self.job.clicking and self.job.status.current()[0] in ('idle', 'stopped')
+
+    def _bind_loop(self):
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+
+    def _on_publish(self, state, detail, error):
+        """Runs on the timer thread; hands the wake-up to the event loop."""
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._wake)
+            except RuntimeError:
+                # The loop has been closed
+                pass
+
+    def _wake(self):
+        waiters, self._waiters = self._waiters, set()
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def _changed(self, timeout=None):
+        """Waits for the next state change, or at most timeout seconds."""
+        waiter = self._loop.create_future()
+        self._waiters.add(waiter)
+        try:
+            if timeout is None:
+                await waiter
+            else:
+                await asyncio.wait((waiter,), timeout=timeout)
+        finally:
+            self._waiters.discard(waiter)
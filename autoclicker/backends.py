@@ -0,0 +1,270 @@
+"""
+Mouse and keyboard backends the click engine drives.
+
+The engine only talks to a MouseBackend (and a KeyboardBackend for key
+events), so the real pynput devices can be swapped for RecordingBackend,
+which keeps every event in memory instead of touching the screen. That
+makes it possible to run the real scheduler at thousands of CPS on a box
+without a display and check the timing it produced.
+"""
+import time
+from array import array
+
+# Button names understood by every backend. x1 and x2 are the side (back and
+# forward) buttons; not every platform has them.
+BUTTON_NAMES = ('left', 'right', 'middle', 'x1', 'x2')
+
+# pynput button names of the side buttons: Windows calls them x1 and x2, X11 button8 and button9
+EXTRA_BUTTONS = {'x1': ('x1', 'button8'), 'x2': ('x2', 'button9')}
+
+def button_to_name(button):
+    """The BUTTON_NAMES name of a button reported by a pynput listener, or None."""
+    name = getattr(button, 'name', None)
+    for extra, members in EXTRA_BUTTONS.items():
+        if name in members:
+            return extra
+    return name if name in BUTTON_NAMES else None
+
+def resolve_buttons(backend, used):
+    """
+    Resolves the buttons whose BUTTON_NAMES index is in used, leaving None for
+    the others, so a side button the platform lacks only fails if it is clicked.
+    """
+    return [backend.resolve_button(name) if index in used else None for index, name in enumerate(BUTTON_NAMES)]
+
+def key_from_name(name):
+    """
+    Converts a key name to a pynput key: a pynput Key member name such as
+    'f6' or 'shift', a single character, or '<vk>' for a raw virtual key code.
+    """
+    from pynput.keyboard import Key, KeyCode
+    if not name:
+        raise ValueError("Key name cannot be empty.")
+    if name.startswith('<') and name.endswith('>') and name[1:-1].isdigit():
+        return KeyCode.from_vk(int(name[1:-1]))
+    try:
+        return Key[name.lower()]
+    except KeyError:
+        pass
+    if len(name) == 1:
+        return KeyCode.from_char(name)
+    raise ValueError(f"Unknown key: {name}")
+
+def key_to_name(key):
+    """The inverse of key_from_name for keys reported by a pynput listener, or None."""
+    name = getattr(key, 'name', None)
+    if name:
+        return name
+    char = getattr(key, 'char', None)
+    if char:
+        return char
+    vk = getattr(key, 'vk', None)
+    return f"<{vk}>" if vk is not None else None
+
+class MouseBackend:
+    """
+    Interface of a mouse backend.
+
+    Buttons are passed to resolve_button() by name once, before clicking
+    starts; the value it returns is what click(), press() and release() get,
+    so backends can skip name lookups in the hot loop.
+    """
+    def resolve_button(self, name):
+        """Converts a button name into the backend's own button value."""
+        raise NotImplementedError
+
+    def click(self, button, count=1):
+        """Clicks the button count times at the current position."""
+        raise NotImplementedError
+
+    def double_click(self, button):
+        """Double-clicks the button at the current position."""
+        self.click(button, 2)
+
+    def move(self, x, y):
+        """Moves the cursor to an absolute screen position."""
+        raise NotImplementedError
+
+    def press(self, button):
+        """Presses the button without releasing it."""
+        raise NotImplementedError
+
+    def release(self, button):
+        """Releases a pressed button."""
+        raise NotImplementedError
+
+    def scroll(self, dx, dy):
+        """Scrolls by dx steps horizontally and dy steps vertically."""
+        raise NotImplementedError
+
+    @property
+    def position(self):
+        """The current cursor position as an (x, y) tuple."""
+        raise NotImplementedError
+
+class PynputBackend(MouseBackend):
+    """Drives the real mouse through pynput."""
+    def __init__(self, controller=None):
+        # Imported here so merely importing the package never needs a display
+        from pynput.mouse import Button, Controller
+        self._buttons = Button
+        self.controller = controller if controller is not None else Controller()
+
+    def resolve_button(self, name):
+        for member in EXTRA_BUTTONS.get(name, (name,)):
+            try:
+                return self._buttons[member]
+            except KeyError:
+                pass
+        if name in EXTRA_BUTTONS:
+            raise ValueError(f"This platform has no {name} mouse button.")
+        raise ValueError(f"Unknown mouse button: {name}")
+
+    def click(self, button, count=1):
+        self.controller.click(button, count)
+
+    def move(self, x, y):
+        self.controller.position = (x, y)
+
+    def press(self, button):
+        self.controller.press(button)
+
+    def release(self, button):
+        self.controller.release(button)
+
+    def scroll(self, dx, dy):
+        self.controller.scroll(dx, dy)
+
+    @property
+    def position(self):
+        return self.controller.position
+
+class KeyboardBackend:
+    """
+    Interface of a keyboard backend.
+
+    Keys are passed to resolve_key() by name (see key_from_name) once; the
+    value it returns is what press_key() and release_key() get.
+    """
+    def resolve_key(self, name):
+        """Converts a key name into the backend's own key value."""
+        raise NotImplementedError
+
+    def press_key(self, key):
+        """Presses a key without releasing it."""
+        raise NotImplementedError
+
+    def release_key(self, key):
+        """Releases a pressed key."""
+        raise NotImplementedError
+
+class PynputKeyboardBackend(KeyboardBackend):
+    """Drives the real keyboard through pynput."""
+    def __init__(self, controller=None):
+        from pynput.keyboard import Controller
+        self.controller = controller if controller is not None else Controller()
+
+    def resolve_key(self, name):
+        return key_from_name(name)
+
+    def press_key(self, key):
+        self.controller.press(key)
+
+    def release_key(self, key):
+        self.controller.release(key)
+
+class RecordingBackend(MouseBackend, KeyboardBackend):
+    """
+    In-memory mouse and keyboard backend that records timestamped events
+    instead of clicking or typing.
+
+    Events are stored column-wise in typed arrays (one double for the
+    timestamp plus a few small integers each), so millions of clicks fit in a
+    few tens of megabytes and appending one costs about as much as a list
+    append. A double click is recorded as a single click event with count 2.
+    Scrolls keep their steps in the x and y columns, and key events store an
+    index into key_names in the button column.
+    """
+    CLICK = 0
+    PRESS = 1
+    RELEASE = 2
+    MOVE = 3
+    SCROLL = 4
+    KEY_PRESS = 5
+    KEY_RELEASE = 6
+
+    def __init__(self, position=(0, 0), clock=time.perf_counter):
+        self.clock = clock
+        self._position = tuple(position)
+        self.times = array('d')
+        self.kinds = array('B')
+        self.buttons = array('B')
+        self.counts = array('B')
+        self.xs = array('i')
+        self.ys = array('i')
+        self.key_names = []
+
+    def __len__(self):
+        return len(self.times)
+
+    def _record(self, kind, button=0, count=0, position=None):
+        x, y = self._position if position is None else position
+        self.times.append(self.clock())
+        self.kinds.append(kind)
+        self.buttons.append(button)
+        self.counts.append(count)
+        self.xs.append(x)
+        self.ys.append(y)
+
+    def resolve_button(self, name):
+        try:
+            return BUTTON_NAMES.index(name)
+        except ValueError:
+            raise ValueError(f"Unknown mouse button: {name}")
+
+    def click(self, button, count=1):
+        self._record(self.CLICK, button, count)
+
+    def move(self, x, y):
+        self._position = (x, y)
+        self._record(self.MOVE)
+
+    def press(self, button):
+        self._record(self.PRESS, button)
+
+    def release(self, button):
+        self._record(self.RELEASE, button)
+
+    def scroll(self, dx, dy):
+        self._record(self.SCROLL, position=(dx, dy))
+
+    def resolve_key(self, name):
+        if name not in self.key_names:
+            self.key_names.append(name)
+        return self.key_names.index(name)
+
+    def press_key(self, key):
+        self._record(self.KEY_PRESS, key)
+
+    def release_key(self, key):
+        self._record(self.KEY_RELEASE, key)
+
+    @property
+    def position(self):
+        return self._position
+
+    def clear(self):
+        """Forgets all recorded events."""
+        for column in (self.times, self.kinds, self.buttons, self.counts, self.xs, self.ys):
+            del column[:]
+        del self.key_names[:]
+
+    def click_times(self):
+        """Timestamps of the recorded click events."""
+        click = self.CLICK
+        return array('d', (t for t, kind in zip(self.times, self.kinds) if kind == click))
+
+    def click_intervals(self):
+        """Time between consecutive click events, in seconds."""
+        times = self.click_times()
+        return array('d', (b - a for a, b in zip(times, times[1:])))
@@ -0,0 +1,205 @@
+"""
+Benchmarks for click timing.
+
+Runs the real engine against a RecordingBackend over a matrix of click
+speeds (expressed in every unit get_click_interval understands), random
+interval ranges and precise timing, then reports the achieved rate, the
+p50/p99/max inter-click error and the CPU time spent per click. Results can
+be written to a JSON baseline and later runs compared against it, so timing
+regressions show up before a release.
+
+    python -m autoclicker bench --output bench_baseline.json
+    python -m autoclicker bench --compare bench_baseline.json
+
+With --reaction it also measures how fast screen triggers react: a
+SyntheticScreen is repainted at random moments and the time from each
+change to the click it triggers is reported for several sampling rates.
+"""
+import json
+import platform
+import random
+import sys
+import threading
+import time
+
+from .backends import RecordingBackend
+from .engine import ClickEngine
+from .intervals import _load_numpy
+from .screen import SyntheticScreen
+from .settings import ClickSettings
+
+BASELINE_VERSION = 1
+
+# name -> config values; the number of clicks is chosen so each case takes about two seconds
+CASES = [
+    ('1cps-seconds', {'interval': '1', 'interval_unit': 'seconds', 'repeat_count': '3'}),
+    ('10cps-ms', {'interval': '100', 'interval_unit': 'ms', 'repeat_count': '20'}),
+    ('50cps-cps', {'interval': '50', 'interval_unit': 'cps', 'repeat_count': '100'}),
+    ('100cps-cpm', {'interval': '6000', 'interval_unit': 'cpm', 'repeat_count': '200'}),
+    ('100cps-precise', {'interval': '100', 'interval_unit': 'cps', 'repeat_count': '200', 'precise_timing': 'True'}),
+    ('500cps-cps', {'interval': '500', 'interval_unit': 'cps', 'repeat_count': '1000'}),
+    ('1000cps-ms', {'interval': '1', 'interval_unit': 'ms', 'repeat_count': '2000'}),
+    ('1000cps-precise', {'interval': '1000', 'interval_unit': 'cps', 'repeat_count': '2000', 'precise_timing': 'True'}),
+    ('500cps-adaptive', {'interval': '500', 'interval_unit': 'cps', 'repeat_count': '1000', 'adaptive_rate': 'True'}),
+    ('random-1-5ms', {'random_interval_enabled': 'True', 'random_interval_min': '0.001',
+                      'random_interval_max': '0.005', 'repeat_count': '600'}),
+    ('random-10-50ms', {'random_interval_enabled': 'True', 'random_interval_min': '0.01',
+                        'random_interval_max': '0.05', 'repeat_count': '70'}),
+]
+
+# Trigger sampling rates (per second) measured by run_reaction_suite
+REACTION_RATES = (30, 120, 500)
+REACTION_CHANGES = 40
+
+# A case regresses when it gets worse than the baseline by more than these margins
+RATE_TOLERANCE = 0.02       # achieved rate, relative to the target
+ERROR_FACTOR = 1.5          # p99 inter-click error, relative to the baseline...
+ERROR_SLACK = 0.0005        # ...plus this many seconds, to ignore noise on tiny errors
+CPU_FACTOR = 1.5            # CPU time per click, relative to the baseline
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def run_case(values, repeats=1, scale=1.0):
+    """Runs one benchmark case and returns its metrics, pooled over all repeats."""
+    values = dict(values, repeat='count')
+    values['repeat_count'] = str(max(3, int(int(values['repeat_count']) * scale)))
+    settings = ClickSettings.from_config(values)
+    if settings.random_enabled:
+        target_interval = (settings.random_min + settings.random_max) / 2
+    else:
+        target_interval = settings.interval
+
+    errors = []
+    clicks = 0
+    elapsed = 0.0
+    cpu = 0.0
+    for _ in range(repeats):
+        backend = RecordingBackend()
+        engine = ClickEngine(backend=backend)
+        cpu_start = time.process_time()
+        engine.run(settings)
+        cpu += time.process_time() - cpu_start
+
+        times = backend.click_times()
+        clicks += len(times)
+        elapsed += times[-1] - times[0]
+        for interval in backend.click_intervals():
+            if settings.random_enabled:
+                # Any interval inside the configured range is on target
+                error = max(settings.random_min - interval, interval - settings.random_max, 0.0)
+            else:
+                error = abs(interval - settings.interval)
+            errors.append(error)
+
+    errors.sort()
+    achieved_rate = (clicks - repeats) / elapsed if elapsed > 0 else 0.0
+    return {
+        'target_rate': 1.0 / target_interval,
+        'achieved_rate': achieved_rate,
+        'rate_error': achieved_rate * target_interval - 1.0,
+        'p50_error': percentile(errors, 0.50),
+        'p99_error': percentile(errors, 0.99),
+        'max_error': errors[-1] if errors else 0.0,
+        'cpu_per_click': cpu / clicks if clicks else 0.0,
+        'clicks': clicks,
+        'random': settings.random_enabled,
+    }
+
+def run_suite(cases=CASES, repeats=1, scale=1.0, out=sys.stdout):
+    """Runs every case, printing a table row as each one finishes, and returns the results."""
+    results = {}
+    print(f"{'case':<16}{'target':>10}{'achieved':>10}{'rate err':>10}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'max ms':>9}{'cpu us':>9}", file=out)
+    for name, values in cases:
+        result = run_case(values, repeats, scale)
+        results[name] = result
+        print(f"{name:<16}{result['target_rate']:>10.1f}{result['achieved_rate']:>10.1f}"
+              f"{result['rate_error'] * 100:>9.2f}%{result['p50_error'] * 1000:>9.3f}"
+              f"{result['p99_error'] * 1000:>9.3f}{result['max_error'] * 1000:>9.3f}"
+              f"{result['cpu_per_click'] * 1e6:>9.1f}", file=out, flush=True)
+    return results
+
+def run_reaction(rate, changes=REACTION_CHANGES):
+    """
+    Measures the delay from a screen change to the click a change trigger
+    sampling rate times a second makes for it. Returns the delays, sorted,
+    and the CPU time spent per sample.
+    """
+    screen = SyntheticScreen(64, 64)
+    backend = RecordingBackend()
+    engine = ClickEngine(backend=backend, capture=screen)
+    settings = ClickSettings.from_config({'interval': '1', 'interval_unit': 'ms', 'repeat': 'count',
+                                          'repeat_count': str(changes), 'trigger': 'change',
+                                          'trigger_region': '16,16,32,32', 'trigger_rate': str(rate)})
+    changed_at = []
+    # Imported up front so the one-off cost isn't counted per sample
+    _load_numpy()
+
+    def repaint():
+        # Far enough apart that every change is clicked before the next one
+        for n in range(changes):
+            time.sleep(2.0 / rate + random.uniform(0.005, 0.02))
+            screen.fill(24, 24, 4, 4, (255, 255, 255) if n % 2 == 0 else (0, 0, 0))
+            changed_at.append(screen.changed_at)
+
+    painter = threading.Thread(target=repaint, daemon=True)
+    cpu_start = time.process_time()
+    engine.start(settings)
+    painter.start()
+    painter.join()
+    engine.wait(1.0)
+    engine.stop()
+    cpu = time.process_time() - cpu_start
+    delays = sorted(click - change for click, change in zip(backend.click_times(), changed_at))
+    return delays, cpu / screen.grabs if screen.grabs else 0.0
+
+def run_reaction_suite(rates=REACTION_RATES, out=sys.stdout):
+    """Runs run_reaction for every rate, printing a table row for each, and returns the results."""
+    results = {}
+    print(f"{'trigger rate':<16}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'cpu us':>9}", file=out)
+    for rate in rates:
+        delays, cpu_per_sample = run_reaction(rate)
+        results[rate] = {'p50_delay': percentile(delays, 0.50), 'p99_delay': percentile(delays, 0.99),
+                         'max_delay': delays[-1] if delays else 0.0, 'cpu_per_sample': cpu_per_sample}
+        print(f"{rate:<16}{results[rate]['p50_delay'] * 1000:>9.3f}{results[rate]['p99_delay'] * 1000:>9.3f}"
+              f"{results[rate]['max_delay'] * 1000:>9.3f}{cpu_per_sample * 1e6:>9.1f}", file=out, flush=True)
+    return results
+
+def write_baseline(results, path):
+    """Writes benchmark results to a JSON baseline file."""
+    baseline = {
+        'version': BASELINE_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cases': results,
+    }
+    with open(path, 'w') as baseline_file:
+        json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+
+def compare(results, path):
+    """Compares results with a baseline file and returns a list of regression messages."""
+    with open(path) as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get('version') != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version: {baseline.get('version')}")
+
+    regressions = []
+    for name, result in results.items():
+        old = baseline['cases'].get(name)
+        if old is None:
+            continue
+        # Random intervals only hit the mean rate on average, so their rate isn't compared
+        if not result['random'] and abs(result['rate_error']) > abs(old['rate_error']) + RATE_TOLERANCE:
+            regressions.append(f"{name}: rate error {result['rate_error']:+.2%} (baseline {old['rate_error']:+.2%})")
+        if result['p99_error'] > old['p99_error'] * ERROR_FACTOR + ERROR_SLACK:
+            regressions.append(f"{name}: p99 error {result['p99_error'] * 1000:.3f} ms "
+                               f"(baseline {old['p99_error'] * 1000:.3f} ms)")
+        if result['cpu_per_click'] > old['cpu_per_click'] * CPU_FACTOR:
+            regressions.append(f"{name}: CPU per click {result['cpu_per_click'] * 1e6:.1f} us "
+                               f"(baseline {old['cpu_per_click'] * 1e6:.1f} us)")
+    return regressions
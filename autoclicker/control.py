@@ -0,0 +1,285 @@
+"""
+Local control socket.
+
+A running clicker can listen on a Unix domain socket so other processes can
+start, stop, pause and retarget it without simulated key presses. The
+protocol is plain text, one request per line and one response line per
+request, in order:
+
+    start                       ok started        (or: ok running)
+    stop | pause | resume       ok
+    interval VALUE [UNIT]       ok 0.02           (UNIT: seconds, ms, cps or cpm)
+    location X Y | current      ok
+    stats                       ok state=clicking clicks=1200 cps=49.98 avg=50.01 missed=0
+    ping                        ok
+
+Errors are answered with 'err' and a message. A connection stays open for
+any number of requests, and every complete line that has arrived is handled
+before the responses are sent back in one write, so a client can batch
+commands by writing several lines at once. One thread serves every
+connection through a selector, and commands act on the engine directly
+from it, so a round trip costs a few system calls and no Tk event loop.
+
+Interval and location changes apply to the run in progress from its next
+click (see ClickEngine.configure) and to every later start, as long as the
+settings allow them; a change they don't allow is answered with 'err' and
+forgotten. The socket file is only accessible to the user running the
+clicker.
+"""
+import copy
+import inspect
+import os
+import selectors
+import socket
+import stat
+import threading
+import time
+
+from .settings import get_click_interval
+from .telemetry import StatusPoller
+
+# Longest request line accepted; a connection sending more is closed
+MAX_LINE = 4096
+# Most response bytes queued for a connection that isn't reading them before it is closed
+MAX_BACKLOG = 1 << 20
+
+class ControlTarget:
+    """
+    Turns control commands into calls on an engine (a ClickEngine or
+    ProcessEngine). settings_factory returns the ClickSettings a start uses;
+    interval and location changes made over the socket are kept and applied
+    on top of them. on_change, if given, is called from the server thread
+    with the name and new value of every changed setting, e.g. so the GUI
+    can show it.
+    """
+    def __init__(self, engine, settings_factory, on_change=None):
+        self.engine = engine
+        self.settings_factory = settings_factory
+        self.on_change = on_change
+        self.overrides = {}
+        self.poller = StatusPoller(engine)
+        self.commands = {
+            'start': self.start, 'stop': self.stop, 'pause': self.pause, 'resume': self.resume,
+            'interval': self.set_interval, 'location': self.set_location, 'stats': self.stats, 'ping': self.ping,
+        }
+
+    def handle(self, line):
+        """Runs one request line and returns its response line, without the newline."""
+        requested_at = time.perf_counter()
+        parts = line.split()
+        if not parts:
+            return "err empty request"
+        command = self.commands.get(parts[0].lower())
+        if command is None:
+            return f"err unknown command: {parts[0]}"
+        try:
+            inspect.signature(command).bind(requested_at, *parts[1:])
+        except TypeError:
+            return f"err wrong number of arguments for {parts[0]}"
+        try:
+            result = command(requested_at, *parts[1:])
+        except (ValueError, RuntimeError) as e:
+            return f"err {e}"
+        return "ok" if result is None else f"ok {result}"
+
+    def start(self, requested_at):
+        settings = self.settings_factory()
+        if self.overrides:
+            # A copy, so cached settings are left alone
+            settings = copy.copy(settings)
+            for name, value in list(self.overrides.items()):
+                try:
+                    settings.update(**{name: value})
+                except ValueError:
+                    # The settings changed since, e.g. to random intervals; the override no longer applies
+                    del self.overrides[name]
+        return "started" if self.engine.start(settings) else "running"
+
+    def stop(self, requested_at):
+        self.engine.stop(wait=False, requested_at=requested_at)
+
+    def pause(self, requested_at):
+        self.engine.pause(requested_at)
+
+    def resume(self, requested_at):
+        self.engine.resume(requested_at)
+
+    def set_interval(self, requested_at, value, unit='seconds'):
+        interval = get_click_interval(value, unit)
+        self._configure('interval', interval)
+        return f"{interval:g}"
+
+    def set_location(self, requested_at, x, y=None):
+        if y is None:
+            if x.lower() != 'current':
+                raise ValueError("location expects X Y or 'current'")
+            position = None
+        else:
+            position = (int(x), int(y))
+        self._configure('fixed_position', position)
+
+    def stats(self, requested_at):
+        status = self.poller.poll()
+        return (f"state={status.state} clicks={status.clicks} cps={status.cps:.2f} avg={status.average_cps:.2f} "
+                f"missed={self.engine.missed_ticks()}")
+
+    def ping(self, requested_at):
+        return None
+
+    def _configure(self, name, value):
+        # Checked against the settings a start would use, so an override that
+        # can never apply is refused instead of breaking every later start
+        copy.copy(self.settings_factory()).update(**{name: value})
+        if self.engine.clicking:
+            self.engine.configure(**{name: value})
+        self.overrides[name] = value
+        if self.on_change is not None:
+            self.on_change(name, value)
+
+class ControlServer:
+    """
+    Serves a ControlTarget on a Unix domain socket from one daemon thread.
+
+    A stale socket file left at path by a crashed clicker is replaced; any
+    other file there is an error.
+    """
+    def __init__(self, path, target):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise OSError("Unix domain sockets are not supported on this platform.")
+        self.path = path
+        self.target = target
+        self.requests = 0
+        if os.path.lexists(path):
+            if not stat.S_ISSOCK(os.lstat(path).st_mode):
+                raise OSError(f"{path} exists and is not a socket.")
+            os.unlink(path)
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Created with no permissions for anyone else
+        old_umask = os.umask(0o177)
+        try:
+            self._listener.bind(path)
+        finally:
+            os.umask(old_umask)
+        self._listener.listen()
+        self._listener.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ)
+        # Written to by stop() to wake the selector
+        self._waker, self._wake_writer = socket.socketpair()
+        self._selector.register(self._waker, selectors.EVENT_READ)
+        self._running = True
+        self.thread = threading.Thread(target=self._serve, daemon=True, name='autoclicker-control')
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Closes every connection and removes the socket file."""
+        self._running = False
+        self._wake_writer.send(b'\0')
+        if self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def _serve(self):
+        # Unparsed input and unsent responses of every connection
+        buffers = {}
+        outgoing = {}
+        try:
+            while self._running:
+                for key, events in self._selector.select():
+                    sock = key.fileobj
+                    if sock is self._listener:
+                        self._accept(buffers, outgoing)
+                    elif sock is self._waker:
+                        sock.recv(64)
+                    else:
+                        if events & selectors.EVENT_WRITE:
+                            self._flush(sock, buffers, outgoing)
+                        if events & selectors.EVENT_READ and sock in buffers:
+                            self._read(sock, buffers, outgoing)
+        finally:
+            for sock in list(buffers):
+                self._close(sock, buffers, outgoing)
+            self._selector.close()
+            self._listener.close()
+            self._waker.close()
+            self._wake_writer.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _accept(self, buffers, outgoing):
+        try:
+            sock, _ = self._listener.accept()
+        except BlockingIOError:
+            return
+        # Never blocking, so a client that doesn't read its responses can't stall the others
+        sock.setblocking(False)
+        buffers[sock] = b''
+        outgoing[sock] = b''
+        self._selector.register(sock, selectors.EVENT_READ)
+
+    def _read(self, sock, buffers, outgoing):
+        try:
+            data = sock.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self._close(sock, buffers, outgoing)
+            return
+        pending = buffers[sock] + data
+        *lines, rest = pending.split(b'\n')
+        if len(rest) > MAX_LINE:
+            self._close(sock, buffers, outgoing)
+            return
+        buffers[sock] = rest
+        if not lines:
+            return
+        handle = self.target.handle
+        responses = []
+        for line in lines:
+            responses.append(handle(line.decode('utf-8', 'replace')))
+        self.requests += len(lines)
+        outgoing[sock] += ('\n'.join(responses) + '\n').encode('utf-8')
+        self._flush(sock, buffers, outgoing)
+
+    def _flush(self, sock, buffers, outgoing):
+        """Sends as much of a connection's queued responses as the socket takes, watching for room for the rest."""
+        data = outgoing[sock]
+        try:
+            sent = sock.send(data) if data else 0
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self._close(sock, buffers, outgoing)
+            return
+        data = outgoing[sock] = data[sent:]
+        if len(data) > MAX_BACKLOG:
+            # The client keeps sending without reading
+            self._close(sock, buffers, outgoing)
+            return
+        self._selector.modify(sock, selectors.EVENT_READ | selectors.EVENT_WRITE if data else selectors.EVENT_READ)
+
+    def _close(self, sock, buffers, outgoing):
+        self._selector.unregister(sock)
+        del buffers[sock]
+        del outgoing[sock]
+        sock.close()
+
+def send_commands(path, commands, timeout=5.0):
+    """Sends request lines to a control socket in one batch and returns the response lines."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(''.join(command.strip() + '\n' for command in commands).encode('utf-8'))
+        data = b''
+        while data.count(b'\n') < len(commands):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return data.decode('utf-8').splitlines()
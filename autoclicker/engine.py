@@ -0,0 +1,827 @@
+"""
+Headless click engine.
+
+Nothing here imports tkinter, and pynput is only imported once the engine
+actually needs a real mouse, so the engine can be driven from the command line
+or embedded in other programs without building a GUI. The mouse itself is
+reached through a MouseBackend from autoclicker.backends.
+"""
+import copy
+import math
+import threading
+import time
+
+from .backends import BUTTON_NAMES, KeyboardBackend, PynputBackend, PynputKeyboardBackend, resolve_buttons
+from .intervals import IntervalGenerator
+from .metrics import ClickMetrics
+from .motion import Motion, stream_path
+from .scheduler import DeadlineScheduler, PRECISE_SPIN_THRESHOLD, RateController
+from .screen import RegionWatcher, ScreenCapture
+from .script import CLICK, JUMP, KEY_DOWN, KEY_UP, LOOP, MOVE, PRESS, RELEASE, SET, WAIT, WAIT_RANDOM
+from .telemetry import StatusChannel
+
+class _RouteCursor:
+    """The step of a Route a run has reached, shared by the steps of the click loop."""
+    __slots__ = ('xs', 'ys', 'length', 'step', 'dwell')
+
+    def __init__(self, route):
+        self.xs, self.ys = route.xs, route.ys
+        self.length = len(route)
+        self.step = 0
+        # The wait after the last click, 0 for the normal interval
+        self.dwell = 0.0
+
+    def target(self):
+        return self.xs[self.step], self.ys[self.step]
+
+    def advance(self):
+        self.step += 1
+        if self.step == self.length:
+            self.step = 0
+
+class ClickEngine:
+    """
+    Runs the auto-clicking loop for a ClickSettings object.
+
+    Clicks go to the given MouseBackend; without one, a PynputBackend driving
+    the real mouse is created the first time clicking starts.
+
+    The clicking thread never calls back into its owner. State changes go to
+    the status channel and clicks are counted in clicks_done; displays poll
+    both through a telemetry.StatusPoller at their own frame rate. Every click
+    also records its interval, lateness and backend call time into metrics,
+    which keeps accumulating across runs until metrics.reset().
+
+    Pause, resume and stop never poll: they flip the state and set a wake event
+    that the clicking thread blocks on, both while paused and while waiting for
+    the next click, so they take effect immediately even at long intervals and
+    a paused engine uses no CPU. The time from the request to the clicking
+    thread acting on it is kept in control_latency (last request) and
+    max_control_latency, in seconds.
+
+    With a trace.PhaseTrace as trace, the time of every phase boundary of
+    every click is recorded into it, and the trace is saved when the run ends
+    if it has a path. Without one, the loop takes no extra timestamps.
+
+    With a motion style set, the cursor travels to fixed and route targets
+    along a humanized path (see autoclicker.motion) while waiting for the
+    click; the time it takes counts as part of the wait.
+
+    With a screen trigger set (see autoclicker.screen), its region is read
+    from capture, by default a ScreenCapture of the real screen created on
+    first use. A click held back by a trigger starts the schedule over from
+    the moment the trigger fired.
+
+    Settings with a compiled click script (see autoclicker.script) run it
+    instead of the click loop; keys it presses go to the keyboard backend.
+    So do the key strokes of settings with keys (see autoclicker.keypress),
+    which are pressed on every tick of the click schedule instead of a click.
+
+    With a sessionlog.SessionLog as session_log, every run is logged to its
+    own file: each click with its position, button and lateness, plus
+    pauses and how the run ended.
+
+    Hold clicks keep the button down for hold_time, and drag clicks move
+    it to drag_to meanwhile along a path like motion's; pause and stop let
+    go of the button at once. Burst clicks press and release the button
+    burst_count times back to back and record the time per click into
+    metrics.burst, which shows the highest rate the backend can click at.
+
+    In adaptive rate mode, rate_limited is True while the backend is too slow
+    for the configured speed; the 'limited' state is published when that
+    starts, with the highest rate the backend allows as detail.
+
+    Like a script's program, the click loop is put together once per run:
+    the wait, aim, fire and schedule steps are picked for the click type,
+    sequence, keys, motion, trigger, interval mode and adaptive rate of the
+    settings, and the session log and trace wrap them only when present. A
+    click then runs the same few calls whatever the settings are, and never
+    decides again what kind of click it is.
+    """
+    def __init__(self, backend=None, trace=None, capture=None, keyboard=None, session_log=None):
+        self._backend = backend
+        self.session_log = session_log
+        self._capture = capture
+        self._keyboard = keyboard
+        self.trace = trace
+        # The engine's own copy of the settings of the current or last run
+        self.settings = None
+        self.status = StatusChannel()
+        self.metrics = ClickMetrics()
+        self._scheduler = None
+
+        # State variables to manage the clicking loop
+        self.clicking = False
+        self.paused = False
+        self.click_thread = None
+        self.clicks_done = 0
+        self.start_time = None
+        self.stop_time = None
+        self.random_seed = None
+        self.rate_limited = False
+
+        # Set whenever the state changes so the clicking thread wakes up to it
+        self._wake = threading.Event()
+        self._requested_at = None
+        self.control_latency = None
+        self.max_control_latency = 0.0
+
+    @property
+    def backend(self):
+        """The mouse backend, created on first use."""
+        if self._backend is None:
+            self._backend = PynputBackend()
+        return self._backend
+
+    @property
+    def keyboard(self):
+        """
+        The keyboard backend: the mouse backend if it can press keys too, as
+        RecordingBackend can, else a PynputKeyboardBackend created on first use.
+        """
+        if self._keyboard is None:
+            backend = self.backend
+            self._keyboard = backend if isinstance(backend, KeyboardBackend) else PynputKeyboardBackend()
+        return self._keyboard
+
+    @property
+    def capture(self):
+        """The source of screen pixels for triggers, created on first use."""
+        if self._capture is None:
+            self._capture = ScreenCapture()
+        return self._capture
+
+    def start(self, settings):
+        """Starts clicking in a background thread. Returns False if already running."""
+        if self.clicking:
+            return False
+        self.settings = copy.copy(settings)
+        self.clicking = True
+        self.paused = False
+        self.click_thread = threading.Thread(target=self.clicking_loop, args=(self.settings,), daemon=True)
+        self.click_thread.start()
+        return True
+
+    def run(self, settings):
+        """Clicks in the calling thread until stopped or the repeat count is reached."""
+        self.settings = copy.copy(settings)
+        self.clicking = True
+        self.paused = False
+        self.clicking_loop(self.settings)
+
+    def stop(self, wait=True, requested_at=None):
+        """
+        Stops the clicking loop. With wait=True this blocks until the clicking
+        thread has exited, which takes no longer than the click in progress.
+        """
+        if not self.clicking:
+            return
+        self._request(requested_at)
+        self.clicking = False
+        self.paused = False
+        self._wake.set()
+        if wait and self.click_thread and self.click_thread.is_alive() and self.click_thread is not threading.current_thread():
+            self.click_thread.join()
+
+    def wait(self, timeout=None):
+        """Blocks until the clicking thread has exited; returns False on timeout."""
+        thread = self.click_thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def configure(self, **changes):
+        """
+        Changes the interval or fixed position of the current run from any
+        thread, taking effect from the next click (see ClickSettings.update).
+        Raises ValueError if nothing has run yet or a change is invalid.
+        """
+        if self.settings is None:
+            raise ValueError("Nothing to configure before the first start.")
+        self.settings.update(**changes)
+
+    def close(self):
+        """Stops clicking. Engines that own other resources, like ProcessEngine, release them here."""
+        self.stop()
+
+    def pause(self, requested_at=None):
+        """Pauses clicking until resume() is called."""
+        if self.clicking and not self.paused:
+            self.toggle_pause(requested_at)
+
+    def resume(self, requested_at=None):
+        """Resumes clicking after pause()."""
+        if self.paused:
+            self.toggle_pause(requested_at)
+
+    def toggle_pause(self, requested_at=None):
+        """Toggles the paused state and returns the new state."""
+        self._request(requested_at)
+        self.paused = not self.paused
+        self._wake.set()
+        return self.paused
+
+    def _request(self, requested_at):
+        """Remembers when a state change was requested, e.g. when its hotkey was pressed."""
+        self._requested_at = time.perf_counter() if requested_at is None else requested_at
+
+    def _acknowledge(self):
+        """Records how long the clicking thread took to act on the last request."""
+        requested_at, self._requested_at = self._requested_at, None
+        if requested_at is not None:
+            self.control_latency = time.perf_counter() - requested_at
+            self.max_control_latency = max(self.max_control_latency, self.control_latency)
+
+    def _wait_paused(self):
+        """Blocks without polling while the engine is paused."""
+        self._acknowledge()
+        self.status.publish('paused', self.control_latency)
+        log = self.session_log
+        if log is not None:
+            log.pause(time.perf_counter())
+        while self.paused and self.clicking:
+            self._wake.wait()
+            self._wake.clear()
+        self._acknowledge()
+        if log is not None and self.clicking:
+            log.resume(time.perf_counter())
+
+    def _follow_path(self, motion, backend, deadline, target):
+        """
+        Moves the cursor toward target along the next path of motion, in the
+        motion window that ends at deadline. Returns False if a pause or stop
+        request interrupted it.
+        """
+        wake = self._wake
+        clock = time.perf_counter
+        remaining = deadline - motion.duration - clock()
+        if remaining > 0 and wake.wait(remaining):
+            return False
+        if deadline - clock() < motion.period:
+            # No time left to move before the click; it jumps to the target
+            return True
+        x0, y0 = backend.position
+        x1, y1 = target
+        if x0 == x1 and y0 == y1:
+            return True
+        xs, ys = motion.paths.path(x0, y0, x1, y1)
+        return stream_path(backend, xs, ys, deadline, motion.period, wake, clock)
+
+    def _drag(self, motion, backend, button, target, deadline):
+        """
+        Presses button and moves the cursor to target along the next path of
+        motion, arriving at deadline, then releases the button there. A pause
+        or stop request cuts the path short, releasing the button wherever
+        the cursor got to.
+        """
+        x0, y0 = backend.position
+        backend.press(button)
+        try:
+            xs, ys = motion.paths.path(x0, y0, *target)
+            if stream_path(backend, xs, ys, deadline, motion.period, self._wake, time.perf_counter):
+                backend.move(*target)
+        finally:
+            backend.release(button)
+
+    def _wait_for_trigger(self, watcher, period, deadline=None):
+        """
+        Samples the watched region every period until the trigger fires or
+        deadline passes. Returns True if it fired, False at the deadline and
+        None if a pause or stop request interrupted it.
+        """
+        wake = self._wake
+        clock = time.perf_counter
+        while True:
+            remaining = period
+            if deadline is not None:
+                remaining = min(period, deadline - clock())
+                if remaining <= 0:
+                    return False
+            if wake.wait(remaining):
+                return None
+            if watcher.poll():
+                return True
+
+    def _click_steps(self, settings, backend, cursor):
+        """
+        Builds the two steps of a click for the settings: aim() moves the
+        cursor onto the target and fire() clicks, presses the keys or performs
+        the hold, drag or burst. Both are chosen before clicking starts, so
+        the loop never looks at the click type again.
+        """
+        move = backend.move
+        route = settings.route
+        if route is not None:
+            # Local names for the route columns; each step only indexes them
+            buttons = resolve_buttons(backend, set(route.buttons))
+            xs, ys = route.xs, route.ys
+            button_ids, counts, waits = route.buttons, route.counts, route.waits
+            click = backend.click
+
+            def aim():
+                move(xs[cursor.step], ys[cursor.step])
+
+            if settings.trigger is not None and settings.trigger.action == 'next':
+                # The trigger moves on to the next target, not the click
+                def fire():
+                    step = cursor.step
+                    click(buttons[button_ids[step]], counts[step])
+                    cursor.dwell = waits[step]
+            else:
+                def fire():
+                    step = cursor.step
+                    click(buttons[button_ids[step]], counts[step])
+                    cursor.dwell = waits[step]
+                    cursor.advance()
+            return aim, fire
+
+        def aim():
+            # Read on every click, as configure() may change it
+            fixed_position = settings.fixed_position
+            if fixed_position:
+                move(*fixed_position)
+
+        if settings.keys is not None:
+            # (press or release, key) pairs with every key resolved up front
+            key_events = settings.keys.resolve(self.keyboard)
+
+            def fire():
+                for call, key in key_events:
+                    call(key)
+            return aim, fire
+
+        button = backend.resolve_button(settings.button)
+        click_type = settings.click_type
+        press, release = backend.press, backend.release
+        hold_time = settings.hold_time
+        clock = time.perf_counter
+        if click_type == 'single':
+            click = backend.click
+
+            def fire():
+                click(button)
+        elif click_type == 'double':
+            double_click = backend.double_click
+
+            def fire():
+                double_click(button)
+        elif click_type == 'burst':
+            burst_count = settings.burst_count
+            burst_range = range(burst_count)
+            record_burst = self.metrics.burst.record
+
+            def fire():
+                burst_start = clock()
+                for _ in burst_range:
+                    press(button)
+                    release(button)
+                record_burst((clock() - burst_start) / burst_count)
+        elif click_type == 'hold':
+            wake = self._wake
+
+            def fire():
+                press(button)
+                try:
+                    # Cut short by a pause or stop request
+                    wake.wait(hold_time)
+                finally:
+                    release(button)
+        else:
+            # Drags follow the motion style, or a plain minimum-jerk path without one
+            style = settings.motion if settings.motion != 'off' else 'minimum_jerk'
+            drag_motion = Motion(style, hold_time, settings.motion_rate,
+                                 settings.motion_jitter if settings.motion != 'off' else 0.0, settings.random_seed)
+            drag_to = settings.drag_to
+
+            def fire():
+                self._drag(drag_motion, backend, button, drag_to, clock() + hold_time)
+        return aim, fire
+
+    def _wait_step(self, settings, backend, scheduler, cursor):
+        """
+        Builds the step that waits until the next click is due and returns
+        its lateness, or None if a pause or stop request woke it. Without
+        motion or a trigger that is the scheduler's own wait; otherwise the
+        cursor's path and the watching of the trigger region are wrapped
+        around it here, once per run.
+        """
+        wait = scheduler.wait
+        motion_duration = 0.0
+        if settings.motion != 'off':
+            # The first block of path shapes is drawn here, before clicking starts
+            motion = Motion(settings.motion, settings.motion_time, settings.motion_rate,
+                            settings.motion_jitter, settings.random_seed)
+            motion_duration = motion.duration
+            target = cursor.target if cursor is not None else lambda: settings.fixed_position
+            scheduled_wait = wait
+
+            def wait():
+                position = target()
+                if position is not None and not self._follow_path(motion, backend, scheduler.deadline, position):
+                    return None
+                return scheduled_wait()
+
+        trigger = settings.trigger
+        if trigger is None:
+            return wait
+        watcher = RegionWatcher(self.capture, trigger)
+        period = 1.0 / trigger.rate
+        due_wait = wait
+        if trigger.action == 'next':
+            def wait():
+                # Watch the region until the click is due (or its motion
+                # starts); a firing moves on to the next target
+                fired = watcher.poll() or self._wait_for_trigger(watcher, period, scheduler.deadline - motion_duration)
+                if fired is None:
+                    return None
+                if fired:
+                    watcher.consume()
+                    cursor.advance()
+                return due_wait()
+        else:
+            def wait():
+                lateness = due_wait()
+                if lateness is None:
+                    return None
+                if not watcher.poll():
+                    if self._wait_for_trigger(watcher, period) is None:
+                        return None
+                    # Clicking on the trigger instead of the deadline
+                    scheduler.reset()
+                    lateness = 0.0
+                watcher.consume()
+                return lateness
+        return wait
+
+    def _schedule_steps(self, settings, scheduler, cursor, controller):
+        """
+        Builds next_interval(), which picks the time until the next click
+        from the interval, random intervals or a sequence dwell, and
+        schedule(interval, click_start, click_end, lateness), which sets the
+        next deadline, through controller in adaptive rate mode.
+        """
+        if settings.random_enabled:
+            intervals = IntervalGenerator(settings.random_min, settings.random_max,
+                                          settings.random_distribution, settings.random_seed)
+            # Remember the seed actually used so the run can be reproduced
+            self.random_seed = intervals.seed
+            next_interval = intervals.next
+        else:
+            def next_interval():
+                # Read on every click, as configure() may change it
+                return settings.interval
+        if cursor is not None:
+            between_targets = next_interval
+
+            def next_interval():
+                dwell = cursor.dwell
+                return dwell if dwell > 0 else between_targets()
+
+        if controller is None:
+            advance = scheduler.advance
+
+            def schedule(interval, click_start, click_end, lateness):
+                advance(interval)
+        else:
+            def schedule(interval, click_start, click_end, lateness):
+                # Adaptive mode: the controller decides the wait from this click's start
+                scheduler.reset(click_start + controller.next_wait(click_start, interval, click_end - click_start))
+                if controller.limited != self.rate_limited:
+                    self.rate_limited = controller.limited
+                    if controller.limited:
+                        self.status.publish('limited', 1.0 / controller.backend_cost if controller.backend_cost > 0 else None)
+                    else:
+                        self.status.publish('clicking')
+        return next_interval, schedule
+
+    def _logged_steps(self, log, settings, backend, cursor, wait, schedule):
+        """Wraps the wait and schedule steps so every click or key tick is written to the session log."""
+        scheduled = schedule
+        if settings.keys is not None:
+            strokes = settings.keys.strokes
+
+            def schedule(interval, click_start, click_end, lateness):
+                log.keys(click_start, strokes, lateness)
+                scheduled(interval, click_start, click_end, lateness)
+            return wait, schedule
+
+        if cursor is not None:
+            route = settings.route
+
+            def where():
+                step = cursor.step
+                return route.xs[step], route.ys[step], route.buttons[step], route.counts[step]
+        else:
+            button_id = BUTTON_NAMES.index(settings.button)
+            click_count = {'double': 2, 'burst': settings.burst_count}.get(settings.click_type, 1)
+
+            def where():
+                x, y = settings.fixed_position or backend.position
+                return int(x), int(y), button_id, click_count
+        logged = [None]
+        due_wait = wait
+
+        def wait():
+            lateness = due_wait()
+            if lateness is not None:
+                # Where and how this click goes, taken before it moves the cursor
+                logged[0] = where()
+            return lateness
+
+        def schedule(interval, click_start, click_end, lateness):
+            log.click(click_start, *logged[0], lateness)
+            scheduled(interval, click_start, click_end, lateness)
+        return wait, schedule
+
+    def _traced_steps(self, trace, scheduler, wait, aim, schedule):
+        """Wraps the steps of the click loop so they record the phase boundaries of every click into trace."""
+        clock = time.perf_counter
+        # The deadline, wait start and end of the move of the click in progress
+        marks = [0.0, 0.0, 0.0]
+        due_wait, aimed, scheduled = wait, aim, schedule
+
+        def wait():
+            marks[1] = clock()
+            marks[0] = scheduler.deadline
+            return due_wait()
+
+        def aim():
+            aimed()
+            marks[2] = clock()
+
+        def schedule(interval, click_start, click_end, lateness):
+            recorded = clock()
+            scheduled(interval, click_start, click_end, lateness)
+            trace.record(marks[0], marks[1], click_start, marks[2], click_end, recorded, clock())
+        return wait, aim, schedule
+
+    def _resume_program(self, scheduler, backend, buttons, held_buttons, keyboard, keys, held_keys):
+        """
+        Waits out a pause of a running script and restarts its schedule.
+        Buttons and keys a hold or press is holding are let go for the pause
+        and pressed again on resume; the wait they were in starts over.
+        """
+        for key in held_keys:
+            keyboard.release_key(keys[key])
+        for button in held_buttons:
+            backend.release(buttons[button])
+        self._wait_paused()
+        if not self.clicking:
+            held_buttons.clear()
+            held_keys.clear()
+            return
+        for button in held_buttons:
+            backend.press(buttons[button])
+        for key in held_keys:
+            keyboard.press_key(keys[key])
+        self.status.publish('clicking')
+        scheduler.reset()
+
+    def _run_program(self, program, settings, backend):
+        """
+        Interprets a compiled click script until it ends, the repeat count is
+        reached or clicking stops. Waits are timed from the start of the
+        script like clicks are, so they don't drift. Pause and stop are acted
+        on at waits and at the jumps back of repeats and loops. Buttons and
+        keys held by the script are let go while it is paused and released
+        when it stops.
+        """
+        wake = self._wake
+        ops, arg_a, arg_b, arg_f = program.ops, program.a, program.b, program.f
+        buttons = resolve_buttons(backend, {arg for op, arg in zip(ops, arg_a) if op in (CLICK, PRESS, RELEASE)})
+        keyboard = self.keyboard if program.keys else None
+        keys = [keyboard.resolve_key(name) for name in program.keys]
+        randoms = []
+        for low, high, distribution in program.randoms:
+            intervals = IntervalGenerator(low, high, distribution, settings.random_seed)
+            self.random_seed = intervals.seed
+            randoms.append(intervals.next)
+        counters = [0] * program.counters
+        held_buttons = set()
+        held_keys = set()
+        repeat_count = settings.repeat_count
+        scheduler = DeadlineScheduler(spin_threshold=PRECISE_SPIN_THRESHOLD if settings.precise_timing else 0.0,
+                                      catch_up=settings.catch_up, wake=wake)
+        self._scheduler = scheduler
+        record_interval = self.metrics.interval.record
+        record_lateness = self.metrics.lateness.record
+        record_backend = self.metrics.backend.record
+        clock = time.perf_counter
+        last_click = None
+        lateness = 0.0
+
+        self.start_time = clock()
+        scheduler.reset(self.start_time)
+        log = self.session_log
+        if log is not None:
+            log.begin(self.start_time)
+        if self.clicking:
+            self.status.publish('clicking')
+        pc = 0
+        end = len(ops)
+        try:
+            while pc < end:
+                op = ops[pc]
+                if op == CLICK:
+                    if repeat_count is not None and self.clicks_done >= repeat_count:
+                        break
+                    if log is not None:
+                        x, y = backend.position
+                    click_start = clock()
+                    backend.click(buttons[arg_a[pc]], arg_b[pc])
+                    record_backend(clock() - click_start)
+                    if log is not None:
+                        log.click(click_start, int(x), int(y), arg_a[pc], arg_b[pc], lateness)
+                    self.clicks_done += 1
+                    if last_click is not None:
+                        record_interval(click_start - last_click)
+                    last_click = click_start
+                elif op == WAIT or op == WAIT_RANDOM:
+                    wake.clear()
+                    if not self.clicking:
+                        break
+                    if self.paused:
+                        self._resume_program(scheduler, backend, buttons, held_buttons, keyboard, keys, held_keys)
+                        last_click = None
+                        continue
+                    scheduler.advance(arg_f[pc] if op == WAIT else randoms[arg_a[pc]]())
+                    lateness = scheduler.wait()
+                    if lateness is None:
+                        # Woken up by a pause or stop request; a resumed wait starts over
+                        continue
+                    record_lateness(lateness)
+                elif op == MOVE:
+                    backend.move(arg_a[pc], arg_b[pc])
+                elif op == LOOP or op == JUMP:
+                    if op == LOOP:
+                        counter = arg_a[pc]
+                        counters[counter] -= 1
+                        if not counters[counter]:
+                            pc += 1
+                            continue
+                    pc = arg_b[pc]
+                    if not self.clicking:
+                        break
+                    if self.paused:
+                        self._resume_program(scheduler, backend, buttons, held_buttons, keyboard, keys, held_keys)
+                        last_click = None
+                    continue
+                elif op == SET:
+                    counters[arg_a[pc]] = arg_b[pc]
+                elif op == PRESS:
+                    backend.press(buttons[arg_a[pc]])
+                    held_buttons.add(arg_a[pc])
+                elif op == RELEASE:
+                    backend.release(buttons[arg_a[pc]])
+                    held_buttons.discard(arg_a[pc])
+                elif op == KEY_DOWN:
+                    keyboard.press_key(keys[arg_a[pc]])
+                    held_keys.add(arg_a[pc])
+                elif op == KEY_UP:
+                    keyboard.release_key(keys[arg_a[pc]])
+                    held_keys.discard(arg_a[pc])
+                pc += 1
+        finally:
+            for key in held_keys:
+                keyboard.release_key(keys[key])
+            for button in held_buttons:
+                backend.release(buttons[button])
+
+    def missed_ticks(self):
+        """Scheduled clicks dropped by the catch-up policy, over all runs."""
+        scheduler = self._scheduler
+        return self.metrics.missed + (scheduler.missed if scheduler is not None else 0)
+
+    def achieved_cps(self):
+        """Average clicks per second between starting and stopping (or now, while running)."""
+        if not self.start_time:
+            return 0.0
+        end_time = self.stop_time if self.stop_time is not None else time.perf_counter()
+        elapsed_time = end_time - self.start_time
+        return self.clicks_done / elapsed_time if elapsed_time > 0 else 0.0
+
+    def clicking_loop(self, settings):
+        """
+        The main loop that performs the clicks.
+        Clicks are paced by a DeadlineScheduler so the achieved rate matches the
+        configured interval instead of drifting below it.
+        """
+        wake = self._wake
+        error = None
+        self.clicks_done = 0
+        self.start_time = None
+        self.stop_time = None
+        try:
+            # Initial delay before starting to click, cut short by stop()
+            if settings.pre_start_delay > 0:
+                self.status.publish('starting', settings.pre_start_delay)
+                start_at = time.perf_counter() + settings.pre_start_delay
+                while True:
+                    wake.clear()
+                    remaining = start_at - time.perf_counter()
+                    if remaining <= 0 or not self.clicking:
+                        break
+                    wake.wait(remaining)
+
+            backend = self.backend
+            if settings.script is not None:
+                if self.trace is not None:
+                    # Scripts aren't traced; don't save the last run's trace again
+                    self.trace.clear()
+                self._run_program(settings.script, settings, backend)
+                return
+            cursor = _RouteCursor(settings.route) if settings.route is not None else None
+            aim, fire = self._click_steps(settings, backend, cursor)
+            scheduler = DeadlineScheduler(spin_threshold=PRECISE_SPIN_THRESHOLD if settings.precise_timing else 0.0,
+                                          catch_up=settings.catch_up, wake=wake)
+            self._scheduler = scheduler
+            wait = self._wait_step(settings, backend, scheduler, cursor)
+            controller = RateController() if settings.adaptive_rate else None
+            self.rate_limited = False
+            next_interval, schedule = self._schedule_steps(settings, scheduler, cursor, controller)
+            trace = self.trace
+            if trace is not None:
+                trace.clear()
+                wait, aim, schedule = self._traced_steps(trace, scheduler, wait, aim, schedule)
+            log = self.session_log
+            if log is not None:
+                # Outside the trace, so logging counts as bookkeeping like the metrics
+                wait, schedule = self._logged_steps(log, settings, backend, cursor, wait, schedule)
+            repeat_limit = settings.repeat_count if settings.repeat_count is not None else math.inf
+            record_interval = self.metrics.interval.record
+            record_lateness = self.metrics.lateness.record
+            record_backend = self.metrics.backend.record
+            clock = time.perf_counter
+            last_click = None
+
+            self.start_time = time.perf_counter()
+            scheduler.reset(self.start_time)
+            if log is not None:
+                log.begin(self.start_time)
+            if self.clicking:
+                self.status.publish('clicking')
+
+            while True:
+                # Clear before checking the state so a change made after the
+                # check still wakes up the wait below
+                wake.clear()
+                if not self.clicking:
+                    break
+
+                if self.paused:
+                    self._wait_paused()
+                    if self.clicking:
+                        self.status.publish('clicking')
+                    # Re-anchor the schedule so the pause isn't treated as a stall,
+                    # and don't count the pause as an interval
+                    scheduler.reset()
+                    last_click = None
+                    if controller is not None:
+                        controller.reset()
+                        self.rate_limited = False
+                    continue
+
+                if self.clicks_done >= repeat_limit:
+                    break
+
+                lateness = wait()
+                if lateness is None:
+                    # Woken up by a pause or stop request
+                    continue
+                click_start = clock()
+                aim()
+                fire()
+                click_end = clock()
+
+                self.clicks_done += 1
+                record_lateness(lateness)
+                record_backend(click_end - click_start)
+                if last_click is not None:
+                    record_interval(click_start - last_click)
+                last_click = click_start
+                schedule(next_interval(), click_start, click_end, lateness)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            raise
+        finally:
+            if self.start_time is not None:
+                self.stop_time = time.perf_counter()
+            if self._scheduler is not None:
+                self.metrics.missed += self._scheduler.missed
+                self._scheduler = None
+            self.clicking = False
+            self.paused = False
+            self.rate_limited = False
+            self._acknowledge()
+            if self.session_log is not None and self.session_log.active:
+                try:
+                    self.session_log.end(time.perf_counter(), error)
+                except OSError as e:
+                    error = error or f"Could not write the session log: {e}"
+            if self.trace is not None and self.trace.path:
+                try:
+                    self.trace.save()
+                except OSError as e:
+                    error = error or f"Could not save the trace: {e}"
+            self.status.publish('stopped', error=error)
@@ -0,0 +1,1228 @@
+"""
+Tkinter front end for the auto clicker.
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog
+import queue
+import sys
+import threading
+import time
+import traceback
+
+from .engine import ClickEngine
+from .hotkeys import HotkeyDispatcher, format_hotkey, parse_hotkey
+from .intervals import DISTRIBUTIONS
+from .jobs import JobScheduler, check_settings
+from .motion import MOTION_STYLES
+from .profiles import ProfileStore
+from .routes import Target, format_sequence, parse_sequence
+from .scheduler import DeadlineScheduler
+from .settings import DEFAULT_PROFILE, JOB_SECTION_PREFIX, PROFILE_SECTION_PREFIX, ClickSettings, config_path, is_true
+from .telemetry import StatusPoller
+
+# Milliseconds between two status refreshes (20 frames per second)
+STATUS_POLL_MS = 50
+# The stats panel is refreshed every this many status polls, and only while visible
+STATS_REFRESH_POLLS = 10
+# Actions on the Hotkeys tab: (name, title, default hotkey). Each is saved as <name>_hotkey.
+HOTKEY_ACTIONS = (
+    ('start_stop', "Start/Stop", 'f6'),
+    ('pick_location', "Pick Location", 'f7'),
+    ('pause_resume', "Pause/Resume", 'f8'),
+    ('next_profile', "Next Profile", 'f9'),
+)
+# Seconds Pick Location waits for a click before giving up
+PICK_TIMEOUT = 30.0
+# Seconds that importing the GUI and everything it needs may take before the
+# startup report flags it. Modules only some features use (pynput, the metrics
+# server, the engine process) are imported when those features are first used.
+IMPORT_BUDGET = 0.3
+# Startup milestones, in the order they are reached: (key, title)
+STARTUP_MILESTONES = (
+    ('imported', "imports"),
+    ('first_paint', "first paint"),
+    ('hotkeys_armed', "hotkeys armed"),
+)
+
+# --- Tooltip Class for enhanced GUI ---
+class Tooltip:
+    """
+    Helper class to create tooltips for widgets.
+    This provides a better user experience by giving context to each input field.
+
+    All tooltips share one borderless window, created the first time a
+    tooltip is shown and afterwards only moved, relabelled and hidden, so
+    hovering over widgets never creates or destroys windows.
+    """
+    window = None
+    label = None
+
+    def __init__(self, widget, text):
+        self.widget = widget
+        self.text = text
+        # Bind events to show and hide the tooltip
+        self.widget.bind("<Enter>", self.show_tooltip)
+        self.widget.bind("<Leave>", self.hide_tooltip)
+
+    @classmethod
+    def shared_window(cls, widget):
+        """The tooltip window of widget's application, created on first use."""
+        if cls.window is None or not cls.window.winfo_exists():
+            cls.window = tk.Toplevel(widget.winfo_toplevel())
+            # Removes window decorations (title bar, border)
+            cls.window.wm_overrideredirect(True)
+            cls.window.withdraw()
+            cls.label = ttk.Label(cls.window, background="#ffffe0", relief="solid", borderwidth=1,
+                                  font=("Helvetica", 10, "normal"))
+            cls.label.pack(ipadx=1)
+        return cls.window
+
+    def show_tooltip(self, event=None):
+        """Displays the tooltip near the widget."""
+        x, y, _, _ = self.widget.bbox("insert")
+        x += self.widget.winfo_rootx() + 25
+        y += self.widget.winfo_rooty() + 25
+
+        window = self.shared_window(self.widget)
+        Tooltip.label.config(text=self.text)
+        window.wm_geometry(f"+{x}+{y}")
+        window.deiconify()
+        window.lift()
+
+    def hide_tooltip(self, event=None):
+        """Hides the tooltip when the cursor leaves the widget."""
+        if Tooltip.window is not None:
+            Tooltip.window.withdraw()
+
+# --- Main AutoClicker Class ---
+class AutoClickerApp:
+    """
+    Main application class that encapsulates all GUI elements and
+    the auto-clicking logic.
+    """
+    def __init__(self, master, started_at=None):
+        self.master = master
+        # Startup milestones in seconds since started_at (when the app began
+        # importing the GUI), filled in as they are reached
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.startup_times = {}
+        if started_at is not None:
+            self.startup_times['imported'] = time.perf_counter() - started_at
+        self.on_startup_done = None
+        master.title("Python Auto Clicker")
+        master.geometry("500x750")
+        
+        # The headless engine does the actual clicking in its own thread (or
+        # process, see create_engine); its status is polled from the Tk thread
+        # by poll_status
+        self.engine = None
+        self.status_poller = None
+        # Extra jobs from the Jobs tab all run on one timer thread of their own
+        self.job_scheduler = JobScheduler()
+        # Config values each job was saved with, by job
+        self.job_values = {}
+        # Work handed to the Tk thread by the pynput listener threads
+        self.ui_calls = queue.Queue()
+
+        # One keyboard listener (and one mouse listener, once a location is
+        # picked) serve every hotkey and capture for the life of the app. The
+        # listener, and with it pynput, is started in the background once the
+        # window has been drawn (see arm_hotkeys)
+        self.hotkey_dispatcher = HotkeyDispatcher()
+        self.arming_thread = None
+        
+        # Hotkeys as canonical chords (see hotkeys.parse_hotkey), by action name
+        self.hotkeys = {name: default for name, _, default in HOTKEY_ACTIONS}
+        self.picking_location_mode = False
+        self.recording_hotkey_mode = None # An action name from HOTKEY_ACTIONS
+        
+        # Default click settings
+        self.picked_location = None
+        self.sequence_value = ''
+        self.profile = DEFAULT_PROFILE
+        self.interval_value = '1.0'
+        self.interval_unit = 'seconds'
+        self.click_type_value = 'single'
+        self.mouse_button_value = 'left'
+        self.hold_time_value = '0.1'
+        self.drag_to_value = ''
+        self.burst_count_value = '10'
+        self.location_value = 'current'
+        self.repeat_value = 'infinite'
+        self.repeat_count_value = '100'
+        self.pre_start_delay_value = '0'
+        self.random_interval_enabled = False
+        self.random_interval_min = '0.1'
+        self.random_interval_max = '0.5'
+        self.random_distribution_value = 'uniform'
+        self.random_seed_value = ''
+        self.precise_timing_enabled = False
+        self.catch_up_value = DeadlineScheduler.SKIP
+        self.adaptive_rate_enabled = False
+        self.motion_value = 'off'
+        self.motion_time_value = '0.15'
+        self.keys_value = ''
+        self.metrics_port = ''
+        self.metrics_file = ''
+        self.separate_process = False
+        self.metrics_exporters = []
+        self.metrics_endpoints = ''
+        self.control_socket = ''
+        self.control_server = None
+        self.trace_file = ''
+        self.session_log_dir = ''
+        self.polls_done = 0
+        
+        # Theme setting
+        self.theme = 'dark'
+        self.colors = {}
+
+        # All profiles and settings are kept in memory and written to disk in
+        # the background shortly after they change
+        self.store = ProfileStore(config_path())
+
+        # --- GUI Setup ---
+        self.load_settings()
+        self.create_engine()
+        self.load_jobs()
+        self.create_widgets()
+        self.rebuild_hotkeys()
+        self.set_theme(self.theme)
+        self.start_metrics_exporters()
+        self.start_control_server()
+        self.master.bind('<Map>', self.on_map, '+')
+        self.master.after(STATUS_POLL_MS, self.poll_status)
+        
+    def load_settings(self):
+        """Loads the application settings and the selected profile from the settings store."""
+        settings = self.store.app_values()
+        for name, _, default in HOTKEY_ACTIONS:
+            try:
+                self.hotkeys[name] = parse_hotkey(settings.get(f'{name}_hotkey', default))
+            except ValueError:
+                self.hotkeys[name] = default
+        self.theme = settings.get('theme', 'dark')
+        self.metrics_port = settings.get('metrics_port', '')
+        self.metrics_file = settings.get('metrics_file', '')
+        self.control_socket = settings.get('control_socket', '')
+        self.trace_file = settings.get('trace_file', '')
+        self.session_log_dir = settings.get('session_log', '')
+        self.separate_process = is_true(settings.get('separate_process', 'False'))
+        self.profile = self.store.active
+        self.load_profile_values(self.store.values(self.profile))
+
+    def load_profile_values(self, values):
+        """Takes the click settings of a profile, as config strings, into the widget values."""
+        self.interval_value = values['interval']
+        self.interval_unit = values['interval_unit']
+        self.click_type_value = values['click_type']
+        self.mouse_button_value = values['mouse_button']
+        self.hold_time_value = values['hold_time']
+        self.drag_to_value = values['drag_to']
+        self.burst_count_value = values['burst_count']
+        self.location_value = values['location']
+        self.sequence_value = values['sequence']
+        self.repeat_value = values['repeat']
+        self.repeat_count_value = values['repeat_count']
+        self.pre_start_delay_value = values['pre_start_delay']
+        self.random_interval_enabled = is_true(values['random_interval_enabled'])
+        self.random_interval_min = values['random_interval_min']
+        self.random_interval_max = values['random_interval_max']
+        self.random_distribution_value = values['random_distribution']
+        self.random_seed_value = values['random_seed']
+        self.precise_timing_enabled = is_true(values['precise_timing'])
+        self.catch_up_value = values['catch_up']
+        self.adaptive_rate_enabled = is_true(values['adaptive_rate'])
+        self.motion_value = values['motion']
+        self.motion_time_value = values['motion_time']
+        self.keys_value = values['keys']
+        self.picked_location = None
+        if 'fixed_location_x' in values and 'fixed_location_y' in values:
+            try:
+                self.picked_location = (int(values['fixed_location_x']), int(values['fixed_location_y']))
+            except ValueError:
+                self.picked_location = None
+
+    def show_profile_values(self):
+        """Puts the values taken by load_profile_values into the Settings tab widgets."""
+        for entry, value in ((self.interval_entry, self.interval_value), (self.random_interval_min_entry, self.random_interval_min),
+                             (self.random_interval_max_entry, self.random_interval_max), (self.random_seed_entry, self.random_seed_value),
+                             (self.pre_start_delay_entry, self.pre_start_delay_value), (self.repeat_count_entry, self.repeat_count_value),
+                             (self.motion_time_entry, self.motion_time_value), (self.keys_entry, self.keys_value),
+                             (self.hold_time_entry, self.hold_time_value), (self.drag_to_entry, self.drag_to_value),
+                             (self.burst_count_entry, self.burst_count_value)):
+            entry.delete(0, tk.END)
+            entry.insert(0, value)
+        self.interval_unit_var.set(self.interval_unit)
+        self.random_interval_enabled_var.set(self.random_interval_enabled)
+        self.random_distribution_var.set(self.random_distribution_value)
+        self.precise_timing_var.set(self.precise_timing_enabled)
+        self.adaptive_rate_var.set(self.adaptive_rate_enabled)
+        self.catch_up_var.set(self.catch_up_value)
+        self.click_type_var.set(self.click_type_value)
+        self.mouse_button_var.set(self.mouse_button_value)
+        self.location_var.set(self.location_value)
+        self.motion_var.set(self.motion_value)
+        self.repeat_var.set(self.repeat_value)
+        self.location_display_label.config(text=f" ({self.picked_location[0]}, {self.picked_location[1]})" if self.picked_location else " (Not set)")
+        self.update_sequence_label()
+
+    def create_engine(self):
+        """
+        Creates the click engine: in a child process if separate_process is
+        set, so Tk redraws can't delay clicks, otherwise in a thread of this one.
+        """
+        if self.separate_process:
+            from .process import ProcessEngine
+            try:
+                self.engine = ProcessEngine(session_log=self.create_session_log())
+            except (OSError, RuntimeError) as e:
+                messagebox.showerror("Error", f"Could not start the click engine process, clicking in this process instead: {e}")
+                self.engine = ClickEngine(trace=self.create_trace(), session_log=self.create_session_log())
+        else:
+            self.engine = ClickEngine(trace=self.create_trace(), session_log=self.create_session_log())
+        self.status_poller = StatusPoller(self.engine)
+
+    def create_trace(self):
+        """A PhaseTrace saved to trace_file after every run, or None if tracing is off."""
+        if not self.trace_file:
+            return None
+        from .trace import PhaseTrace
+        return PhaseTrace(path=self.trace_file)
+
+    def create_session_log(self):
+        """A SessionLog writing a file per run into the session_log directory, or None if it isn't set."""
+        if not self.session_log_dir:
+            return None
+        from .sessionlog import SessionLog
+        return SessionLog(self.session_log_dir)
+
+    def load_jobs(self):
+        """Creates the jobs saved in [JOB <name>] sections. Jobs whose settings no longer validate are skipped."""
+        for name, values in self.store.sections(JOB_SECTION_PREFIX).items():
+            try:
+                job = self.job_scheduler.add_job(ClickSettings.from_config(values), name)
+            except ValueError:
+                continue
+            self.job_values[job] = values
+
+    def save_settings(self):
+        """
+        Stores the current settings in the settings store. This only updates
+        memory; the store writes the file in the background a moment later.
+        """
+        values = {f'{name}_hotkey': chord for name, chord in self.hotkeys.items()}
+        values['theme'] = self.theme
+        values['separate_process'] = str(self.separate_process)
+        self.store.update_app(values)
+        self.store.update(self.profile, self.collect_settings())
+
+    def save_jobs(self):
+        """Stores the jobs of the Jobs tab as [JOB <name>] sections."""
+        self.store.replace_sections(JOB_SECTION_PREFIX, {job.name: values for job, values in self.job_values.items()})
+
+    def set_theme(self, theme_name):
+        """
+        Applies the selected theme to all widgets for a consistent look. Tabs
+        that haven't been opened yet get it when they are built.
+        """
+        self.theme = theme_name
+        if self.theme == 'dark':
+            self.colors = {
+                'bg_primary': '#2c3e50', 'bg_secondary': '#34495e', 'fg_primary': '#ecf0f1',
+                'fg_accent': '#f1c40f', 'button_bg_start': '#27ae60', 'button_bg_stop': '#c0392b',
+                'button_active_start': '#2ecc71', 'button_active_stop': '#e74c3c',
+                'button_record': '#3498db', 'button_active_record': '#2980b9'
+            }
+        else: # light theme
+            self.colors = {
+                'bg_primary': '#f0f0f0', 'bg_secondary': '#ffffff', 'fg_primary': '#333333',
+                'fg_accent': '#00509d', 'button_bg_start': '#5cb85c', 'button_bg_stop': '#d9534f',
+                'button_active_start': '#4cae4c', 'button_active_stop': '#c9302c',
+                'button_record': '#337ab7', 'button_active_record': '#286090'
+            }
+        
+        self.master.configure(bg=self.colors['bg_primary'])
+        style = ttk.Style(self.master)
+        style.theme_use('clam' if 'clam' in style.theme_names() else 'alt')
+        
+        # Configure styling for all ttk widgets
+        style.configure('TFrame', background=self.colors['bg_secondary'])
+        style.configure('TLabel', background=self.colors['bg_secondary'], foreground=self.colors['fg_primary'])
+        style.configure('TNotebook', background=self.colors['bg_primary'])
+        style.configure('TNotebook.Tab', background=self.colors['bg_secondary'], foreground=self.colors['fg_primary'])
+        style.map('TNotebook.Tab', background=[('selected', self.colors['bg_primary'])])
+        style.configure('TCheckbutton', background=self.colors['bg_secondary'], foreground=self.colors['fg_primary'])
+        style.configure('TRadiobutton', background=self.colors['bg_secondary'], foreground=self.colors['fg_primary'])
+        style.configure('TCombobox', fieldbackground=self.colors['bg_secondary'], foreground=self.colors['fg_primary'])
+        style.configure('TEntry', fieldbackground=self.colors['bg_secondary'], foreground=self.colors['fg_primary'], insertcolor=self.colors['fg_primary'])
+        style.configure('TButton', background=self.colors['button_record'], foreground=self.colors['fg_primary'])
+        style.map('TButton', background=[('active', self.colors['button_active_record'])])
+        
+        # Apply theme to top-level widgets
+        self.title_label.config(background=self.colors['bg_primary'], foreground=self.colors['fg_primary'])
+        self.status_label.config(background=self.colors['bg_primary'], foreground=self.colors['fg_accent'])
+        
+        # Specific button styles for the main control buttons
+        style.configure('Start.TButton', background=self.colors['button_bg_start'])
+        style.map('Start.TButton', background=[('active', self.colors['button_active_start'])])
+        style.configure('Stop.TButton', background=self.colors['button_bg_stop'])
+        style.map('Stop.TButton', background=[('active', self.colors['button_active_stop'])])
+        style.configure('Record.TButton', background=self.colors['button_record'])
+        style.map('Record.TButton', background=[('active', self.colors['button_active_record'])])
+        
+        # Every other label follows the TLabel style configured above, so
+        # only the few widgets that aren't ttk-styled need updating by hand
+        if 'jobs' in self.built_tabs:
+            self.theme_jobs_listbox()
+        if 'appearance' in self.built_tabs:
+            self.theme_toggle_button()
+
+    def theme_jobs_listbox(self):
+        self.jobs_listbox.config(background=self.colors['bg_secondary'], foreground=self.colors['fg_primary'],
+                                 selectbackground=self.colors['button_record'], highlightthickness=0)
+
+    def theme_toggle_button(self):
+        """Updates the theme toggle button's text."""
+        if self.theme == 'light':
+            self.theme_toggle_var.set('light')
+            self.theme_toggle.config(text="Dark Mode")
+        else:
+            self.theme_toggle_var.set('dark')
+            self.theme_toggle.config(text="Light Mode")
+
+    def toggle_theme(self):
+        """Switches between light and dark themes."""
+        self.set_theme('light' if self.theme == 'dark' else 'dark')
+
+    def toggle_separate_process(self):
+        """Saves the engine process choice, which is applied on the next start."""
+        self.separate_process = self.separate_process_var.get()
+        self.save_settings()
+        messagebox.showinfo("Restart Required", "The new setting takes effect the next time the auto clicker starts.")
+
+    def create_widgets(self):
+        """
+        Builds the window, the Settings tab and the controls. The other tabs
+        start out empty and are filled in by build_tab the first time they are
+        opened, so the window shows up without waiting for widgets nobody has
+        looked at yet.
+        """
+
+        self.title_label = ttk.Label(self.master, text="Python Auto Clicker", font=("Helvetica", 24, "bold"))
+        self.title_label.pack(pady=(20, 10))
+
+        self.notebook = ttk.Notebook(self.master)
+        self.notebook.pack(pady=10, padx=20, expand=True, fill="both")
+        
+        # Tabs for settings, hotkeys, and appearance
+        self.settings_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.settings_frame, text='Settings')
+        self.hotkeys_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.hotkeys_frame, text='Hotkeys')
+        self.appearance_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.appearance_frame, text='Appearance')
+        self.stats_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.stats_frame, text='Stats')
+        self.jobs_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.jobs_frame, text='Jobs')
+        # Builders of the tabs that haven't been opened yet, by tab widget path
+        self.built_tabs = {'settings'}
+        self.tab_builders = {
+            str(self.hotkeys_frame): ('hotkeys', self.build_hotkeys_tab),
+            str(self.appearance_frame): ('appearance', self.build_appearance_tab),
+            str(self.stats_frame): ('stats', self.build_stats_tab),
+            str(self.jobs_frame): ('jobs', self.build_jobs_tab),
+        }
+        self.notebook.bind('<<NotebookTabChanged>>', lambda event: self.build_tab(self.notebook.select()))
+
+        # --- Settings Tab Widgets ---
+        self.profile_frame = ttk.Frame(self.settings_frame)
+        self.profile_frame.pack(fill="x", pady=5, padx=5)
+        ttk.Label(self.profile_frame, text="Profile:", font=("Helvetica", 12)).pack(side="left")
+        self.profile_var = tk.StringVar(value=self.profile)
+        self.profile_dropdown = ttk.Combobox(self.profile_frame, textvariable=self.profile_var, width=14, font=("Helvetica", 12), state='readonly', values=self.store.names())
+        self.profile_dropdown.pack(side="left", padx=5)
+        self.profile_dropdown.bind('<<ComboboxSelected>>', lambda event: self.switch_profile(self.profile_var.get()))
+        Tooltip(self.profile_dropdown, "Each profile keeps its own click settings. Switch with the Next Profile hotkey.")
+        ttk.Button(self.profile_frame, text="Delete", command=self.delete_profile).pack(side="right", padx=2)
+        ttk.Button(self.profile_frame, text="New", command=self.new_profile).pack(side="right", padx=2)
+
+        self.interval_frame = ttk.Frame(self.settings_frame)
+        self.interval_frame.pack(fill="x", pady=5, padx=5)
+        ttk.Label(self.interval_frame, text="Click Speed:", font=("Helvetica", 12)).pack(side="left")
+        self.interval_entry = ttk.Entry(self.interval_frame, width=10, font=("Helvetica", 12))
+        self.interval_entry.insert(0, self.interval_value)
+        self.interval_entry.pack(side="left", padx=(5, 0))
+        Tooltip(self.interval_entry, "Enter the numeric value for the click speed.")
+        
+        self.interval_unit_var = tk.StringVar(value=self.interval_unit)
+        self.interval_unit_dropdown = ttk.Combobox(self.interval_frame, textvariable=self.interval_unit_var, font=("Helvetica", 12), state='readonly', values=['seconds', 'ms', 'CPS', 'CPM'])
+        self.interval_unit_dropdown.pack(side="left", padx=(5, 0))
+        Tooltip(self.interval_unit_dropdown, "Select the unit for the click speed.")
+
+        self.random_interval_enabled_var = tk.BooleanVar(value=self.random_interval_enabled)
+        random_check = ttk.Checkbutton(self.settings_frame, text="Random Interval", variable=self.random_interval_enabled_var)
+        random_check.pack(anchor="w", pady=(10, 0), padx=5)
+        Tooltip(random_check, "Enable a random delay between clicks to mimic human behavior.")
+        
+        self.random_frame = ttk.Frame(self.settings_frame)
+        self.random_frame.pack(fill="x", pady=5, padx=5)
+        ttk.Label(self.random_frame, text="Min Delay (s):", font=("Helvetica", 12)).pack(side="left")
+        self.random_interval_min_entry = ttk.Entry(self.random_frame, width=8, font=("Helvetica", 12))
+        self.random_interval_min_entry.insert(0, self.random_interval_min)
+        self.random_interval_min_entry.pack(side="left", padx=5)
+        Tooltip(self.random_interval_min_entry, "Minimum random delay in seconds.")
+        ttk.Label(self.random_frame, text="Max Delay (s):", font=("Helvetica", 12)).pack(side="left")
+        self.random_interval_max_entry = ttk.Entry(self.random_frame, width=8, font=("Helvetica", 12))
+        self.random_interval_max_entry.insert(0, self.random_interval_max)
+        self.random_interval_max_entry.pack(side="left", padx=5)
+        Tooltip(self.random_interval_max_entry, "Maximum random delay in seconds.")
+
+        self.random_options_frame = ttk.Frame(self.settings_frame)
+        self.random_options_frame.pack(fill="x", pady=5, padx=5)
+        ttk.Label(self.random_options_frame, text="Distribution:", font=("Helvetica", 12)).pack(side="left")
+        self.random_distribution_var = tk.StringVar(value=self.random_distribution_value)
+        self.random_distribution_dropdown = ttk.Combobox(self.random_options_frame, textvariable=self.random_distribution_var, width=11, font=("Helvetica", 12), state='readonly', values=list(DISTRIBUTIONS))
+        self.random_distribution_dropdown.pack(side="left", padx=5)
+        Tooltip(self.random_distribution_dropdown, "How random delays are spread between the minimum and maximum.")
+        ttk.Label(self.random_options_frame, text="Seed:", font=("Helvetica", 12)).pack(side="left")
+        self.random_seed_entry = ttk.Entry(self.random_options_frame, width=10, font=("Helvetica", 12))
+        self.random_seed_entry.insert(0, self.random_seed_value)
+        self.random_seed_entry.pack(side="left", padx=5)
+        Tooltip(self.random_seed_entry, "Fixed seed to repeat the same random delays on every run. Leave empty for new delays each run.")
+
+        self.timing_frame = ttk.Frame(self.settings_frame)
+        self.timing_frame.pack(fill="x", pady=5, padx=5)
+        self.precise_timing_var = tk.BooleanVar(value=self.precise_timing_enabled)
+        precise_check = ttk.Checkbutton(self.timing_frame, text="Precise Timing", variable=self.precise_timing_var)
+        precise_check.pack(side="left")
+        Tooltip(precise_check, "Busy-wait the last moments before each click for sub-millisecond accuracy (uses more CPU).")
+        self.adaptive_rate_var = tk.BooleanVar(value=self.adaptive_rate_enabled)
+        adaptive_check = ttk.Checkbutton(self.timing_frame, text="Adaptive", variable=self.adaptive_rate_var)
+        adaptive_check.pack(side="left", padx=5)
+        Tooltip(adaptive_check, "Measure how long each mouse call takes and adjust the waits so the rate stays on target. Warns when the mouse itself is too slow.")
+        self.catch_up_var = tk.StringVar(value=self.catch_up_value)
+        self.catch_up_dropdown = ttk.Combobox(self.timing_frame, textvariable=self.catch_up_var, width=8, font=("Helvetica", 12), state='readonly', values=list(DeadlineScheduler.CATCH_UP_POLICIES))
+        self.catch_up_dropdown.pack(side="right")
+        ttk.Label(self.timing_frame, text="Catch-up:", font=("Helvetica", 12)).pack(side="right", padx=5)
+        Tooltip(self.catch_up_dropdown, "What to do with clicks missed while the system was stalled: skip them or burst them out.")
+
+        self.delay_frame = ttk.Frame(self.settings_frame)
+        self.delay_frame.pack(fill="x", pady=5, padx=5)
+        ttk.Label(self.delay_frame, text="Pre-start Delay (seconds):", font=("Helvetica", 12)).pack(side="left")
+        self.pre_start_delay_entry = ttk.Entry(self.delay_frame, width=10, font=("Helvetica", 12))
+        self.pre_start_delay_entry.insert(0, self.pre_start_delay_value)
+        self.pre_start_delay_entry.pack(side="right")
+        Tooltip(self.pre_start_delay_entry, "Delay before clicking starts to let you move the cursor.")
+        
+        self.click_type_frame = ttk.Frame(self.settings_frame)
+        self.click_type_frame.pack(fill="x", pady=5, padx=5)
+        ttk.Label(self.click_type_frame, text="Click Type:", font=("Helvetica", 12)).pack(side="left")
+        self.click_type_var = tk.StringVar(value=self.click_type_value)
+        ttk.Radiobutton(self.click_type_frame, text="Single", variable=self.click_type_var, value="single").pack(side="left", padx=5)
+        ttk.Radiobutton(self.click_type_frame, text="Double", variable=self.click_type_var, value="double").pack(side="left", padx=5)
+        for text, value, tip in (("Hold", "hold", "Press the button and keep it down for the hold time."),
+                                 ("Drag", "drag", "Press the button, drag to the Drag To position over the hold time and release it there."),
+                                 ("Burst", "burst", "Click the burst count times as fast as the mouse allows, then wait for the next interval.")):
+            radio = ttk.Radiobutton(self.click_type_frame, text=text, variable=self.click_type_var, value=value)
+            radio.pack(side="left", padx=5)
+            Tooltip(radio, tip)
+
+        self.gesture_frame = ttk.Frame(self.settings_frame)
+        self.gesture_frame.pack(fill="x", pady=5, padx=5)
+        ttk.Label(self.gesture_frame, text="Hold (s):", font=("Helvetica", 12)).pack(side="left")
+        self.hold_time_entry = ttk.Entry(self.gesture_frame, width=6, font=("Helvetica", 12))
+        self.hold_time_entry.insert(0, self.hold_time_value)
+        self.hold_time_entry.pack(side="left", padx=5)
+        Tooltip(self.hold_time_entry, "How long hold and drag clicks keep the button down.")
+        ttk.Label(self.gesture_frame, text="Drag To:", font=("Helvetica", 12)).pack(side="left")
+        self.drag_to_entry = ttk.Entry(self.gesture_frame, width=10, font=("Helvetica", 12))
+        self.drag_to_entry.insert(0, self.drag_to_value)
+        self.drag_to_entry.pack(side="left", padx=5)
+        Tooltip(self.drag_to_entry, "Where drag clicks release the button, as x,y.")
+        ttk.Label(self.gesture_frame, text="Burst:", font=("Helvetica", 12)).pack(side="left")
+        self.burst_count_entry = ttk.Entry(self.gesture_frame, width=5, font=("Helvetica", 12))
+        self.burst_count_entry.insert(0, self.burst_count_value)
+        self.burst_count_entry.pack(side="left", padx=5)
+        Tooltip(self.burst_count_entry, "Clicks per burst. The Stats tab shows the rate bursts reach.")
+
+        self.button_frame = ttk.Frame(self.settings_frame)
+        self.button_frame.pack(fill="x", pady=5, padx=5)
+        ttk.Label(self.button_frame, text="Mouse Button:", font=("Helvetica", 12)).pack(side="left")
+        self.mouse_button_var = tk.StringVar(value=self.mouse_button_value)
+        ttk.Radiobutton(self.button_frame, text="Left", variable=self.mouse_button_var, value="left").pack(side="left", padx=5)
+        ttk.Radiobutton(self.button_frame, text="Right", variable=self.mouse_button_var, value="right").pack(side="left", padx=5)
+        ttk.Radiobutton(self.button_frame, text="Middle", variable=self.mouse_button_var, value="middle").pack(side="left", padx=5)
+        for text, value in (("X1", "x1"), ("X2", "x2")):
+            radio = ttk.Radiobutton(self.button_frame, text=text, variable=self.mouse_button_var, value=value)
+            radio.pack(side="left", padx=5)
+            Tooltip(radio, "The side (back and forward) buttons, on mice that have them.")
+
+        self.keys_frame = ttk.Frame(self.settings_frame)
+        self.keys_frame.pack(fill="x", pady=5, padx=5)
+        ttk.Label(self.keys_frame, text="Press Keys:", font=("Helvetica", 12)).pack(side="left")
+        self.keys_entry = ttk.Entry(self.keys_frame, width=24, font=("Helvetica", 12))
+        self.keys_entry.insert(0, self.keys_value)
+        self.keys_entry.pack(side="left", padx=5)
+        Tooltip(self.keys_entry, 'Keys to press instead of clicking, e.g. space, ctrl+c or "text" enter. Leave empty to click.')
+        
+        self.location_frame = ttk.Frame(self.settings_frame)
+        self.location_frame.pack(fill="x", pady=5, padx=5)
+        ttk.Label(self.location_frame, text="Click Location:", font=("Helvetica", 12)).pack(side="left")
+        self.location_var = tk.StringVar(value=self.location_value)
+        ttk.Radiobutton(self.location_frame, text="Current", variable=self.location_var, value="current").pack(side="left", padx=5)
+        ttk.Radiobutton(self.location_frame, text="Fixed", variable=self.location_var, value="fixed").pack(side="left", padx=5)
+        self.location_display_label = ttk.Label(self.location_frame, text=f" ({self.picked_location[0]}, {self.picked_location[1]})" if self.picked_location else " (Not set)", font=("Helvetica", 10, "italic"))
+        self.location_display_label.pack(side="left")
+        Tooltip(self.location_display_label, "The coordinates of the fixed location to click.")
+        ttk.Radiobutton(self.location_frame, text="Sequence", variable=self.location_var, value="sequence").pack(side="left", padx=5)
+
+        self.sequence_frame = ttk.Frame(self.settings_frame)
+        self.sequence_frame.pack(fill="x", pady=5, padx=5)
+        self.sequence_display_label = ttk.Label(self.sequence_frame, text="", font=("Helvetica", 10, "italic"))
+        self.sequence_display_label.pack(side="left")
+        Tooltip(self.sequence_display_label, "In Sequence mode, press the Pick Location hotkey to add the cursor position as the next target.")
+        ttk.Button(self.sequence_frame, text="Clear", command=self.clear_sequence).pack(side="right", padx=5)
+        ttk.Button(self.sequence_frame, text="Edit Sequence", command=self.edit_sequence).pack(side="right", padx=5)
+        self.update_sequence_label()
+
+        self.motion_frame = ttk.Frame(self.settings_frame)
+        self.motion_frame.pack(fill="x", pady=5, padx=5)
+        ttk.Label(self.motion_frame, text="Motion:", font=("Helvetica", 12)).pack(side="left")
+        self.motion_var = tk.StringVar(value=self.motion_value)
+        self.motion_dropdown = ttk.Combobox(self.motion_frame, textvariable=self.motion_var, width=13, font=("Helvetica", 12), state='readonly', values=list(MOTION_STYLES))
+        self.motion_dropdown.pack(side="left", padx=5)
+        Tooltip(self.motion_dropdown, "Move the cursor to fixed and sequence targets along a curved, human-like path instead of jumping there.")
+        ttk.Label(self.motion_frame, text="Time (s):", font=("Helvetica", 12)).pack(side="left")
+        self.motion_time_entry = ttk.Entry(self.motion_frame, width=6, font=("Helvetica", 12))
+        self.motion_time_entry.insert(0, self.motion_time_value)
+        self.motion_time_entry.pack(side="left", padx=5)
+        Tooltip(self.motion_time_entry, "How long before each click the cursor starts moving. Cut short if the clicks come faster.")
+        
+        self.repeat_frame = ttk.Frame(self.settings_frame)
+        self.repeat_frame.pack(fill="x", pady=5, padx=5)
+        ttk.Label(self.repeat_frame, text="Repeat:", font=("Helvetica", 12)).pack(side="left")
+        self.repeat_var = tk.StringVar(value=self.repeat_value)
+        ttk.Radiobutton(self.repeat_frame, text="Infinite", variable=self.repeat_var, value="infinite").pack(side="left", padx=5)
+        ttk.Radiobutton(self.repeat_frame, text="Count:", variable=self.repeat_var, value="count").pack(side="left", padx=5)
+        self.repeat_count_entry = ttk.Entry(self.repeat_frame, width=10, font=("Helvetica", 12))
+        self.repeat_count_entry.insert(0, self.repeat_count_value)
+        self.repeat_count_entry.pack(side="left")
+        Tooltip(self.repeat_count_entry, "The number of times to click before stopping.")
+        
+        # Status Label for real-time feedback
+        self.status_label = ttk.Label(self.master, text=f"Status: Ready (Hotkey: {self.hotkey_text('start_stop')})", font=("Helvetica", 12, "italic"))
+        self.status_label.pack(pady=10)
+
+        # Control Buttons
+        self.control_frame = ttk.Frame(self.master)
+        self.control_frame.pack(pady=10)
+        self.start_button = ttk.Button(self.control_frame, text="Start Clicking", command=self.start_clicking_wrapper, style='Start.TButton')
+        self.start_button.pack(side="left", padx=10, ipady=5)
+        self.stop_button = ttk.Button(self.control_frame, text="Stop Clicking", command=self.stop_clicking, style='Stop.TButton', state=tk.DISABLED)
+        self.stop_button.pack(side="left", padx=10, ipady=5)
+
+    def build_tab(self, tab):
+        """Fills in a tab the first time it is opened."""
+        name, builder = self.tab_builders.pop(tab, (None, None))
+        if builder is not None:
+            builder()
+            self.built_tabs.add(name)
+
+    def build_hotkeys_tab(self):
+        """One row per hotkey action, each with its own Record button."""
+        self.hotkeys_container = ttk.Frame(self.hotkeys_frame)
+        self.hotkeys_container.pack(fill='both', expand=True, padx=10, pady=10)
+
+        # One row per hotkey action
+        self.hotkey_frames = {}
+        self.hotkey_labels = {}
+        self.hotkey_buttons = {}
+        for name, title, _ in HOTKEY_ACTIONS:
+            frame = self.hotkey_frames[name] = ttk.Frame(self.hotkeys_container)
+            frame.pack(fill="x", pady=5)
+            ttk.Label(frame, text=f"{title} Hotkey:", font=("Helvetica", 12)).pack(side="left")
+            self.hotkey_labels[name] = ttk.Label(frame, text=self.hotkey_text(name), font=("Helvetica", 12, "bold"))
+            self.hotkey_labels[name].pack(side="left", padx=5)
+            self.hotkey_buttons[name] = ttk.Button(frame, text="Record Hotkey", command=lambda name=name: self.record_hotkey(hotkey_type=name), style='Record.TButton')
+            self.hotkey_buttons[name].pack(side="right", padx=5)
+        ttk.Label(self.hotkeys_container, text="Hold Ctrl, Alt, Shift or Cmd while recording to make a chord.", font=("Helvetica", 10, "italic")).pack(anchor="w", pady=(10, 0))
+
+    def build_appearance_tab(self):
+        """Theme and engine process options."""
+        self.appearance_container = ttk.Frame(self.appearance_frame)
+        self.appearance_container.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        self.theme_toggle_var = tk.StringVar(value=self.theme)
+        self.theme_toggle = ttk.Checkbutton(self.appearance_container, text="Light Mode", variable=self.theme_toggle_var, onvalue='light', offvalue='dark', command=self.toggle_theme)
+        self.theme_toggle.pack(anchor="w", pady=5, padx=5)
+        self.separate_process_var = tk.BooleanVar(value=self.separate_process)
+        separate_process_check = ttk.Checkbutton(self.appearance_container, text="Run clicker in a separate process", variable=self.separate_process_var, command=self.toggle_separate_process)
+        separate_process_check.pack(anchor="w", pady=5, padx=5)
+        Tooltip(separate_process_check, "Click from a separate process so redraws and other UI work can't delay clicks. Takes effect after a restart.")
+        self.theme_toggle_button()
+
+    def build_stats_tab(self):
+        """Latency percentiles, totals, metrics endpoints and startup times."""
+        self.stats_container = ttk.Frame(self.stats_frame)
+        self.stats_container.pack(fill='both', expand=True, padx=10, pady=10)
+        self.stats_labels = {}
+        for key, title in (('interval', "Click interval"), ('lateness', "Lateness"), ('backend', "Backend call"),
+                           ('burst', "Burst click")):
+            ttk.Label(self.stats_container, text=f"{title}:", font=("Helvetica", 12, "bold")).pack(anchor="w", pady=(5, 0))
+            self.stats_labels[key] = ttk.Label(self.stats_container, text="No clicks yet", font=("Helvetica", 11))
+            self.stats_labels[key].pack(anchor="w", padx=10)
+        self.stats_totals_label = ttk.Label(self.stats_container, text="", font=("Helvetica", 11))
+        self.stats_totals_label.pack(anchor="w", pady=(10, 0))
+        self.stats_endpoint_label = ttk.Label(self.stats_container, text=self.metrics_endpoints, font=("Helvetica", 10, "italic"))
+        self.stats_endpoint_label.pack(anchor="w", pady=(5, 0))
+        self.stats_startup_label = ttk.Label(self.stats_container, text=self.startup_report() if 'hotkeys_armed' in self.startup_times else "", font=("Helvetica", 10, "italic"))
+        self.stats_startup_label.pack(anchor="w", pady=(5, 0))
+        self.reset_stats_button = ttk.Button(self.stats_container, text="Reset Stats", command=self.reset_stats)
+        self.reset_stats_button.pack(anchor="w", pady=10)
+        self.refresh_stats()
+
+    def build_jobs_tab(self):
+        """The job list and its controls."""
+        self.jobs_container = ttk.Frame(self.jobs_frame)
+        self.jobs_container.pack(fill='both', expand=True, padx=10, pady=10)
+        ttk.Label(self.jobs_container, text="Jobs run alongside the main clicker, each with its own settings.", font=("Helvetica", 10, "italic")).pack(anchor="w")
+        self.jobs_listbox = tk.Listbox(self.jobs_container, height=12, font=("Courier", 10), activestyle='none', exportselection=False)
+        self.jobs_listbox.pack(fill='both', expand=True, pady=5)
+        self.theme_jobs_listbox()
+        self.jobs_buttons_frame = ttk.Frame(self.jobs_container)
+        self.jobs_buttons_frame.pack(fill="x")
+        add_job_button = ttk.Button(self.jobs_buttons_frame, text="Add Current Settings", command=self.add_job)
+        add_job_button.pack(side="left", padx=2)
+        Tooltip(add_job_button, "Save the settings from the Settings tab as a new job.")
+        ttk.Button(self.jobs_buttons_frame, text="Start", command=lambda: self.control_job('start')).pack(side="left", padx=2)
+        ttk.Button(self.jobs_buttons_frame, text="Pause", command=lambda: self.control_job('toggle_pause')).pack(side="left", padx=2)
+        ttk.Button(self.jobs_buttons_frame, text="Stop", command=lambda: self.control_job('stop')).pack(side="left", padx=2)
+        ttk.Button(self.jobs_buttons_frame, text="Remove", command=self.remove_job).pack(side="left", padx=2)
+        self.jobs_all_frame = ttk.Frame(self.jobs_container)
+        self.jobs_all_frame.pack(fill="x", pady=5)
+        ttk.Button(self.jobs_all_frame, text="Start All", command=self.start_all_jobs).pack(side="left", padx=2)
+        ttk.Button(self.jobs_all_frame, text="Stop All", command=lambda: self.job_scheduler.stop_all(wait=False)).pack(side="left", padx=2)
+        self.refresh_jobs()
+
+    def hotkey_text(self, name):
+        """The hotkey of an action as it is shown to the user."""
+        return format_hotkey(self.hotkeys[name])
+
+    def on_map(self, event):
+        """Notes when the main window first appears and starts arming the hotkeys."""
+        if event.widget is not self.master or 'first_paint' in self.startup_times:
+            return
+        self.startup_times['first_paint'] = None
+        # Runs after the redraws Tk queued while mapping the window
+        self.master.after_idle(self.on_first_paint)
+
+    def on_first_paint(self):
+        self.startup_times['first_paint'] = time.perf_counter() - self.started_at
+        self.arming_thread = threading.Thread(target=self.arm_hotkeys, daemon=True)
+        self.arming_thread.start()
+
+    def arm_hotkeys(self):
+        """
+        Starts the shared keyboard listener. Runs in its own thread so
+        importing pynput and connecting to the display never holds up drawing
+        the window; the bindings are already in place, so hotkeys work from
+        the moment the listener runs.
+        """
+        try:
+            self.hotkey_dispatcher.start()
+        except Exception as e:
+            self.call_in_ui(self.status_label.config, {'text': f"Status: Hotkeys unavailable: {e}"})
+            return
+        self.startup_times['hotkeys_armed'] = time.perf_counter() - self.started_at
+        self.call_in_ui(self.show_startup_times)
+
+    def startup_report(self):
+        """The startup milestones reached so far as one line, flagging imports over IMPORT_BUDGET."""
+        parts = [f"{title} {self.startup_times[key] * 1000:.0f} ms" for key, title in STARTUP_MILESTONES
+                 if self.startup_times.get(key) is not None]
+        report = "Startup: " + ", ".join(parts)
+        if self.startup_times.get('imported', 0.0) > IMPORT_BUDGET:
+            report += f" (imports over the {IMPORT_BUDGET * 1000:.0f} ms budget)"
+        return report
+
+    def show_startup_times(self):
+        """Shows the startup milestones on the Stats tab and passes them to on_startup_done."""
+        if 'stats' in self.built_tabs:
+            self.stats_startup_label.config(text=self.startup_report())
+        if self.on_startup_done is not None:
+            self.on_startup_done(self)
+
+    def rebuild_hotkeys(self):
+        """
+        Rebinds every hotkey. Jobs and profiles whose config section has a
+        hotkey key get one that toggles the job or switches to the profile;
+        the Hotkeys tab actions are bound last, so they win on a clash.
+        """
+        pairs = []
+        for job, values in self.job_values.items():
+            if values.get('hotkey'):
+                pairs.append((values['hotkey'], lambda pressed_at, job=job: self.toggle_job(job, pressed_at)))
+        for name, values in self.store.sections(PROFILE_SECTION_PREFIX).items():
+            if values.get('hotkey'):
+                pairs.append((values['hotkey'], lambda pressed_at, name=name: self.call_in_ui(self.switch_profile, name)))
+        actions = {
+            'start_stop': self.on_start_stop_hotkey,
+            'pick_location': lambda pressed_at: self.call_in_ui(self.pick_location),
+            'pause_resume': self.on_pause_resume_hotkey,
+            'next_profile': lambda pressed_at: self.call_in_ui(self.next_profile),
+        }
+        pairs.extend((self.hotkeys[name], actions[name]) for name, _, _ in HOTKEY_ACTIONS)
+        for hotkey, error in self.hotkey_dispatcher.set_bindings(pairs):
+            self.status_label.config(text=f"Status: {error}")
+    
+    def record_hotkey(self, hotkey_type):
+        """Captures the next key press, with any modifiers held, as the new hotkey of an action."""
+        if self.recording_hotkey_mode: return
+        if not self.hotkey_dispatcher.capture_key(lambda chord: self.call_in_ui(self.apply_recorded_hotkey, chord)):
+            return
+        
+        self.recording_hotkey_mode = hotkey_type
+        # Reset colors of all hotkey labels to the theme's before highlighting the active one
+        for label in self.hotkey_labels.values():
+            label.config(foreground='')
+        title = next(title for name, title, _ in HOTKEY_ACTIONS if name == hotkey_type)
+        self.status_label.config(text=f"Status: Press a key for {title} hotkey...", foreground=self.colors['fg_accent'])
+        self.hotkey_labels[hotkey_type].config(foreground=self.colors['fg_accent'])
+
+    def apply_recorded_hotkey(self, chord):
+        """Stores a chord captured by record_hotkey as the new hotkey."""
+        self.hotkeys[self.recording_hotkey_mode] = chord
+        self.hotkey_labels[self.recording_hotkey_mode].config(text=format_hotkey(chord), foreground='')
+        self.status_label.config(text=f"Status: Hotkey set to {format_hotkey(chord)}", foreground=self.colors['fg_accent'])
+        self.recording_hotkey_mode = None
+        self.rebuild_hotkeys()
+        self.save_settings()
+
+    # --- Hotkey actions ---
+    # These run on the keyboard listener thread: engine controls are applied
+    # directly, while anything that touches widgets is handed to the Tk thread.
+    def on_start_stop_hotkey(self, pressed_at):
+        if not self.engine.clicking:
+            self.call_in_ui(self.start_clicking_wrapper)
+        else:
+            # The key press timestamp lets the engine report hotkey-to-effect latency
+            self.engine.stop(wait=False, requested_at=pressed_at)
+
+    def on_pause_resume_hotkey(self, pressed_at):
+        if self.engine.clicking:
+            self.engine.toggle_pause(requested_at=pressed_at)
+
+    def toggle_job(self, job, pressed_at):
+        """Starts a job if it is stopped and stops it otherwise."""
+        if job.clicking:
+            job.stop(requested_at=pressed_at)
+        else:
+            job.start()
+    
+    def pick_location(self):
+        """Captures the position of the next mouse click as the fixed location."""
+        if self.picking_location_mode:
+            return
+        if self.location_var.get() == 'sequence':
+            self.add_sequence_target()
+            return
+
+        try:
+            captured = self.hotkey_dispatcher.capture_click(
+                lambda x, y: self.call_in_ui(self.apply_picked_location, x, y), PICK_TIMEOUT,
+                lambda: self.call_in_ui(self.cancel_picked_location))
+        except Exception as e:
+            self.status_label.config(text=f"Status: Can't pick a location: {e}")
+            return
+        if not captured:
+            return
+        self.picking_location_mode = True
+        self.status_label.config(text="Status: Click on the desired fixed location (Esc cancels)...", foreground=self.colors['fg_accent'])
+
+    def apply_picked_location(self, x, y):
+        """Stores a position captured by pick_location as the fixed location."""
+        self.picked_location = (x, y)
+        self.location_display_label.config(text=f" ({self.picked_location[0]}, {self.picked_location[1]})")
+        self.status_label.config(text="Status: Fixed location saved.", foreground=self.colors['fg_accent'])
+        self.picking_location_mode = False
+        self.save_settings()
+
+    def cancel_picked_location(self):
+        """Ends pick_location after Escape or PICK_TIMEOUT without a click."""
+        self.status_label.config(text="Status: Picking a location was cancelled.", foreground=self.colors['fg_accent'])
+        self.picking_location_mode = False
+
+    def update_sequence_label(self):
+        """Shows how many targets the click sequence has."""
+        try:
+            count = len(parse_sequence(self.sequence_value))
+        except ValueError:
+            count = 0
+        text = f"Sequence: {count} target{'s' if count != 1 else ''}" if count else "Sequence: empty (add targets with the Pick Location hotkey)"
+        self.sequence_display_label.config(text=text)
+
+    def add_sequence_target(self):
+        """Appends the current cursor position to the click sequence, using the selected button and click type."""
+        x, y = self.engine.backend.position
+        # Sequence targets only single or double click
+        click_type = 'double' if self.click_type_var.get() == 'double' else 'single'
+        target = Target(int(x), int(y), self.mouse_button_var.get(), click_type)
+        self.sequence_value = ';'.join(filter(None, [self.sequence_value, target.format()]))
+        self.update_sequence_label()
+        self.status_label.config(text=f"Status: Added sequence target ({target.x}, {target.y}).", foreground=self.colors['fg_accent'])
+
+    def clear_sequence(self):
+        """Removes all targets from the click sequence."""
+        self.sequence_value = ''
+        self.update_sequence_label()
+
+    def edit_sequence(self):
+        """Opens a window to edit the click sequence as text, one target per line."""
+        editor = tk.Toplevel(self.master)
+        editor.title("Edit Sequence")
+        editor.configure(bg=self.colors['bg_primary'])
+        ttk.Label(editor, text="One target per line: x, y, button, click type, dwell (s), repeat", font=("Helvetica", 10)).pack(padx=10, pady=(10, 5), anchor="w")
+        text = tk.Text(editor, width=50, height=15, font=("Courier", 11), bg=self.colors['bg_secondary'], fg=self.colors['fg_primary'], insertbackground=self.colors['fg_primary'])
+        text.pack(padx=10, pady=5, fill="both", expand=True)
+        try:
+            text.insert('1.0', format_sequence(parse_sequence(self.sequence_value), separator='\n'))
+        except ValueError:
+            text.insert('1.0', self.sequence_value.replace(';', '\n'))
+
+        def save():
+            try:
+                targets = parse_sequence(text.get('1.0', 'end'))
+            except ValueError as e:
+                messagebox.showerror("Error", f"Invalid sequence: {e}", parent=editor)
+                return
+            self.sequence_value = format_sequence(targets)
+            self.update_sequence_label()
+            editor.destroy()
+
+        ttk.Button(editor, text="Save", command=save).pack(pady=(5, 10))
+
+    def call_in_ui(self, func, *args):
+        """Queues a call to run on the Tk thread at the next status poll. Safe from any thread."""
+        self.ui_calls.put((func, args))
+
+    def collect_settings(self):
+        """Collects the click settings from the GUI widgets, keyed like the config file."""
+        values = {
+            'interval': self.interval_entry.get(),
+            'interval_unit': self.interval_unit_var.get(),
+            'click_type': self.click_type_var.get(),
+            'mouse_button': self.mouse_button_var.get(),
+            'hold_time': self.hold_time_entry.get(),
+            'drag_to': self.drag_to_entry.get(),
+            'burst_count': self.burst_count_entry.get(),
+            'location': self.location_var.get(),
+            'sequence': self.sequence_value,
+            'repeat': self.repeat_var.get(),
+            'repeat_count': self.repeat_count_entry.get(),
+            'pre_start_delay': self.pre_start_delay_entry.get(),
+            'random_interval_enabled': 'True' if self.random_interval_enabled_var.get() else 'False',
+            'random_interval_min': self.random_interval_min_entry.get(),
+            'random_interval_max': self.random_interval_max_entry.get(),
+            'random_distribution': self.random_distribution_var.get(),
+            'random_seed': self.random_seed_entry.get(),
+            'precise_timing': 'True' if self.precise_timing_var.get() else 'False',
+            'catch_up': self.catch_up_var.get(),
+            'adaptive_rate': 'True' if self.adaptive_rate_var.get() else 'False',
+            'motion': self.motion_var.get(),
+            'motion_time': self.motion_time_entry.get(),
+            'keys': self.keys_entry.get(),
+        }
+        if self.picked_location:
+            values['fixed_location_x'] = str(self.picked_location[0])
+            values['fixed_location_y'] = str(self.picked_location[1])
+        return values
+
+    def poll_status(self):
+        """
+        Runs on the Tk thread every STATUS_POLL_MS. Applies work queued by the
+        listener threads and redraws the status from the engine's status channel.
+        An error in any of it is printed and polling carries on.
+        """
+        try:
+            while True:
+                try:
+                    func, args = self.ui_calls.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    func(*args)
+                except Exception:
+                    traceback.print_exc()
+
+            for state, detail, error in self.engine.status.drain():
+                self.show_engine_state(state, detail, error)
+            status = self.status_poller.poll()
+            if status.state == 'clicking' and status.clicks:
+                self.status_label.config(text=f"Status: Clicking... (~{status.cps:.2f} CPS, avg {status.average_cps:.2f})", foreground=self.colors['fg_accent'])
+            elif status.state == 'limited':
+                limit = f"~{status.detail:.0f}" if status.detail else "a lower"
+                self.status_label.config(text=f"Status: Clicking at ~{status.cps:.2f} CPS, mouse too slow (max {limit} CPS)", foreground=self.colors['fg_accent'])
+
+            self.polls_done += 1
+            if self.polls_done % STATS_REFRESH_POLLS == 0 and self.notebook.select() == str(self.stats_frame):
+                self.refresh_stats()
+            if self.polls_done % STATS_REFRESH_POLLS == 0 and self.notebook.select() == str(self.jobs_frame):
+                self.refresh_jobs()
+        except Exception:
+            traceback.print_exc()
+        finally:
+            self.master.after(STATUS_POLL_MS, self.poll_status)
+
+    def refresh_stats(self):
+        """Redraws the Stats tab from the engine's latency histograms."""
+        metrics = self.engine.metrics
+        for key, histogram in (('interval', metrics.interval), ('lateness', metrics.lateness), ('backend', metrics.backend)):
+            if histogram.count:
+                p50, p99 = histogram.percentiles((0.5, 0.99))
+                text = f"p50 {p50 * 1000:.3f} ms   p99 {p99 * 1000:.3f} ms   max {histogram.max * 1000:.3f} ms"
+            else:
+                text = "No clicks yet"
+            self.stats_labels[key].config(text=text)
+        burst = metrics.burst
+        if burst.count:
+            # Time per click within bursts, as the click rate it allows
+            p50, = burst.percentiles((0.5,))
+            text = f"~{1 / p50:.0f} CPS at p50, ~{1 / burst.min:.0f} CPS at best" if p50 > 0 and burst.min else "Too fast to time"
+        else:
+            text = "No bursts yet"
+        self.stats_labels['burst'].config(text=text)
+        self.stats_totals_label.config(text=f"Clicks: {metrics.backend.count}   Missed: {self.engine.missed_ticks()}")
+
+    def reset_stats(self):
+        """Clears the latency histograms."""
+        self.engine.metrics.reset()
+        self.refresh_stats()
+
+    def selected_job(self):
+        """The job selected in the Jobs tab, or None."""
+        selection = self.jobs_listbox.curselection()
+        return self.job_scheduler.jobs[selection[0]] if selection else None
+
+    def refresh_jobs(self):
+        """Redraws the job list with each job's state and click rate."""
+        selection = self.jobs_listbox.curselection()
+        self.jobs_listbox.delete(0, tk.END)
+        for job in self.job_scheduler.jobs:
+            state, _, error = job.status.current()
+            line = f"{job.name[:16]:<16} {'error' if error else state:<9} {job.clicks_done:>8} clicks {job.achieved_cps():>8.2f} CPS"
+            self.jobs_listbox.insert(tk.END, line)
+        if selection and selection[0] < len(self.job_scheduler.jobs):
+            self.jobs_listbox.selection_set(selection[0])
+
+    def add_job(self):
+        """Saves the current settings as a new job."""
+        values = self.collect_settings()
+        try:
+            settings = ClickSettings.from_config(values)
+            check_settings(settings)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid input: {e}")
+            return
+        names = [job.name for job in self.job_scheduler.jobs]
+        name = simpledialog.askstring("Add Job", "Job name:", initialvalue=f"Job {len(names) + 1}", parent=self.master)
+        if not name or not name.strip():
+            return
+        name = name.strip()
+        if name in names:
+            messagebox.showerror("Error", f"There is already a job named {name}.")
+            return
+        self.job_values[self.job_scheduler.add_job(settings, name)] = values
+        self.save_jobs()
+        self.refresh_jobs()
+
+    def remove_job(self):
+        """Stops and deletes the selected job."""
+        job = self.selected_job()
+        if job is not None:
+            self.job_scheduler.remove_job(job)
+            del self.job_values[job]
+            self.save_jobs()
+            self.rebuild_hotkeys()
+            self.refresh_jobs()
+
+    def control_job(self, action):
+        """Calls start, toggle_pause or stop on the selected job."""
+        job = self.selected_job()
+        if job is not None:
+            getattr(job, action)()
+            self.refresh_jobs()
+
+    def start_all_jobs(self):
+        self.job_scheduler.start_all()
+        self.refresh_jobs()
+
+    def switch_profile(self, name, keep_current=True):
+        """
+        Shows another profile in the Settings tab and makes it the selected
+        one. The profile's settings are validated right away, so the next
+        start uses the cached result. A run in progress keeps its settings.
+        """
+        if keep_current:
+            self.store.update(self.profile, self.collect_settings())
+        self.profile = name
+        self.store.set_active(name)
+        self.load_profile_values(self.store.values(name))
+        self.show_profile_values()
+        self.profile_dropdown.config(values=self.store.names())
+        self.profile_var.set(name)
+        try:
+            self.store.settings(name)
+        except ValueError:
+            # Reported when starting, like any other invalid setting
+            pass
+        if not self.engine.clicking:
+            self.status_label.config(text=f"Status: Profile {name} (Hotkey: {self.hotkey_text('start_stop')})", foreground=self.colors['fg_accent'])
+
+    def next_profile(self):
+        """Switches to the profile after the selected one, wrapping around."""
+        names = self.store.names()
+        index = names.index(self.profile) if self.profile in names else -1
+        self.switch_profile(names[(index + 1) % len(names)])
+
+    def new_profile(self):
+        """Creates a profile from the current settings and switches to it."""
+        name = simpledialog.askstring("New Profile", "Profile name:", parent=self.master)
+        if name is None:
+            return
+        try:
+            self.store.add_profile(name, self.collect_settings())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.switch_profile(name.strip())
+
+    def delete_profile(self):
+        """Deletes the selected profile and goes back to the Default profile."""
+        if self.profile == DEFAULT_PROFILE:
+            messagebox.showerror("Error", "The Default profile can't be deleted.")
+            return
+        if not messagebox.askyesno("Delete Profile", f"Delete the profile {self.profile}?"):
+            return
+        self.store.delete_profile(self.profile)
+        self.rebuild_hotkeys()
+        self.switch_profile(DEFAULT_PROFILE, keep_current=False)
+
+    def start_metrics_exporters(self):
+        """Starts the Prometheus exporters configured by metrics_port and metrics_file."""
+        if not self.metrics_port and not self.metrics_file:
+            return
+        from .metrics import MetricsServer, start_exporters
+        try:
+            self.metrics_exporters = start_exporters(self.engine, self.metrics_port, self.metrics_file)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not start metrics export: {e}")
+            return
+        endpoints = [exporter.url for exporter in self.metrics_exporters if isinstance(exporter, MetricsServer)]
+        if self.metrics_file:
+            endpoints.append(self.metrics_file)
+        if endpoints:
+            self.metrics_endpoints = "Metrics: " + ", ".join(endpoints)
+
+    def start_control_server(self):
+        """Listens for commands on the control_socket path, if one is configured."""
+        if not self.control_socket:
+            return
+        from .control import ControlServer, ControlTarget
+        # Runs started over the socket use the saved settings of the selected profile
+        target = ControlTarget(self.engine, lambda: self.store.settings(self.profile),
+                               on_change=lambda name, value: self.call_in_ui(self.apply_control_change, name, value))
+        try:
+            self.control_server = ControlServer(self.control_socket, target).start()
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not open the control socket: {e}")
+            return
+        self.metrics_endpoints = "\n".join(filter(None, [self.metrics_endpoints, f"Control: {self.control_socket}"]))
+
+    def apply_control_change(self, name, value):
+        """Shows and saves an interval or location set over the control socket."""
+        if name == 'interval':
+            self.interval_entry.delete(0, tk.END)
+            self.interval_entry.insert(0, f"{value:g}")
+            self.interval_unit_var.set('seconds')
+        elif name == 'fixed_position':
+            self.picked_location = value
+            self.location_var.set('fixed' if value else 'current')
+            self.location_display_label.config(text=f" ({value[0]}, {value[1]})" if value else " (Not set)")
+        self.save_settings()
+
+    def show_engine_state(self, state, detail, error):
+        """Updates the GUI for a state change published by the engine."""
+        if state in ('starting', 'clicking'):
+            # Also covers runs started over the control socket
+            self.start_button.config(state=tk.DISABLED)
+            self.stop_button.config(state=tk.NORMAL)
+        if state == 'starting':
+            self.status_label.config(text=f"Status: Starting in {detail}s...", foreground=self.colors['fg_accent'])
+        elif state == 'clicking':
+            self.status_label.config(text=f"Status: Clicking... (Hotkey: {self.hotkey_text('start_stop')})", foreground=self.colors['fg_accent'])
+        elif state == 'paused':
+            self.status_label.config(text=f"Status: Paused (Hotkey: {self.hotkey_text('pause_resume')}, took {detail * 1000:.2f} ms)", foreground=self.colors['fg_accent'])
+        elif state == 'stopped':
+            self.update_gui_after_stop()
+            if error:
+                messagebox.showerror("Error", f"Clicking stopped: {error}")
+
+    def update_gui_after_stop(self):
+        """Updates the GUI state after the clicking thread has stopped."""
+        self.status_label.config(text=f"Status: Stopped. (Hotkey: {self.hotkey_text('start_stop')})", foreground=self.colors['fg_accent'])
+        self.start_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
+
+    def start_clicking_wrapper(self):
+        """Starts the auto-clicking process in a new thread after validation."""
+        self.save_settings()
+        try:
+            # Validated once per change of the profile; unchanged settings come from the store's cache
+            settings = self.store.settings(self.profile)
+            if self.engine.start(settings):
+                self.start_button.config(state=tk.DISABLED)
+                self.stop_button.config(state=tk.NORMAL)
+                self.status_label.config(text=f"Status: Starting... (Hotkey: {self.hotkey_text('start_stop')})", foreground=self.colors['fg_accent'])
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid input: {e}")
+            self.status_label.config(text=f"Status: Ready (Hotkey: {self.hotkey_text('start_stop')})", foreground=self.colors['fg_accent'])
+
+    def stop_clicking(self):
+        """Stops the auto-clicking process."""
+        if self.engine.clicking:
+            # Don't block the Tk thread; the engine thread exits as soon as it sees the request
+            self.engine.stop(wait=False)
+            self.update_gui_after_stop()
+
+    def on_close(self):
+        """Handles cleanup when the main window is closed."""
+        self.save_settings()
+        self.store.close()
+        if self.store.last_error is not None:
+            messagebox.showerror("Error", f"Could not save settings to {self.store.path}: {self.store.last_error}")
+        if self.arming_thread is not None:
+            self.arming_thread.join()
+        self.hotkey_dispatcher.stop()
+        self.engine.close()
+        self.job_scheduler.shutdown()
+        for exporter in self.metrics_exporters:
+            exporter.stop()
+        if self.control_server is not None:
+            self.control_server.stop()
+        self.master.destroy()
+
+def main(started_at=None, show_timings=False):
+    """
+    Builds the main window and runs the Tk event loop. started_at is when
+    the caller began importing the GUI; with show_timings the startup
+    milestones are printed to stderr once the hotkeys are armed.
+    """
+    root = tk.Tk()
+    app = AutoClickerApp(root, started_at)
+    if show_timings:
+        app.on_startup_done = lambda app: print(app.startup_report(), file=sys.stderr, flush=True)
+    # Ensure cleanup on window close
+    root.protocol("WM_DELETE_WINDOW", app.on_close)
+    root.mainloop()
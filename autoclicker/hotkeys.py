@@ -0,0 +1,267 @@
+"""
+Hotkey dispatch with modifier chords and shared input listeners.
+
+A hotkey is written as modifiers and a key joined by '+', such as 'f6',
+'ctrl+shift+f6' or 'alt+a'. parse_hotkey() turns any spelling of one into a
+canonical chord string (lower case, modifiers in a fixed order), and key
+presses are turned into the same string, so finding the action of a key
+press is a single dict lookup however many hotkeys are bound.
+
+HotkeyDispatcher owns one keyboard listener for the life of the app, and one
+mouse listener started the first time a click is captured. Recording a new
+hotkey or picking a screen position just switches the dispatcher into a
+capture state: the next key press or click goes to a callback instead of
+the bindings, and no listener thread is started for it. Hotkeys keep
+working while a click is captured, and Escape or a timeout cancels it.
+"""
+import threading
+import time
+
+from .backends import key_to_name
+
+# Modifier key names reported by pynput, and the modifier each one counts as
+MODIFIERS = {
+    'ctrl': 'ctrl', 'ctrl_l': 'ctrl', 'ctrl_r': 'ctrl',
+    'alt': 'alt', 'alt_l': 'alt', 'alt_r': 'alt', 'alt_gr': 'alt',
+    'shift': 'shift', 'shift_l': 'shift', 'shift_r': 'shift',
+    'cmd': 'cmd', 'cmd_l': 'cmd', 'cmd_r': 'cmd',
+}
+# The order modifiers appear in a canonical chord
+MODIFIER_ORDER = ('ctrl', 'alt', 'shift', 'cmd')
+# The key that cancels a pending click capture
+CANCEL_KEY = 'esc'
+
+def normalize_key(key):
+    """The name a pynput key takes in a chord, or None for keys that can't be named."""
+    name = key_to_name(key)
+    if not name:
+        return None
+    if len(name) == 1 and ord(name) < 32:
+        # Ctrl+letter arrives as a control character on some platforms
+        name = chr(ord(name) + 96)
+    return name.lower()
+
+def split_chord(text):
+    """Splits a chord such as 'ctrl+shift+t' or 'ctrl++' at its '+' signs, keeping a final '+' key."""
+    if text == '+' or text.endswith('++'):
+        # The plus key itself, as in 'ctrl++'
+        parts = text[:-2].split('+') if len(text) > 2 else []
+        parts.append('+')
+    else:
+        parts = text.split('+')
+    return [part.strip() for part in parts]
+
+def parse_hotkey(text):
+    """
+    Converts a hotkey such as 'Ctrl+Shift+F6' to its canonical chord string.
+    Raises ValueError if it has no key besides modifiers or an unknown modifier.
+    """
+    text = text.strip().lower()
+    if not text:
+        raise ValueError("Hotkey cannot be empty.")
+    parts = split_chord(text)
+    key = parts.pop()
+    modifiers = set()
+    for part in parts:
+        if part not in MODIFIERS:
+            raise ValueError(f"Unknown modifier in hotkey {text}: {part}")
+        modifiers.add(MODIFIERS[part])
+    if key in MODIFIERS:
+        raise ValueError(f"Hotkey {text} needs a key besides modifiers.")
+    if not key:
+        raise ValueError(f"Hotkey {text} has no key.")
+    return ''.join(modifier + '+' for modifier in MODIFIER_ORDER if modifier in modifiers) + key
+
+def format_hotkey(chord):
+    """A canonical chord as it is shown to the user, such as 'Ctrl+Shift+F6'."""
+    if not chord:
+        return "None"
+    if chord.endswith('++'):
+        parts = chord[:-2].split('+') + ['+']
+    else:
+        parts = chord.split('+')
+    return '+'.join(part.upper() if len(part) == 1 else part.replace('_', ' ').title() for part in parts)
+
+class HotkeyDispatcher:
+    """
+    Maps chords to actions and runs them from one shared keyboard listener.
+
+    Actions are called on the listener thread with the time.perf_counter()
+    timestamp of the key press, so they must be quick and hand anything that
+    touches the GUI to its own thread. Replace all bindings at once with
+    set_bindings(); the lookup table is swapped in a single assignment, so a
+    key press never sees it half-built.
+    """
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.bindings = {}
+        self._held = set()
+        self._prefix = ''
+        self._key_capture = None
+        self._click_capture = None
+        self._click_cancelled = None
+        self._capture_timer = None
+        self._keyboard = None
+        self._mouse = None
+        self._lock = threading.Lock()
+
+    # --- Bindings ---
+    def bind(self, hotkey, action):
+        """Binds a hotkey to an action, replacing what it was bound to. Returns the canonical chord."""
+        chord = parse_hotkey(hotkey)
+        bindings = dict(self.bindings)
+        bindings[chord] = action
+        self.bindings = bindings
+        return chord
+
+    def unbind(self, hotkey):
+        bindings = dict(self.bindings)
+        bindings.pop(parse_hotkey(hotkey), None)
+        self.bindings = bindings
+
+    def set_bindings(self, pairs):
+        """
+        Replaces every binding with the given (hotkey, action) pairs; a later
+        pair wins over an earlier one with the same chord. Hotkeys that don't
+        parse are left out and returned as (hotkey, error message) pairs.
+        """
+        bindings = {}
+        errors = []
+        for hotkey, action in pairs:
+            try:
+                bindings[parse_hotkey(hotkey)] = action
+            except ValueError as e:
+                errors.append((hotkey, str(e)))
+        self.bindings = bindings
+        return errors
+
+    # --- Capturing ---
+    def capture_key(self, callback):
+        """
+        Sends the next key press, as a chord string, to callback instead of the
+        bindings. Returns False if a capture is already pending.
+        """
+        with self._lock:
+            if self._key_capture is not None or self._click_capture is not None:
+                return False
+            self._key_capture = callback
+        return True
+
+    def capture_click(self, callback, timeout=None, cancelled=None):
+        """
+        Sends the position of the next mouse click to callback(x, y), starting
+        the mouse listener if needed. Hotkeys keep working meanwhile. Escape,
+        cancel_capture() or timeout seconds without a click end the capture
+        instead and call cancelled(). Returns False if a capture is already
+        pending.
+        """
+        from pynput import mouse
+        with self._lock:
+            if self._key_capture is not None or self._click_capture is not None:
+                return False
+            if self._mouse is None:
+                self._mouse = mouse.Listener(on_click=self.click)
+                self._mouse.start()
+            self._click_capture = callback
+            self._click_cancelled = cancelled
+            timer = None
+            if timeout is not None:
+                timer = threading.Timer(timeout, self._expire, (callback,))
+                timer.daemon = True
+                self._capture_timer = timer
+        if timer is not None:
+            timer.start()
+        return True
+
+    def cancel_capture(self):
+        """Ends a pending capture without a result, calling the cancelled callback of a click capture."""
+        with self._lock:
+            cancelled = self._click_cancelled if self._click_capture is not None else None
+            self._key_capture = None
+            self._end_click_capture()
+        if cancelled is not None:
+            cancelled()
+
+    def _end_click_capture(self):
+        """Clears the click capture and its timer; the caller holds the lock."""
+        self._click_capture = None
+        self._click_cancelled = None
+        if self._capture_timer is not None:
+            self._capture_timer.cancel()
+            self._capture_timer = None
+
+    def _expire(self, callback):
+        """Cancels the click capture the timer was started for, if it is still pending."""
+        if self._click_capture is callback:
+            self.cancel_capture()
+
+    @property
+    def capturing(self):
+        return self._key_capture is not None or self._click_capture is not None
+
+    # --- Events ---
+    def press(self, key):
+        """Handles a key press reported by the keyboard listener."""
+        pressed_at = self.clock()
+        name = normalize_key(key)
+        if name is None:
+            return
+        if name in MODIFIERS:
+            self._held.add(name)
+            self._update_prefix()
+            return
+        chord = self._prefix + name
+        if self._key_capture is not None:
+            with self._lock:
+                callback, self._key_capture = self._key_capture, None
+            if callback is not None:
+                callback(chord)
+                return
+        if chord == CANCEL_KEY and self._click_capture is not None:
+            self.cancel_capture()
+            return
+        action = self.bindings.get(chord)
+        if action is not None:
+            action(pressed_at)
+
+    def release(self, key):
+        """Handles a key release reported by the keyboard listener."""
+        name = normalize_key(key)
+        if name in self._held:
+            self._held.discard(name)
+            self._update_prefix()
+
+    def click(self, x, y, button, pressed):
+        """Handles a mouse button event reported by the mouse listener."""
+        if not pressed or self._click_capture is None:
+            return
+        with self._lock:
+            callback = self._click_capture
+            self._end_click_capture()
+        if callback is not None:
+            callback(x, y)
+
+    def _update_prefix(self):
+        held = {MODIFIERS[name] for name in self._held}
+        self._prefix = ''.join(modifier + '+' for modifier in MODIFIER_ORDER if modifier in held)
+
+    # --- Listeners ---
+    def start(self):
+        """Starts the shared keyboard listener."""
+        from pynput import keyboard
+        with self._lock:
+            if self._keyboard is None:
+                self._keyboard = keyboard.Listener(on_press=self.press, on_release=self.release)
+                self._keyboard.start()
+        return self
+
+    def stop(self):
+        """Stops both listeners."""
+        with self._lock:
+            self._key_capture = None
+            self._end_click_capture()
+            listeners = [listener for listener in (self._keyboard, self._mouse) if listener is not None]
+            self._keyboard = None
+            self._mouse = None
+        for listener in listeners:
+            listener.stop()
@@ -0,0 +1,140 @@
+"""
+Random click intervals.
+
+IntervalGenerator draws random intervals in large blocks, using NumPy when it
+is installed and the random module otherwise, and hands them out one at a
+time. Each click then costs one list lookup no matter which distribution is
+selected or how fast the engine clicks.
+
+Every distribution is truncated to the configured [min, max] range, so the
+Min/Max Delay settings keep their meaning:
+
+* uniform: every value in the range is equally likely.
+* normal: centred on the middle of the range, with the range spanning six
+  standard deviations.
+* exponential: intervals of a Poisson process, shifted to start at min, with
+  the mean halfway through the range.
+* lognormal: centred on the geometric mean of min and max, with the range
+  spanning six standard deviations in log space; skewed towards min like
+  human reaction times.
+
+The same seed gives the same intervals on the same installation. NumPy and
+the pure-Python fallback draw different streams from the same seed.
+"""
+import math
+import random
+
+DISTRIBUTIONS = ('uniform', 'normal', 'exponential', 'lognormal')
+
+# Intervals generated per block; big enough that refills are rare, small enough to start instantly
+BLOCK_SIZE = 4096
+
+def _load_numpy():
+    """Imports NumPy if it is available; it is an optional dependency."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def new_seed():
+    """Picks a fresh seed for runs that don't configure one."""
+    return random.SystemRandom().randrange(2 ** 32)
+
+class IntervalGenerator:
+    """
+    Endless source of random intervals between low and high seconds.
+
+    Call next() (or use it as an iterator) to get the next interval. Pass
+    use_numpy=False to force the pure-Python implementation.
+    """
+    def __init__(self, low, high, distribution='uniform', seed=None, block_size=BLOCK_SIZE, use_numpy=True):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown random distribution: {distribution}")
+        if low <= 0 or high <= 0 or low > high:
+            raise ValueError("Invalid random interval range.")
+        self.low = low
+        self.high = high
+        self.distribution = distribution
+        self.seed = new_seed() if seed is None else seed
+        self.block_size = block_size
+
+        # Distribution parameters derived from the range
+        self._mean = (low + high) / 2
+        self._sigma = (high - low) / 6
+        self._log_mu = (math.log(low) + math.log(high)) / 2
+        self._log_sigma = (math.log(high) - math.log(low)) / 6
+
+        self._numpy = _load_numpy() if use_numpy else None
+        if self._numpy is not None:
+            self._rng = self._numpy.random.default_rng(self.seed)
+            self._generate = self._numpy_block
+        else:
+            self._rng = random.Random(self.seed)
+            self._generate = self._python_block
+        self._block = []
+        self._index = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.next()
+
+    def next(self):
+        """Returns the next interval in seconds."""
+        index = self._index
+        if index >= len(self._block):
+            self._block = self.generate(self.block_size)
+            index = 0
+        self._index = index + 1
+        return self._block[index]
+
+    def generate(self, count):
+        """Draws count new intervals as a list of floats."""
+        if self.low == self.high:
+            return [self.low] * count
+        return self._generate(count)
+
+    def _numpy_block(self, count):
+        np = self._numpy
+        rng = self._rng
+        low, high = self.low, self.high
+        parts = []
+        needed = count
+        while needed > 0:
+            if self.distribution == 'uniform':
+                samples = rng.uniform(low, high, needed)
+            elif self.distribution == 'normal':
+                samples = rng.normal(self._mean, self._sigma, needed)
+            elif self.distribution == 'exponential':
+                samples = low + rng.exponential(self._mean - low, needed)
+            else:
+                samples = rng.lognormal(self._log_mu, self._log_sigma, needed)
+            # Truncate by rejection so the distribution keeps its shape inside the range
+            samples = samples[(samples >= low) & (samples <= high)]
+            parts.append(samples)
+            needed -= len(samples)
+        return np.concatenate(parts).tolist()
+
+    def _python_block(self, count):
+        rng = self._rng
+        low, high = self.low, self.high
+        if self.distribution == 'uniform':
+            return [rng.uniform(low, high) for _ in range(count)]
+        if self.distribution == 'normal':
+            mean, sigma = self._mean, self._sigma
+            draw = lambda: rng.gauss(mean, sigma)
+        elif self.distribution == 'exponential':
+            rate = 1.0 / (self._mean - low)
+            draw = lambda: low + rng.expovariate(rate)
+        else:
+            mu, sigma = self._log_mu, self._log_sigma
+            draw = lambda: rng.lognormvariate(mu, sigma)
+        block = []
+        append = block.append
+        while len(block) < count:
+            value = draw()
+            if low <= value <= high:
+                append(value)
+        return block
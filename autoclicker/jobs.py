@@ -0,0 +1,504 @@
+"""
+Several independent click jobs served by one timer thread.
+
+Each ClickJob has its own settings, state, status channel and metrics, and
+offers the same read-only interface as a ClickEngine (clicks_done, metrics,
+status, achieved_cps() and so on), so a telemetry.StatusPoller or the
+Prometheus exporter can watch a single job.
+
+The jobs of a JobScheduler don't get a thread each. One thread keeps the next
+deadline of every running job in a heap, sleeps until the earliest one, clicks
+for that job and pushes its following deadline back. Waking up costs the same
+however many jobs there are, and only a heap push and pop (O(log n)) is added
+per click. Deadlines are tracked per job by a DeadlineScheduler, so each job
+keeps its own catch-up policy and missed tick count.
+
+Hold and drag clicks don't block the thread either: pressing the button
+queues the rest of the gesture (the moves of a drag and the release) as
+steps with their own deadlines, which go through the heap like clicks.
+
+Start, stop and pause flip a job's flags in the calling thread and queue a
+note for the timer thread, which wakes up and reconciles the heap with the
+flags before it sleeps again. A paused or stopped job is not searched for in
+the heap; its entry is just marked stale and dropped when it reaches the top.
+"""
+import copy
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+from .backends import KeyboardBackend, PynputBackend, PynputKeyboardBackend, resolve_buttons
+from .intervals import IntervalGenerator
+from .metrics import ClickMetrics
+from .motion import Motion
+from .scheduler import DeadlineScheduler, PRECISE_SPIN_THRESHOLD, RateController
+from .telemetry import StatusChannel
+
+def check_settings(settings):
+    """Raises ValueError for ClickSettings a job can't run: click jobs have no scripts, triggers or motion."""
+    if settings is None:
+        return
+    if settings.script is not None:
+        raise ValueError("Click jobs can't run a click script.")
+    if settings.trigger is not None:
+        raise ValueError("Click jobs can't wait for a screen trigger.")
+    if settings.motion != 'off':
+        raise ValueError("Click jobs can't move the cursor along a path; set motion to off.")
+
+class ClickJob:
+    """
+    One clicking job run by a JobScheduler. Create it with JobScheduler.add_job().
+
+    Control methods may be called from any thread; they return immediately and
+    the timer thread acts on them within microseconds.
+    """
+    def __init__(self, scheduler, settings, name):
+        self.scheduler = scheduler
+        self.settings = settings
+        self.name = name
+        self.status = StatusChannel()
+        self.metrics = ClickMetrics()
+
+        self.clicking = False
+        self.paused = False
+        self.clicks_done = 0
+        self.start_time = None
+        self.stop_time = None
+        self.random_seed = None
+        self.rate_limited = False
+        self.control_latency = None
+        self.max_control_latency = 0.0
+        self.done = threading.Event()
+        self.done.set()
+        self._requested_at = None
+        self._starts = 0
+
+        # Only touched by the timer thread
+        self._run = 0
+        self._active = False
+        self._scheduled = False
+        self._generation = 0
+        self._deadlines = None
+        # Remaining (deadline, x, y) steps of a hold or drag in progress, x None
+        # for the release, and the deadline of the click after it
+        self._steps = None
+        self._after = None
+
+    def __repr__(self):
+        return f"ClickJob({self.name!r})"
+
+    # --- Control ---
+    def start(self, settings=None):
+        """Starts the job, optionally with new settings. Returns False if it is already running."""
+        if self.clicking:
+            return False
+        if settings is not None:
+            check_settings(settings)
+            self.settings = settings
+        self._request(None)
+        self._starts += 1
+        self.clicking = True
+        self.paused = False
+        self.done.clear()
+        self.scheduler._notify(self)
+        return True
+
+    def stop(self, requested_at=None):
+        """Stops the job."""
+        if not self.clicking:
+            return
+        self._request(requested_at)
+        self.clicking = False
+        self.paused = False
+        self.scheduler._notify(self)
+
+    def pause(self, requested_at=None):
+        """Pauses the job until resume() is called."""
+        if self.clicking and not self.paused:
+            self.toggle_pause(requested_at)
+
+    def resume(self, requested_at=None):
+        """Resumes the job after pause()."""
+        if self.paused:
+            self.toggle_pause(requested_at)
+
+    def toggle_pause(self, requested_at=None):
+        """Toggles the paused state and returns the new state."""
+        self._request(requested_at)
+        self.paused = not self.paused
+        self.scheduler._notify(self)
+        return self.paused
+
+    def configure(self, **changes):
+        """Changes the interval or fixed position of the job, taking effect from its next click."""
+        settings = copy.copy(self.settings)
+        settings.update(**changes)
+        # Swapped in whole, so the timer thread never sees a half-applied change
+        self.settings = settings
+
+    def wait(self, timeout=None):
+        """Blocks until the job has stopped; returns False on timeout."""
+        return self.done.wait(timeout)
+
+    def _request(self, requested_at):
+        self._requested_at = time.perf_counter() if requested_at is None else requested_at
+
+    def _acknowledge(self):
+        requested_at, self._requested_at = self._requested_at, None
+        if requested_at is not None:
+            self.control_latency = time.perf_counter() - requested_at
+            self.max_control_latency = max(self.max_control_latency, self.control_latency)
+
+    # --- Stats ---
+    def missed_ticks(self):
+        """Scheduled clicks dropped by the catch-up policy, over all runs."""
+        deadlines = self._deadlines
+        return self.metrics.missed + (deadlines.missed if deadlines is not None else 0)
+
+    def achieved_cps(self):
+        """Average clicks per second between starting and stopping (or now, while running)."""
+        if not self.start_time:
+            return 0.0
+        end_time = self.stop_time if self.stop_time is not None else time.perf_counter()
+        elapsed_time = end_time - self.start_time
+        return self.clicks_done / elapsed_time if elapsed_time > 0 else 0.0
+
+    # --- Timer thread side ---
+    def _begin(self, backend, now):
+        """Prepares a new run and returns its first deadline."""
+        settings = self.settings
+        self._run = self._starts
+        self._active = True
+        self.clicks_done = 0
+        self.stop_time = None
+        self._button = backend.resolve_button(settings.button)
+        self._count = 2 if settings.click_type == 'double' else 1
+        self._key_events = settings.keys.resolve(self.scheduler.keyboard) if settings.keys is not None else None
+        self._steps = None
+        self._drag_motion = None
+        if settings.click_type == 'drag':
+            # Jobs have no motion style, so drags take a plain minimum-jerk path
+            self._drag_motion = Motion('minimum_jerk', settings.hold_time, settings.motion_rate, 0.0,
+                                       settings.random_seed)
+        self._last_click = None
+        self._step = 0
+        route = settings.route
+        if route is not None:
+            self._route_buttons = resolve_buttons(backend, set(route.buttons))
+        self._next_random = None
+        if settings.random_enabled:
+            intervals = IntervalGenerator(settings.random_min, settings.random_max,
+                                          settings.random_distribution, settings.random_seed)
+            self.random_seed = intervals.seed
+            self._next_random = intervals.next
+        self._controller = RateController() if settings.adaptive_rate else None
+        self.rate_limited = False
+        self._deadlines = DeadlineScheduler(catch_up=settings.catch_up, clock=self.scheduler.clock)
+        self._deadlines.reset(now + settings.pre_start_delay)
+        self.start_time = self._deadlines.deadline
+        if settings.pre_start_delay > 0:
+            self.status.publish('starting', settings.pre_start_delay)
+        else:
+            self.status.publish('clicking')
+        return self._deadlines.deadline
+
+    def _click(self, backend, lateness, clock):
+        """
+        Performs one click, or the next step of a hold or drag in progress,
+        and returns the next deadline, or None when the repeat count is reached.
+        """
+        steps = self._steps
+        if steps:
+            _, x, y = steps.popleft()
+            if x is None:
+                backend.release(self._button)
+            else:
+                backend.move(x, y)
+            return steps[0][0] if steps else self._after
+        next_deadline = self._perform(backend, lateness, clock)
+        if self._steps:
+            self._after = next_deadline
+            return self._steps[0][0]
+        return next_deadline
+
+    def _press_gesture(self, backend, start):
+        """Presses the button of a hold or drag click and queues the steps that finish it."""
+        settings = self.settings
+        end = start + settings.hold_time
+        steps = deque()
+        if settings.click_type == 'drag':
+            x0, y0 = backend.position
+            motion = self._drag_motion
+            xs, ys = motion.paths.path(x0, y0, *settings.drag_to)
+            last = len(xs) - 1
+            steps.extend((end - (last - i) * motion.period, x, y) for i, (x, y) in enumerate(zip(xs, ys)))
+        steps.append((end, None, None))
+        backend.press(self._button)
+        self._steps = steps
+
+    def _release_held(self):
+        """Lets go of the button of a hold or drag that a pause or stop cut short."""
+        if self._steps:
+            self._steps = None
+            self.scheduler.backend.release(self._button)
+
+    def _perform(self, backend, lateness, clock):
+        """Performs one click and returns the next deadline, or None when the repeat count is reached."""
+        settings = self.settings
+        route = settings.route
+        if self.clicks_done == 0 and settings.pre_start_delay > 0:
+            self.status.publish('clicking')
+        click_start = clock()
+        if route is not None:
+            step = self._step
+            backend.move(route.xs[step], route.ys[step])
+            backend.click(self._route_buttons[route.buttons[step]], route.counts[step])
+            dwell = route.waits[step]
+            self._step = step + 1 if step + 1 < len(route) else 0
+        else:
+            dwell = 0.0
+            if settings.fixed_position:
+                backend.move(*settings.fixed_position)
+            key_events = self._key_events
+            click_type = settings.click_type
+            if key_events is not None:
+                for call, key in key_events:
+                    call(key)
+            elif click_type == 'burst':
+                button = self._button
+                burst_start = clock()
+                for _ in range(settings.burst_count):
+                    backend.press(button)
+                    backend.release(button)
+                self.metrics.burst.record((clock() - burst_start) / settings.burst_count)
+            elif click_type == 'hold' or click_type == 'drag':
+                self._press_gesture(backend, click_start)
+            else:
+                backend.click(self._button, self._count)
+        click_end = clock()
+
+        self.clicks_done += 1
+        metrics = self.metrics
+        metrics.lateness.record(lateness)
+        metrics.backend.record(click_end - click_start)
+        if self._last_click is not None:
+            metrics.interval.record(click_start - self._last_click)
+        self._last_click = click_start
+        if settings.repeat_count is not None and self.clicks_done >= settings.repeat_count:
+            return None
+
+        if dwell > 0:
+            next_interval = dwell
+        elif self._next_random is not None:
+            next_interval = self._next_random()
+        else:
+            next_interval = settings.interval
+        controller = self._controller
+        if controller is None:
+            self._deadlines.advance(next_interval)
+            return self._deadlines.deadline
+        self._deadlines.reset(click_start + controller.next_wait(click_start, next_interval, click_end - click_start))
+        if controller.limited != self.rate_limited:
+            self.rate_limited = controller.limited
+            if controller.limited:
+                self.status.publish('limited', 1.0 / controller.backend_cost if controller.backend_cost > 0 else None)
+            else:
+                self.status.publish('clicking')
+        return self._deadlines.deadline
+
+    def _finish(self, error=None):
+        """Ends the current run."""
+        try:
+            self._release_held()
+        except Exception as e:
+            error = error or str(e) or type(e).__name__
+        self._active = False
+        self._scheduled = False
+        self.rate_limited = False
+        self._generation += 1
+        if self.start_time is not None:
+            self.stop_time = time.perf_counter()
+        if self._deadlines is not None:
+            self.metrics.missed += self._deadlines.missed
+            self._deadlines = None
+        if self._run == self._starts:
+            self.clicking = False
+            self.paused = False
+        self._acknowledge()
+        self.status.publish('stopped', error=error)
+        if not self.clicking:
+            self.done.set()
+
+class JobScheduler:
+    """
+    Runs any number of ClickJobs on one timer thread, all clicking through
+    the same MouseBackend (a PynputBackend unless one is given). Jobs with
+    keys press them through keyboard, by default the backend itself if it
+    is also a KeyboardBackend, else a PynputKeyboardBackend.
+
+    The thread is started by the first job that starts and sleeps without
+    polling while no job is running. shutdown() stops every job and the thread.
+    """
+    def __init__(self, backend=None, clock=time.perf_counter, keyboard=None):
+        self._backend = backend
+        self._keyboard = keyboard
+        self.clock = clock
+        self.jobs = []
+        self._heap = []
+        self._sequence = itertools.count()
+        self._notes = deque()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._running = False
+        self.thread = None
+
+    @property
+    def backend(self):
+        """The mouse backend, created on first use."""
+        if self._backend is None:
+            self._backend = PynputBackend()
+        return self._backend
+
+    @property
+    def keyboard(self):
+        """The keyboard backend, created on first use."""
+        if self._keyboard is None:
+            backend = self.backend
+            self._keyboard = backend if isinstance(backend, KeyboardBackend) else PynputKeyboardBackend()
+        return self._keyboard
+
+    def add_job(self, settings, name=None):
+        """
+        Creates a stopped job for the given ClickSettings and returns it.
+        Raises ValueError for settings with a script or a trigger.
+        """
+        check_settings(settings)
+        job = ClickJob(self, settings, name or f"Job {len(self.jobs) + 1}")
+        self.jobs.append(job)
+        return job
+
+    def remove_job(self, job):
+        """Stops a job and forgets it."""
+        job.stop()
+        self.jobs.remove(job)
+
+    def start_all(self):
+        for job in self.jobs:
+            job.start()
+
+    def stop_all(self, wait=True):
+        """Stops every job, optionally waiting until they have all stopped."""
+        for job in self.jobs:
+            job.stop()
+        if wait and self.thread is not None and self.thread is not threading.current_thread():
+            for job in self.jobs:
+                job.wait()
+
+    def shutdown(self):
+        """Stops every job and the timer thread."""
+        self.stop_all()
+        with self._lock:
+            self._running = False
+            self._wake.set()
+            thread = self.thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _notify(self, job):
+        """Tells the timer thread that a job's flags changed, starting the thread if needed."""
+        self._notes.append(job)
+        with self._lock:
+            if self.thread is None or not self.thread.is_alive():
+                self._running = True
+                self.thread = threading.Thread(target=self._loop, daemon=True)
+                self.thread.start()
+        self._wake.set()
+
+    def _push(self, job, deadline):
+        job._scheduled = True
+        heapq.heappush(self._heap, (deadline, next(self._sequence), job._generation, job))
+
+    def _apply(self, job):
+        """Brings the heap in line with the flags of a job."""
+        now = self.clock()
+        if job._active and (not job.clicking or job._run != job._starts):
+            job._finish()
+        if not job.clicking and not job._active:
+            # Stopped again before its run began
+            job._acknowledge()
+            job.done.set()
+        elif job.clicking and not job._active:
+            try:
+                self._push(job, job._begin(self.backend, now))
+            except Exception as e:
+                job._finish(str(e) or type(e).__name__)
+                return
+            job._acknowledge()
+        elif job._active:
+            if job.paused and job._scheduled:
+                job._release_held()
+                job._scheduled = False
+                job._generation += 1
+                job._acknowledge()
+                job.status.publish('paused', job.control_latency)
+            elif not job.paused and not job._scheduled:
+                # Re-anchor so the pause isn't treated as a stall or counted as an interval
+                job._deadlines.reset(now)
+                job._last_click = None
+                if job._controller is not None:
+                    job._controller.reset()
+                    job.rate_limited = False
+                self._push(job, now)
+                job._acknowledge()
+                job.status.publish('clicking')
+
+    def _loop(self):
+        heap = self._heap
+        notes = self._notes
+        wake = self._wake
+        clock = self.clock
+        heappop = heapq.heappop
+        backend = None
+        while True:
+            # Clear before reading the notes so a note added after this still wakes the wait
+            wake.clear()
+            while notes:
+                self._apply(notes.popleft())
+            if not self._running:
+                break
+            # Drop entries of jobs that were paused, stopped or restarted since they were pushed
+            while heap and heap[0][2] != heap[0][3]._generation:
+                heappop(heap)
+            if not heap:
+                wake.wait()
+                continue
+
+            deadline, _, _, job = heap[0]
+            spin = PRECISE_SPIN_THRESHOLD if job.settings.precise_timing else 0.0
+            remaining = deadline - clock()
+            if remaining > spin:
+                wake.wait(remaining - spin)
+                continue
+            now = clock()
+            while now < deadline and not wake.is_set():
+                now = clock()
+            if now < deadline:
+                continue
+
+            heappop(heap)
+            if backend is None:
+                backend = self.backend
+            try:
+                next_deadline = job._click(backend, now - deadline, clock)
+            except Exception as e:
+                job._finish(str(e) or type(e).__name__)
+                continue
+            if next_deadline is None:
+                job._finish()
+            else:
+                self._push(job, next_deadline)
+        for job in self.jobs:
+            if job._active:
+                job._finish()
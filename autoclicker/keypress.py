@@ -0,0 +1,113 @@
+"""
+Repeated key presses.
+
+With the keys setting, every tick of the click schedule presses keys
+instead of clicking. The setting is a list of strokes separated by spaces,
+all pressed back to back on each tick:
+
+    space                 a single key, named as for hotkeys ('a', 'Enter',
+                          'f6', '<vk>' for a virtual key code); names longer
+                          than one character are not case sensitive
+    ctrl+shift+t          a chord: pressed in order, released in reverse;
+                          not case sensitive, and ctrl++ ends in the plus key
+    "gg wp"               text, typed one character after another; \\n and \\t
+                          type enter and tab, \\" and \\\\ a quote and a backslash
+
+parse_keys() checks every key name once and compiles the strokes into a
+KeySequence, a flat list of key presses and releases. KeySequence.resolve()
+turns that into (method, key) pairs of a KeyboardBackend with every key
+already resolved, so a tick is one loop of calls with no lookups left in it.
+"""
+import re
+from array import array
+
+from .hotkeys import split_chord
+from .macro import encode_key
+
+# A quoted text burst, with backslash escapes, or any other run of non-space characters
+TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"|(\S+)')
+ESCAPES = {'n': 'enter', 't': 'tab', '"': '"', '\\': '\\'}
+
+def key_name(name):
+    """
+    The canonical name of a key: lower case, like hotkeys, unless it is a
+    single character, which stays as typed. Raises ValueError for unknown keys.
+    """
+    canonical = name.lower() if len(name) > 1 else name
+    if encode_key(canonical) is None:
+        raise ValueError(f"Unknown key: {name}")
+    return canonical
+
+class KeySequence:
+    """
+    Compiled key strokes. Event i presses (downs[i] == 1) or releases key
+    names[indices[i]]; strokes is the number of keys and chords typed per tick.
+    """
+    def __init__(self, text=''):
+        self.text = text
+        self.names = []
+        self.indices = array('H')
+        self.downs = array('B')
+        self.strokes = 0
+
+    def __len__(self):
+        return len(self.indices)
+
+    def _event(self, name, down):
+        name = key_name(name)
+        if name not in self.names:
+            self.names.append(name)
+        self.indices.append(self.names.index(name))
+        self.downs.append(down)
+
+    def add_chord(self, names):
+        """Adds keys pressed together, released in reverse order."""
+        for name in names:
+            self._event(name, 1)
+        for name in reversed(names):
+            self._event(name, 0)
+        self.strokes += 1
+
+    def resolve(self, keyboard):
+        """Returns the events as (press_key or release_key, resolved key) pairs of keyboard."""
+        keys = [keyboard.resolve_key(name) for name in self.names]
+        press, release = keyboard.press_key, keyboard.release_key
+        return [(press if down else release, keys[index]) for index, down in zip(self.indices, self.downs)]
+
+def _text_keys(text):
+    """The key names that type text."""
+    names = []
+    escaped = False
+    for char in text:
+        if escaped:
+            if char not in ESCAPES:
+                raise ValueError(f"Unknown escape in key text: \\{char}")
+            names.append(ESCAPES[char])
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        else:
+            names.append(char)
+    return names
+
+def parse_keys(text):
+    """Compiles a keys setting into a KeySequence. Raises ValueError for unknown keys."""
+    sequence = KeySequence(text.strip())
+    for match in TOKEN.finditer(text):
+        quoted, word = match.groups()
+        if quoted is not None:
+            if not quoted:
+                raise ValueError("Key text cannot be empty.")
+            for name in _text_keys(quoted):
+                sequence.add_chord([name])
+        else:
+            names = split_chord(word)
+            if '' in names:
+                raise ValueError(f"Invalid key chord: {word}")
+            if len(names) > 1:
+                # As in hotkeys, Ctrl+C means the c key with ctrl held
+                names = [name.lower() for name in names]
+            sequence.add_chord(names)
+    if not sequence.strokes:
+        raise ValueError("Keys cannot be empty.")
+    return sequence
@@ -0,0 +1,388 @@
+"""
+Macro recording and streaming playback.
+
+A macro file is a short header followed by fixed-size little-endian records,
+one per input event:
+
+    double  t      seconds since the recording started
+    uint8   kind   MOVE, PRESS, RELEASE, SCROLL, KEY_PRESS or KEY_RELEASE
+    uint8   arg    mouse button index, or how the key is encoded (KEY_*)
+    int32   x      cursor x, scroll dx, or the key code
+    int32   y      cursor y or scroll dy
+
+At 18 bytes a record, an hour of mouse movement sampled at 1 kHz is about
+65 MB. The recorder packs records into a small reusable buffer and appends it
+to the file whenever it fills up. The player reads the file back a chunk at a
+time, so memory use stays the same however long the macro is, and schedules
+every event at the absolute time start + t / speed on a DeadlineScheduler,
+so a long playback does not drift from the recording.
+"""
+import os
+import struct
+import sys
+import threading
+import time
+
+from .backends import BUTTON_NAMES, button_to_name, key_to_name
+from .metrics import LatencyHistogram
+from .scheduler import PRECISE_SPIN_THRESHOLD, DeadlineScheduler
+
+MAGIC = b'ACMACRO\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sHH4x')
+RECORD = struct.Struct('<dBBii')
+
+# Event kinds
+MOVE = 0
+PRESS = 1
+RELEASE = 2
+SCROLL = 3
+KEY_PRESS = 4
+KEY_RELEASE = 5
+
+# How a key is stored in x: a character's code point, an index into
+# SPECIAL_KEYS, or a raw virtual key code
+KEY_CHAR = 0
+KEY_SPECIAL = 1
+KEY_VK = 2
+
+# Named keys in a fixed order, so the indices stored in files stay valid
+# whatever pynput version or platform plays them back. Only append to it.
+SPECIAL_KEYS = (
+    'alt', 'alt_l', 'alt_r', 'alt_gr', 'backspace', 'caps_lock', 'cmd', 'cmd_l', 'cmd_r',
+    'ctrl', 'ctrl_l', 'ctrl_r', 'delete', 'down', 'end', 'enter', 'esc', 'home', 'left',
+    'page_down', 'page_up', 'right', 'shift', 'shift_l', 'shift_r', 'space', 'tab', 'up',
+    'insert', 'menu', 'num_lock', 'pause', 'print_screen', 'scroll_lock',
+    'media_play_pause', 'media_volume_mute', 'media_volume_down', 'media_volume_up',
+    'media_previous', 'media_next',
+) + tuple(f'f{number}' for number in range(1, 21))
+SPECIAL_INDEX = {name: index for index, name in enumerate(SPECIAL_KEYS)}
+
+# Playback speeds accepted by MacroPlayer
+MIN_SPEED = 0.25
+MAX_SPEED = 10.0
+
+# A cursor move that is already this late is merged into the next event
+# instead of being replayed on its own, so the player catches up after a stall
+MOVE_SKIP_LATENESS = 0.002
+
+def encode_key(name):
+    """Returns the (arg, x) pair a key name is stored as, or None if it can't be stored."""
+    if name in SPECIAL_INDEX:
+        return KEY_SPECIAL, SPECIAL_INDEX[name]
+    if len(name) == 1:
+        return KEY_CHAR, ord(name)
+    if name.startswith('<') and name.endswith('>') and name[1:-1].isdigit():
+        return KEY_VK, int(name[1:-1])
+    return None
+
+def decode_key(arg, x):
+    """Returns the key name stored as (arg, x)."""
+    if arg == KEY_SPECIAL:
+        return SPECIAL_KEYS[x]
+    if arg == KEY_CHAR:
+        return chr(x)
+    return f"<{x}>"
+
+# Seconds of recording between writes of the buffer, so a crash loses little
+FLUSH_INTERVAL = 5.0
+
+class MacroWriter:
+    """
+    Appends records to a new macro file.
+
+    Records are packed into a preallocated buffer of buffer_records entries,
+    which is written out when full, once a record is flush_interval seconds
+    newer than the last write, and on flush() or close(). write() may be
+    called from several threads.
+    """
+    def __init__(self, path, buffer_records=1024, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self._buffer = bytearray(RECORD.size * buffer_records)
+        self._offset = 0
+        self._flushed = 0.0
+        self._lock = threading.Lock()
+
+    def write(self, t, kind, arg=0, x=0, y=0):
+        """Adds one record."""
+        with self._lock:
+            RECORD.pack_into(self._buffer, self._offset, t, kind, arg, x, y)
+            self._offset += RECORD.size
+            self.count += 1
+            if self._offset == len(self._buffer):
+                self._flush_buffer()
+            elif t - self._flushed >= self.flush_interval:
+                self._flush_buffer()
+                self._file.flush()
+                self._flushed = t
+
+    def _flush_buffer(self):
+        self._file.write(memoryview(self._buffer)[:self._offset])
+        self._offset = 0
+
+    def flush(self):
+        """Writes buffered records to the file."""
+        with self._lock:
+            self._flush_buffer()
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush_buffer()
+            self._file.close()
+
+def _open_macro(path):
+    """Opens a macro file and checks its header, leaving it positioned at the first record."""
+    macro_file = open(path, 'rb')
+    header = macro_file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        macro_file.close()
+        raise ValueError(f"Not a macro file: {path}")
+    magic, version, record_size = HEADER.unpack(header)
+    if magic != MAGIC or record_size != RECORD.size:
+        macro_file.close()
+        raise ValueError(f"Not a macro file: {path}")
+    if version > VERSION:
+        macro_file.close()
+        raise ValueError(f"Macro file {path} needs a newer version of the auto clicker.")
+    return macro_file
+
+def read_macro(path, chunk_records=4096):
+    """
+    Yields the (t, kind, arg, x, y) records of a macro file, reading
+    chunk_records of them at a time. A partly written last record, left
+    behind if the recorder was killed, is ignored.
+    """
+    with _open_macro(path) as macro_file:
+        chunk_size = RECORD.size * chunk_records
+        while True:
+            data = macro_file.read(chunk_size)
+            usable = len(data) - len(data) % RECORD.size
+            if not usable:
+                return
+            yield from RECORD.iter_unpack(memoryview(data)[:usable])
+
+def macro_info(path):
+    """Returns the number of events in a macro file and its duration in seconds, without reading it all."""
+    with _open_macro(path) as macro_file:
+        count = (os.fstat(macro_file.fileno()).st_size - HEADER.size) // RECORD.size
+        if not count:
+            return 0, 0.0
+        macro_file.seek(HEADER.size + (count - 1) * RECORD.size)
+        return count, RECORD.unpack(macro_file.read(RECORD.size))[0]
+
+# --- Recording ---
+class MacroRecorder:
+    """
+    Records the real mouse and keyboard into a macro file through pynput
+    listeners until the stop key is pressed or stop() is called.
+
+    The stop key itself is not recorded. With record_moves off, only clicks,
+    scrolls and keys are stored; clicks still carry their position.
+    """
+    def __init__(self, path, stop_key='esc', record_moves=True, clock=time.perf_counter):
+        self.path = path
+        self.stop_key = stop_key
+        self.record_moves = record_moves
+        self.clock = clock
+        self.writer = None
+        self.start_time = None
+        self.stopped = threading.Event()
+        self._listeners = []
+
+    def start(self):
+        """Creates the file and starts listening."""
+        from pynput import keyboard, mouse
+
+        self.writer = MacroWriter(self.path)
+        self.stopped.clear()
+        self.start_time = self.clock()
+        self._listeners = [
+            mouse.Listener(on_move=self._on_move if self.record_moves else None,
+                           on_click=self._on_click, on_scroll=self._on_scroll),
+            keyboard.Listener(on_press=self._on_press, on_release=self._on_release),
+        ]
+        for listener in self._listeners:
+            listener.start()
+        return self
+
+    # Positions arrive as floats on macOS, while records store whole pixels
+    def _on_move(self, x, y):
+        self.writer.write(self.clock() - self.start_time, MOVE, 0, int(x), int(y))
+
+    def _on_click(self, x, y, button, pressed):
+        name = button_to_name(button)
+        if name is not None:
+            self.writer.write(self.clock() - self.start_time, PRESS if pressed else RELEASE,
+                              BUTTON_NAMES.index(name), int(x), int(y))
+
+    def _on_scroll(self, x, y, dx, dy):
+        self.writer.write(self.clock() - self.start_time, SCROLL, 0, int(dx), int(dy))
+
+    def _on_key(self, key, kind):
+        name = key_to_name(key)
+        encoded = encode_key(name) if name else None
+        if encoded is not None:
+            self.writer.write(self.clock() - self.start_time, kind, encoded[0], encoded[1], 0)
+
+    def _on_press(self, key):
+        if key_to_name(key) == self.stop_key:
+            self.stopped.set()
+            return False
+        self._on_key(key, KEY_PRESS)
+
+    def _on_release(self, key):
+        self._on_key(key, KEY_RELEASE)
+
+    def wait(self, timeout=None):
+        """Blocks until the stop key is pressed; returns False on timeout."""
+        return self.stopped.wait(timeout)
+
+    def stop(self):
+        """Stops listening and closes the file. Returns the number of events recorded."""
+        for listener in self._listeners:
+            listener.stop()
+        self._listeners = []
+        self.stopped.set()
+        if self.writer is not None:
+            self.writer.close()
+            return self.writer.count
+        return 0
+
+# --- Playback ---
+class MacroPlayer:
+    """
+    Replays macro files through a mouse and a keyboard backend.
+
+    Buttons and keys still held when playback stops, or when the file ends
+    mid-press, are released so a stopped macro can't leave a modifier stuck.
+    """
+    def __init__(self, mouse=None, keyboard=None, speed=1.0, precise=False, clock=time.perf_counter):
+        if not MIN_SPEED <= speed <= MAX_SPEED:
+            raise ValueError(f"Playback speed must be between {MIN_SPEED:g}x and {MAX_SPEED:g}x.")
+        if mouse is None:
+            from .backends import PynputBackend
+            mouse = PynputBackend()
+        if keyboard is None:
+            from .backends import PynputKeyboardBackend
+            keyboard = PynputKeyboardBackend()
+        self.mouse = mouse
+        self.keyboard = keyboard
+        self.speed = speed
+        self.precise = precise
+        self.clock = clock
+        self.lateness = LatencyHistogram()
+        self.events_played = 0
+        self.moves_merged = 0
+        self.playing = False
+        self.thread = None
+        self._stopping = False
+        self._wake = threading.Event()
+
+    def start(self, path, repeat=1):
+        """Plays a macro in a background thread."""
+        self.thread = threading.Thread(target=self.play, args=(path, repeat), daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(self, wait=True):
+        """Stops playback, optionally waiting for the playing thread to finish."""
+        self._stopping = True
+        self._wake.set()
+        if wait and self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def play(self, path, repeat=1):
+        """
+        Plays a macro repeat times (0 repeats forever) and returns the number
+        of events played. Raises ValueError if the file isn't a macro.
+        """
+        # Fail on a bad file before touching the mouse
+        _open_macro(path).close()
+        mouse = self.mouse
+        keyboard = self.keyboard
+        # Resolved on first use, like keys, so a side button is only needed if the macro uses it
+        buttons = {}
+        keys = {}
+        held_buttons = set()
+        held_keys = set()
+        scale = 1.0 / self.speed
+        scheduler = DeadlineScheduler(spin_threshold=PRECISE_SPIN_THRESHOLD if self.precise else 0.0,
+                                      catch_up=DeadlineScheduler.BURST, max_burst=sys.maxsize,
+                                      clock=self.clock, wake=self._wake)
+        record_lateness = self.lateness.record
+        self._stopping = False
+        self._wake.clear()
+        self.playing = True
+        self.events_played = 0
+        self.moves_merged = 0
+        position = None
+        pending_move = None
+        passes = 0
+        try:
+            while not self._stopping and (repeat == 0 or passes < repeat):
+                passes += 1
+                start = self.clock()
+                for t, kind, arg, x, y in read_macro(path):
+                    # Every deadline is computed from the start, so rounding never accumulates
+                    scheduler.reset(start + t * scale)
+                    lateness = scheduler.wait()
+                    if lateness is None:
+                        break
+                    record_lateness(lateness)
+                    self.events_played += 1
+                    if kind == MOVE:
+                        if lateness > MOVE_SKIP_LATENESS:
+                            pending_move = (x, y)
+                            self.moves_merged += 1
+                        else:
+                            pending_move = None
+                            mouse.move(x, y)
+                            position = (x, y)
+                        continue
+                    if pending_move is not None:
+                        mouse.move(*pending_move)
+                        position = pending_move
+                        pending_move = None
+                    if kind == PRESS or kind == RELEASE:
+                        if position != (x, y):
+                            mouse.move(x, y)
+                            position = (x, y)
+                        button = buttons.get(arg)
+                        if button is None:
+                            button = buttons[arg] = mouse.resolve_button(BUTTON_NAMES[arg])
+                        if kind == PRESS:
+                            mouse.press(button)
+                            held_buttons.add(arg)
+                        else:
+                            mouse.release(button)
+                            held_buttons.discard(arg)
+                    elif kind == SCROLL:
+                        mouse.scroll(x, y)
+                    else:
+                        key = keys.get((arg, x))
+                        if key is None:
+                            key = keys[(arg, x)] = keyboard.resolve_key(decode_key(arg, x))
+                        if kind == KEY_PRESS:
+                            keyboard.press_key(key)
+                            held_keys.add(key)
+                        else:
+                            keyboard.release_key(key)
+                            held_keys.discard(key)
+                if pending_move is not None and not self._stopping:
+                    mouse.move(*pending_move)
+                    position = pending_move
+                    pending_move = None
+        finally:
+            for key in held_keys:
+                keyboard.release_key(key)
+            for button in held_buttons:
+                mouse.release(buttons[button])
+            self.playing = False
+        return self.events_played
@@ -0,0 +1,320 @@
+"""
+Click timing metrics and their Prometheus export.
+
+The engine records three distributions for every click into HDR-style
+histograms: the actual time between clicks, how late each click was against
+its scheduled deadline, and how long the backend call took. Burst clicks
+also record the time per press and release pair, the inverse of the
+highest click rate the backend sustains. A histogram has
+a fixed set of log-linear buckets (exact below 128 us, then 64 buckets per
+power of two, so values are kept to within about 1.6%) stored in one integer
+array. Recording never allocates, and memory stays the same however long
+the clicker runs.
+
+The metrics can be scraped in Prometheus text format from a small HTTP
+server that only listens on 127.0.0.1, or written periodically to a file for
+node_exporter's textfile collector.
+"""
+import os
+import threading
+from array import array
+
+# Values are recorded in whole microseconds
+UNITS_PER_SECOND = 1000000
+SUB_BITS = 7
+SUB_COUNT = 1 << SUB_BITS
+HALF_COUNT = SUB_COUNT >> 1
+# Highest power of two tracked; larger values land in the last bucket (about 19 hours)
+MAX_SHIFT = 29
+
+BUCKET_COUNT = SUB_COUNT + MAX_SHIFT * HALF_COUNT
+
+# Quantiles exported for each histogram
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+# A shared histogram stores count, total, min and max in front of its buckets
+SHARED_FIELDS = 4
+SHARED_HISTOGRAM_SIZE = 8 * (SHARED_FIELDS + BUCKET_COUNT)
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations in seconds.
+
+    Only the clicking thread records into it. Readers in other threads may see
+    a count that is one click ahead of the buckets, which doesn't matter for
+    monitoring.
+    """
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * BUCKET_COUNT))
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def record(self, seconds):
+        """Adds one duration to the histogram."""
+        if seconds < 0:
+            seconds = 0.0
+        value = int(seconds * UNITS_PER_SECOND)
+        if value < SUB_COUNT:
+            index = value
+        else:
+            shift = min(value.bit_length() - SUB_BITS, MAX_SHIFT)
+            index = SUB_COUNT + (shift - 1) * HALF_COUNT + min(value >> shift, SUB_COUNT - 1) - HALF_COUNT
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def reset(self):
+        """Forgets all recorded values."""
+        for index in range(len(self.counts)):
+            self.counts[index] = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    @staticmethod
+    def _bucket_value(index):
+        """Midpoint of a bucket, in seconds."""
+        if index < SUB_COUNT:
+            return index / UNITS_PER_SECOND
+        shift, sub = divmod(index - SUB_COUNT, HALF_COUNT)
+        shift += 1
+        low = (sub + HALF_COUNT) << shift
+        return (low + (1 << shift) / 2) / UNITS_PER_SECOND
+
+    def percentiles(self, fractions):
+        """Returns the values at the given fractions (0 to 1, ascending) in seconds."""
+        results = []
+        if not self.count:
+            return [0.0] * len(fractions)
+        targets = [max(1, int(fraction * self.count + 0.5)) for fraction in fractions]
+        seen = 0
+        position = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            seen += count
+            while position < len(targets) and seen >= targets[position]:
+                results.append(min(self._bucket_value(index), self.max))
+                position += 1
+            if position == len(targets):
+                break
+        while len(results) < len(fractions):
+            results.append(self.max)
+        return results
+
+    def mean(self):
+        """Average of all recorded values, in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+class SharedLatencyHistogram(LatencyHistogram):
+    """
+    A LatencyHistogram laid out in a caller-provided buffer of
+    SHARED_HISTOGRAM_SIZE bytes, such as part of a multiprocessing shared
+    memory block, so another process can read it in place without copying.
+
+    Call release() before the buffer is closed.
+    """
+    def __init__(self, buffer):
+        self._view = memoryview(buffer)[:SHARED_HISTOGRAM_SIZE]
+        self._ints = self._view.cast('Q')
+        self._floats = self._view.cast('d')
+        self.counts = self._ints[SHARED_FIELDS:]
+
+    @property
+    def count(self):
+        return self._ints[0]
+
+    @count.setter
+    def count(self, value):
+        self._ints[0] = value
+
+    @property
+    def total(self):
+        return self._floats[1]
+
+    @total.setter
+    def total(self, value):
+        self._floats[1] = value
+
+    @property
+    def min(self):
+        # NaN stands for "nothing recorded yet"
+        value = self._floats[2]
+        return None if value != value else value
+
+    @min.setter
+    def min(self, value):
+        self._floats[2] = float('nan') if value is None else value
+
+    @property
+    def max(self):
+        return self._floats[3]
+
+    @max.setter
+    def max(self, value):
+        self._floats[3] = value
+
+    def release(self):
+        """Lets go of the buffer."""
+        for view in (self.counts, self._ints, self._floats, self._view):
+            view.release()
+
+class ClickMetrics:
+    """The histograms an engine records into, kept across runs until reset."""
+    def __init__(self):
+        self.interval = LatencyHistogram()
+        self.lateness = LatencyHistogram()
+        self.backend = LatencyHistogram()
+        self.burst = LatencyHistogram()
+        self.missed = 0
+
+    def histograms(self):
+        """(metric name, help text, histogram) for every histogram."""
+        return [
+            ('click_interval_seconds', "Time between consecutive clicks.", self.interval),
+            ('click_lateness_seconds', "How late each click was against its scheduled deadline.", self.lateness),
+            ('backend_call_seconds', "Duration of the mouse backend calls for one click.", self.backend),
+            ('burst_click_seconds', "Time per press and release pair within burst clicks.", self.burst),
+        ]
+
+    def reset(self):
+        """Forgets everything recorded so far."""
+        for _, _, histogram in self.histograms():
+            histogram.reset()
+        self.missed = 0
+
+def render_prometheus(engine, prefix='autoclicker_'):
+    """Renders an engine's metrics in the Prometheus text exposition format."""
+    metrics = engine.metrics
+    lines = []
+
+    def metric(name, kind, help_text, value):
+        lines.append(f"# HELP {prefix}{name} {help_text}")
+        lines.append(f"# TYPE {prefix}{name} {kind}")
+        lines.append(f"{prefix}{name} {value}")
+
+    metric('clicks_total', 'counter', "Clicks performed since the metrics were reset.", metrics.backend.count)
+    metric('missed_ticks_total', 'counter', "Scheduled clicks dropped by the catch-up policy.", engine.missed_ticks())
+    metric('clicking', 'gauge', "1 while the engine is running.", int(engine.clicking))
+    metric('paused', 'gauge', "1 while the engine is paused.", int(engine.paused))
+    metric('rate_limited', 'gauge', "1 while adaptive mode can't reach the target rate because the backend is too slow.",
+           int(engine.rate_limited))
+    metric('achieved_cps', 'gauge', "Average clicks per second of the current or last run.", f"{engine.achieved_cps():.6f}")
+    for name, help_text, histogram in metrics.histograms():
+        lines.append(f"# HELP {prefix}{name} {help_text}")
+        lines.append(f"# TYPE {prefix}{name} summary")
+        for quantile, value in zip(QUANTILES, histogram.percentiles(QUANTILES)):
+            lines.append(f'{prefix}{name}{{quantile="{quantile}"}} {value:.9f}')
+        lines.append(f"{prefix}{name}_sum {histogram.total:.9f}")
+        lines.append(f"{prefix}{name}_count {histogram.count}")
+    return '\n'.join(lines) + '\n'
+
+def write_prometheus_file(engine, path):
+    """Writes the metrics to a file atomically, so a collector never reads half a file."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as metrics_file:
+        metrics_file.write(render_prometheus(engine))
+    os.replace(temp_path, path)
+
+class MetricsServer:
+    """
+    Serves GET /metrics in Prometheus format from a daemon thread.
+    Always binds to 127.0.0.1 so the metrics are never exposed to the network.
+    """
+    def __init__(self, engine, port):
+        # Imported here: http.server pulls in ssl and email, which would
+        # otherwise slow down every start of the app
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = render_prometheus(engine).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = HTTPServer(('127.0.0.1', port), Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}/metrics"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+class MetricsFileWriter:
+    """
+    Rewrites a metrics file every few seconds from a daemon thread, and once
+    more on stop. start() writes the file once and raises OSError if it
+    can't; later write errors are kept in error instead of being raised.
+    """
+    def __init__(self, engine, path, period=5.0):
+        self.engine = engine
+        self.path = path
+        self.period = period
+        self.error = None
+        self._stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _write(self):
+        try:
+            write_prometheus_file(self.engine, self.path)
+        except OSError as e:
+            self.error = str(e)
+        else:
+            self.error = None
+
+    def _run(self):
+        while not self._stopped.wait(self.period):
+            self._write()
+
+    def start(self):
+        write_prometheus_file(self.engine, self.path)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self.thread.is_alive():
+            self.thread.join()
+        self._write()
+
+def start_exporters(engine, port=None, path=None):
+    """
+    Starts the metrics exporters that are configured (port and path may be
+    empty) and returns them. If one can't start, the others are stopped again
+    and its OSError or ValueError is raised.
+    """
+    exporters = []
+    try:
+        if port:
+            exporters.append(MetricsServer(engine, int(port)).start())
+        if path:
+            exporters.append(MetricsFileWriter(engine, path).start())
+    except (OSError, ValueError):
+        for exporter in exporters:
+            exporter.stop()
+        raise
+    return exporters
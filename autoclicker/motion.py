@@ -0,0 +1,168 @@
+"""
+Humanized cursor motion between click targets.
+
+Without motion the engine jumps the cursor straight onto the target right
+before each click. With a motion style set, the cursor instead travels there
+along a curved, slightly shaky path during the last motion_time seconds
+before the click, one move every 1/motion_rate seconds:
+
+* bezier: a cubic Bezier curve with random control points, so every path
+  bows a little differently, traversed with a minimum-jerk speed profile
+  (slow start, fast middle, slow landing).
+* minimum_jerk: a nearly straight line with the same speed profile.
+
+Both add jitter of about motion_jitter pixels that fades out towards the
+end, so the last point is always exactly on target.
+
+Path shapes don't depend on where the cursor starts, so PathGenerator draws
+them ahead of time in blocks of many paths in a frame where every path goes
+from (0, 0) to (1, 0), using NumPy when it is installed. Turning a shape
+into the actual path is one rotate-and-scale per point, done at the start
+of the motion window, and the moves are timed backwards from the click
+deadline: a move that is already overdue is skipped, so slow cursor moves
+shorten the path instead of delaying the click.
+"""
+import math
+import random
+import time
+
+from .intervals import _load_numpy, new_seed
+
+MOTION_STYLES = ('off', 'bezier', 'minimum_jerk')
+
+# Paths generated per block
+BLOCK_SIZE = 64
+# Standard deviation of the Bezier control points off the straight line, and
+# of the bow of minimum-jerk paths, as a fraction of the distance travelled
+BEZIER_CURVE = 0.15
+LINE_BOW = 0.03
+
+def minimum_jerk(t):
+    """Fraction of the distance covered at time fraction t by a minimum-jerk movement."""
+    return t * t * t * (10 + t * (6 * t - 15))
+
+class PathGenerator:
+    """
+    Endless source of humanized paths of a fixed number of samples.
+
+    Call path() for the points of the next path. Pass use_numpy=False to
+    force the pure-Python implementation.
+    """
+    def __init__(self, style, samples, jitter=0.0, seed=None, block_size=BLOCK_SIZE, use_numpy=True):
+        if style not in MOTION_STYLES or style == 'off':
+            raise ValueError(f"Unknown motion style: {style}")
+        if samples < 2:
+            raise ValueError("A path needs at least two samples.")
+        if jitter < 0:
+            raise ValueError("Motion jitter cannot be negative.")
+        self.style = style
+        self.samples = samples
+        self.jitter = jitter
+        self.seed = new_seed() if seed is None else seed
+        self.block_size = block_size
+        # Time fraction and distance fraction of every sample, shared by all paths
+        self._times = [(i + 1) / samples for i in range(samples)]
+        self._profile = [minimum_jerk(t) for t in self._times]
+
+        self._numpy = _load_numpy() if use_numpy else None
+        if self._numpy is not None:
+            self._rng = self._numpy.random.default_rng(self.seed)
+            self._generate = self._numpy_block
+        else:
+            self._rng = random.Random(self.seed)
+            self._generate = self._python_block
+        self._block = []
+        self._index = 0
+
+    def next_shape(self):
+        """The next path shape as (us, vs, jitter xs, jitter ys) lists in the unit frame."""
+        index = self._index
+        if index >= len(self._block):
+            self._block = self._generate(self.block_size)
+            index = 0
+        self._index = index + 1
+        return self._block[index]
+
+    def path(self, x0, y0, x1, y1):
+        """The points of a path from (x0, y0) to (x1, y1), excluding the start and ending exactly on the target."""
+        us, vs, jxs, jys = self.next_shape()
+        dx = x1 - x0
+        dy = y1 - y0
+        xs = [round(x0 + u * dx - v * dy + jx) for u, v, jx in zip(us, vs, jxs)]
+        ys = [round(y0 + u * dy + v * dx + jy) for u, v, jy in zip(us, vs, jys)]
+        xs[-1] = x1
+        ys[-1] = y1
+        return xs, ys
+
+    def _numpy_block(self, count):
+        np = self._numpy
+        rng = self._rng
+        s = np.array(self._profile)
+        if self.style == 'bezier':
+            a = rng.uniform(0.2, 0.4, (count, 1))
+            c = rng.uniform(0.6, 0.8, (count, 1))
+            b = rng.normal(0.0, BEZIER_CURVE, (count, 1))
+            d = rng.normal(0.0, BEZIER_CURVE, (count, 1))
+            w1 = 3 * (1 - s) ** 2 * s
+            w2 = 3 * (1 - s) * s ** 2
+            us = w1 * a + w2 * c + s ** 3
+            vs = w1 * b + w2 * d
+        else:
+            us = np.broadcast_to(s, (count, self.samples))
+            vs = rng.normal(0.0, LINE_BOW, (count, 1)) * np.sin(np.pi * s)
+        # Jitter fades out so the path lands exactly on target
+        fade = 1.0 - np.array(self._times)
+        jxs = rng.normal(0.0, self.jitter, (count, self.samples)) * fade
+        jys = rng.normal(0.0, self.jitter, (count, self.samples)) * fade
+        return list(zip(us.tolist(), vs.tolist(), jxs.tolist(), jys.tolist()))
+
+    def _python_block(self, count):
+        rng = self._rng
+        profile = self._profile
+        fades = [1.0 - t for t in self._times]
+        jitter = self.jitter
+        block = []
+        for _ in range(count):
+            if self.style == 'bezier':
+                a, c = rng.uniform(0.2, 0.4), rng.uniform(0.6, 0.8)
+                b, d = rng.gauss(0.0, BEZIER_CURVE), rng.gauss(0.0, BEZIER_CURVE)
+                us, vs = [], []
+                for s in profile:
+                    w1 = 3 * (1 - s) ** 2 * s
+                    w2 = 3 * (1 - s) * s * s
+                    us.append(w1 * a + w2 * c + s ** 3)
+                    vs.append(w1 * b + w2 * d)
+            else:
+                bow = rng.gauss(0.0, LINE_BOW)
+                us = list(profile)
+                vs = [bow * math.sin(math.pi * s) for s in profile]
+            jxs = [rng.gauss(0.0, jitter) * fade for fade in fades] if jitter else [0.0] * len(fades)
+            jys = [rng.gauss(0.0, jitter) * fade for fade in fades] if jitter else [0.0] * len(fades)
+            block.append((us, vs, jxs, jys))
+        return block
+
+class Motion:
+    """The motion settings of a run plus the path generator that serves them."""
+    def __init__(self, style, duration, rate, jitter=0.0, seed=None):
+        self.duration = duration
+        self.period = 1.0 / rate
+        self.paths = PathGenerator(style, max(2, int(round(duration * rate))), jitter, seed)
+
+def stream_path(backend, xs, ys, deadline, period, wake=None, clock=time.perf_counter):
+    """
+    Moves the cursor along a path whose last point is due at deadline and
+    the others one period apart before it. The last point itself is left to
+    the click. A point is skipped if the next one is already due, so the
+    path never runs past the deadline. Returns False if wake was set.
+    """
+    count = len(xs)
+    for i in range(count - 1):
+        due = deadline - (count - 1 - i) * period
+        now = clock()
+        if now < due:
+            if wake is not None and wake.wait(due - now):
+                return False
+        elif now >= due + period:
+            continue
+        backend.move(xs[i], ys[i])
+    return True
@@ -0,0 +1,328 @@
+"""
+Click engine running in a child process.
+
+In the GUI process the clicking thread shares the GIL with Tk and the pynput
+listeners, so redraws, theme changes and tooltips show up as click jitter.
+ProcessEngine runs a ClickEngine in a separate process started with 'spawn'
+(it never imports tkinter) and offers the same interface as a ClickEngine,
+so the GUI, a StatusPoller and the metrics exporters can drive it unchanged.
+
+Commands go to the child over a pipe, and the child sends its state
+transitions back the same way. Click counts, timings and the latency
+histograms are written by the child straight into a multiprocessing
+shared_memory block, and the parent reads them in place through memoryviews:
+polling the engine costs no messages and no copies.
+
+Block layout, in 8-byte slots:
+
+    0  clicks done           4  start time (NaN if unset)
+    1  missed ticks          5  stop time
+    2  random seed           6  control latency
+    3  1 if a seed is set    7  max control latency
+
+followed by the interval, lateness, backend and burst histograms (see
+metrics.SharedLatencyHistogram). Times are time.perf_counter() values,
+which use a system-wide clock, so they compare across the two processes.
+"""
+import copy
+import multiprocessing
+import signal
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+from .engine import ClickEngine
+from .metrics import SHARED_HISTOGRAM_SIZE, ClickMetrics, SharedLatencyHistogram
+from .telemetry import StatusChannel
+
+CLICKS, MISSED, SEED, HAS_SEED, START, STOP, CONTROL, MAX_CONTROL = range(8)
+HEADER_SIZE = 8 * 8
+BLOCK_SIZE = HEADER_SIZE + 4 * SHARED_HISTOGRAM_SIZE
+
+# GIL switch interval in the child. The default 5 ms would let a spinning
+# click thread delay the command reader by that much; the child has no other
+# work, so switching more often costs nothing.
+CHILD_SWITCH_INTERVAL = 0.0002
+
+class SharedCounters:
+    """Typed views of the header slots of a shared block."""
+    def __init__(self, buffer):
+        self._view = memoryview(buffer)[:HEADER_SIZE]
+        self.ints = self._view.cast('Q')
+        self.floats = self._view.cast('d')
+
+    def get_time(self, slot):
+        value = self.floats[slot]
+        return None if value != value else value
+
+    def set_time(self, slot, value):
+        self.floats[slot] = float('nan') if value is None else value
+
+    def release(self):
+        for view in (self.ints, self.floats, self._view):
+            view.release()
+
+class SharedClickMetrics(ClickMetrics):
+    """ClickMetrics whose histograms and missed count live in a shared block."""
+    def __init__(self, buffer, counters):
+        self._counters = counters
+        self.interval = SharedLatencyHistogram(buffer[HEADER_SIZE:])
+        self.lateness = SharedLatencyHistogram(buffer[HEADER_SIZE + SHARED_HISTOGRAM_SIZE:])
+        self.backend = SharedLatencyHistogram(buffer[HEADER_SIZE + 2 * SHARED_HISTOGRAM_SIZE:])
+        self.burst = SharedLatencyHistogram(buffer[HEADER_SIZE + 3 * SHARED_HISTOGRAM_SIZE:])
+
+    @property
+    def missed(self):
+        return self._counters.ints[MISSED]
+
+    @missed.setter
+    def missed(self, value):
+        self._counters.ints[MISSED] = value
+
+    def release(self):
+        for _, _, histogram in self.histograms():
+            histogram.release()
+
+def _shared_property(slot, kind):
+    """A property stored in a slot of the shared counters instead of the instance dict."""
+    if kind == 'int':
+        return property(lambda self: self._counters.ints[slot],
+                        lambda self, value: self._counters.ints.__setitem__(slot, value))
+    return property(lambda self: self._counters.get_time(slot),
+                    lambda self, value: self._counters.set_time(slot, value))
+
+def _get_seed(self):
+    counters = self._counters
+    return counters.ints[SEED] if counters.ints[HAS_SEED] else None
+
+def _set_seed(self, value):
+    counters = self._counters
+    if value is not None and 0 <= value < 2 ** 64:
+        counters.ints[SEED] = value
+        counters.ints[HAS_SEED] = 1
+    else:
+        counters.ints[HAS_SEED] = 0
+
+class _PipeStatusChannel(StatusChannel):
+    """Status channel of the child engine that also forwards every transition to the parent."""
+    def __init__(self, conn, lock):
+        super().__init__()
+        self.conn = conn
+        self.lock = lock
+        self.run_id = 0
+
+    def publish(self, state, detail=None, error=None):
+        super().publish(state, detail, error)
+        with self.lock:
+            self.conn.send((self.run_id, state, detail, error))
+
+class _SharedClickEngine(ClickEngine):
+    """The ClickEngine the child runs, with its counters in the shared block."""
+    clicks_done = _shared_property(CLICKS, 'int')
+    start_time = _shared_property(START, 'time')
+    stop_time = _shared_property(STOP, 'time')
+    control_latency = _shared_property(CONTROL, 'time')
+    max_control_latency = _shared_property(MAX_CONTROL, 'time')
+    random_seed = property(_get_seed, _set_seed)
+
+    def __init__(self, buffer, backend=None):
+        self._counters = SharedCounters(buffer)
+        super().__init__(backend)
+        self.metrics = SharedClickMetrics(buffer, self._counters)
+
+def _child_main(conn, block_name, backend_factory, session_log=None):
+    """Entry point of the child process: runs commands from the pipe until told to quit."""
+    sys.setswitchinterval(CHILD_SWITCH_INTERVAL)
+    # Ctrl+C in a terminal reaches the whole process group; the parent decides what to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    block = shared_memory.SharedMemory(name=block_name)
+    engine = _SharedClickEngine(block.buf, backend_factory() if backend_factory is not None else None)
+    status = engine.status = _PipeStatusChannel(conn, threading.Lock())
+    engine.session_log = session_log
+    try:
+        while True:
+            try:
+                command, argument = conn.recv()
+            except EOFError:
+                # The parent went away
+                break
+            if command == 'start':
+                run_id, settings = argument
+                # A run that just reached its repeat count may still be publishing 'stopped'
+                if engine.click_thread is not None:
+                    engine.click_thread.join()
+                status.run_id = run_id
+                engine.start(settings)
+            elif command == 'stop':
+                engine.stop(requested_at=argument)
+            elif command == 'pause':
+                engine.pause(argument)
+            elif command == 'resume':
+                engine.resume(argument)
+            elif command == 'configure':
+                # Already validated by the parent
+                engine.configure(**argument)
+            elif command == 'quit':
+                break
+    finally:
+        engine.stop()
+        engine._counters.release()
+        engine.metrics.release()
+        block.close()
+
+class ProcessEngine:
+    """
+    Runs the click engine in a child process behind the ClickEngine interface.
+
+    backend_factory is called in the child to create its MouseBackend and must
+    be picklable, such as a class; the default drives the real mouse. The
+    child is started right away and lives until close(). A SessionLog given
+    as session_log is recreated in the child, which writes the log files.
+    """
+    def __init__(self, backend_factory=None, session_log=None):
+        context = multiprocessing.get_context('spawn')
+        self._block = shared_memory.SharedMemory(create=True, size=BLOCK_SIZE)
+        self._counters = SharedCounters(self._block.buf)
+        self.metrics = SharedClickMetrics(self._block.buf, self._counters)
+        self.metrics.reset()
+        for slot in (START, STOP, CONTROL):
+            self._counters.set_time(slot, None)
+        self.status = StatusChannel()
+        self.settings = None
+        self.clicking = False
+        self.paused = False
+        self.rate_limited = False
+        self._backend = None
+        self._run_id = 0
+        self._stopped = threading.Event()
+        self._stopped.set()
+
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_child_main, args=(child_conn, self._block.name, backend_factory, session_log),
+                                       daemon=True, name='autoclicker-engine')
+        self.process.start()
+        child_conn.close()
+        self._reader = threading.Thread(target=self._read_status, daemon=True)
+        self._reader.start()
+
+    clicks_done = _shared_property(CLICKS, 'int')
+    start_time = _shared_property(START, 'time')
+    stop_time = _shared_property(STOP, 'time')
+    control_latency = _shared_property(CONTROL, 'time')
+    max_control_latency = _shared_property(MAX_CONTROL, 'time')
+    random_seed = property(_get_seed, _set_seed)
+
+    @property
+    def backend(self):
+        """A mouse backend in this process, for reading the cursor position."""
+        if self._backend is None:
+            from .backends import PynputBackend
+            self._backend = PynputBackend()
+        return self._backend
+
+    def _read_status(self):
+        """Republishes the child's state transitions on this side's status channel."""
+        while True:
+            try:
+                run_id, state, detail, error = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            self.status.publish(state, detail, error)
+            self.rate_limited = state == 'limited'
+            # A 'stopped' left over from an earlier run must not end the current one
+            if state == 'stopped' and run_id == self._run_id:
+                self.clicking = False
+                self.paused = False
+                self._stopped.set()
+        if self.clicking:
+            self.clicking = False
+            self.paused = False
+            self.status.publish('stopped', error="The click engine process exited.")
+        self._stopped.set()
+
+    def _send(self, command, argument=None):
+        self._conn.send((command, argument))
+
+    def start(self, settings):
+        """Starts clicking in the child process. Returns False if already running."""
+        if self.clicking:
+            return False
+        if not self.process.is_alive():
+            raise RuntimeError("The click engine process is not running.")
+        self._run_id += 1
+        self.settings = copy.copy(settings)
+        self.clicking = True
+        self.paused = False
+        self._stopped.clear()
+        self._send('start', (self._run_id, settings))
+        return True
+
+    def stop(self, wait=True, requested_at=None):
+        """Stops clicking. With wait=True this blocks until the child confirms."""
+        if not self.clicking:
+            return
+        self.clicking = False
+        self.paused = False
+        self._send('stop', time.perf_counter() if requested_at is None else requested_at)
+        if wait:
+            self._stopped.wait()
+
+    def wait(self, timeout=None):
+        """Blocks until the current run has stopped; returns False on timeout."""
+        return self._stopped.wait(timeout)
+
+    def pause(self, requested_at=None):
+        if self.clicking and not self.paused:
+            self.toggle_pause(requested_at)
+
+    def resume(self, requested_at=None):
+        if self.paused:
+            self.toggle_pause(requested_at)
+
+    def toggle_pause(self, requested_at=None):
+        """Toggles the paused state and returns the new state."""
+        self.paused = not self.paused
+        self._send('pause' if self.paused else 'resume', time.perf_counter() if requested_at is None else requested_at)
+        return self.paused
+
+    def configure(self, **changes):
+        """Changes the interval or fixed position of the current run (see ClickEngine.configure)."""
+        if self.settings is None:
+            raise ValueError("Nothing to configure before the first start.")
+        # Validated on this side, so the child never gets a change it would reject
+        self.settings.update(**changes)
+        self._send('configure', changes)
+
+    def missed_ticks(self):
+        """Scheduled clicks dropped by the catch-up policy; updated when a run ends."""
+        return self.metrics.missed
+
+    def achieved_cps(self):
+        """Average clicks per second between starting and stopping (or now, while running)."""
+        start_time = self.start_time
+        if not start_time:
+            return 0.0
+        stop_time = self.stop_time
+        end_time = stop_time if stop_time is not None else time.perf_counter()
+        elapsed_time = end_time - start_time
+        return self.clicks_done / elapsed_time if elapsed_time > 0 else 0.0
+
+    def close(self):
+        """Stops clicking, ends the child process and frees the shared block."""
+        if self.process.is_alive():
+            self.stop()
+            try:
+                self._send('quit')
+            except OSError:
+                pass
+            self.process.join(5)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+        self._conn.close()
+        self._reader.join()
+        self._counters.release()
+        self.metrics.release()
+        self._block.close()
+        self._block.unlink()
@@ -0,0 +1,225 @@
+"""
+In-memory settings store with named profiles and background saving.
+
+The GUI keeps the whole settings file in a ProfileStore instead of reading
+and rewriting it itself. Changes only touch the parsed copy in memory and
+mark it dirty; a writer thread saves it SAVE_DELAY seconds after the last
+change, so a burst of changes (or a start from a hotkey) costs one write
+and the Tk thread never waits for the disk. Files are written to a
+temporary file next to the target and renamed over it, so a crash or a
+full disk can never leave a half-written settings file behind.
+
+Validated ClickSettings are cached per profile until the profile changes,
+so starting the engine or switching profiles doesn't parse anything again.
+"""
+import configparser
+import io
+import os
+import tempfile
+import threading
+import time
+
+from .settings import CONFIG_SECTION, DEFAULT_PROFILE, DEFAULTS, PROFILE_SECTION_PREFIX, ClickSettings, profile_values
+
+# Seconds to wait after the last change before writing the file
+SAVE_DELAY = 0.5
+
+def atomic_write(path, text):
+    """Writes text to path by writing a temporary file in the same directory and renaming it over path."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as temp_file:
+            temp_file.write(text)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+class ProfileStore:
+    """
+    The parsed settings file, shared by the Tk thread and the writer thread.
+
+    Every method may be called from any thread. last_error holds the error of
+    the last failed write, if any; the data stays dirty and is written again
+    with the next change or on flush().
+    """
+    def __init__(self, path, save_delay=SAVE_DELAY):
+        self.path = path
+        self.save_delay = save_delay
+        self.last_error = None
+        self.saves = 0
+        self._config = configparser.ConfigParser()
+        self._config.read(path)
+        if not self._config.has_section(CONFIG_SECTION):
+            self._config.add_section(CONFIG_SECTION)
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._save_at = 0.0
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = None
+
+    # --- Reading ---
+    def names(self):
+        """Profile names, Default first."""
+        with self._lock:
+            return [DEFAULT_PROFILE] + [section[len(PROFILE_SECTION_PREFIX):] for section in self._config.sections()
+                                        if section.startswith(PROFILE_SECTION_PREFIX)]
+
+    @property
+    def active(self):
+        """The selected profile, falling back to Default if it no longer exists."""
+        name = self.app_values().get('profile', DEFAULT_PROFILE)
+        return name if name in self.names() else DEFAULT_PROFILE
+
+    def app_values(self):
+        """A copy of the [SETTINGS] section."""
+        with self._lock:
+            return dict(self._config[CONFIG_SECTION])
+
+    def values(self, name):
+        """The full click settings of a profile as config strings."""
+        with self._lock:
+            return profile_values(self._config, name)
+
+    def settings(self, name):
+        """Validated ClickSettings for a profile, parsed once per change. Raises ValueError."""
+        with self._lock:
+            settings = self._cache.get(name)
+            if settings is None:
+                settings = self._cache[name] = ClickSettings.from_config(profile_values(self._config, name))
+            return settings
+
+    def sections(self, prefix):
+        """The sections whose names start with prefix, as {name without prefix: values}."""
+        with self._lock:
+            return {section[len(prefix):]: dict(self._config[section]) for section in self._config.sections()
+                    if section.startswith(prefix)}
+
+    # --- Changing ---
+    def update(self, name, values):
+        """Stores click settings in a profile. Nothing is invalidated or saved if they didn't change."""
+        section_name = CONFIG_SECTION if name == DEFAULT_PROFILE else PROFILE_SECTION_PREFIX + name
+        with self._lock:
+            if not self._config.has_section(section_name):
+                self._config.add_section(section_name)
+            section = self._config[section_name]
+            changed = {key: value for key, value in values.items() if section.get(key) != value}
+            if not changed:
+                return
+            section.update(changed)
+            if name == DEFAULT_PROFILE:
+                # Other profiles fall back to [SETTINGS] for keys they don't set
+                self._cache.clear()
+            else:
+                self._cache.pop(name, None)
+        self.schedule_save()
+
+    def update_app(self, values):
+        """Stores application settings (hotkeys, theme and so on) in [SETTINGS]."""
+        with self._lock:
+            section = self._config[CONFIG_SECTION]
+            changed = {key: value for key, value in values.items() if section.get(key) != value}
+            if not changed:
+                return
+            section.update(changed)
+            if any(key in DEFAULTS for key in changed):
+                self._cache.clear()
+        self.schedule_save()
+
+    def set_active(self, name):
+        self.update_app({'profile': name})
+
+    def add_profile(self, name, values):
+        """Creates a profile. Raises ValueError if the name is taken or empty."""
+        name = name.strip()
+        if not name:
+            raise ValueError("Profile name cannot be empty.")
+        if name in self.names():
+            raise ValueError(f"There is already a profile named {name}.")
+        self.update(name, values)
+
+    def delete_profile(self, name):
+        """Deletes a profile; the Default profile can't be deleted."""
+        if name == DEFAULT_PROFILE:
+            raise ValueError("The Default profile can't be deleted.")
+        with self._lock:
+            self._config.remove_section(PROFILE_SECTION_PREFIX + name)
+            self._cache.pop(name, None)
+        self.schedule_save()
+
+    def replace_sections(self, prefix, sections):
+        """Replaces every section starting with prefix by the given {name: values}."""
+        with self._lock:
+            for section in self._config.sections():
+                if section.startswith(prefix) and section[len(prefix):] not in sections:
+                    self._config.remove_section(section)
+            for name, values in sections.items():
+                self._config[prefix + name] = values
+        self.schedule_save()
+
+    # --- Saving ---
+    def schedule_save(self):
+        """Marks the data dirty and (re)starts the save delay."""
+        with self._lock:
+            self._dirty = True
+            self._save_at = time.monotonic() + self.save_delay
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._writer, daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _writer(self):
+        """Writes the file once no change has happened for save_delay seconds."""
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._closed:
+                return
+            while True:
+                with self._lock:
+                    remaining = self._save_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                # A new change restarts the delay
+                self._wake.wait(remaining)
+                self._wake.clear()
+                if self._closed:
+                    return
+            self.flush()
+
+    def flush(self):
+        """Writes pending changes right away, in the calling thread."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            text = io.StringIO()
+            self._config.write(text)
+        try:
+            atomic_write(self.path, text.getvalue())
+        except OSError as e:
+            self.last_error = e
+            with self._lock:
+                self._dirty = True
+            return
+        self.last_error = None
+        self.saves += 1
+
+    def close(self):
+        """Stops the writer thread and writes anything still pending."""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._wake.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
@@ -0,0 +1,115 @@
+"""
+Multi-target click sequences.
+
+A sequence is an ordered list of targets, each with its own position, mouse
+button, click type, dwell time and repeat count. In the config file it is
+stored as one line, with targets separated by ';' and fields by ',':
+
+    sequence = 100,200;300,400,right,double,0.5,3
+
+Missing trailing fields take their defaults (left, single, no dwell, 1 repeat).
+A dwell of 0 means the normal click interval follows that target; any other
+value replaces the interval after the target's last repeat.
+
+Before clicking starts, the sequence is flattened into a Route: one entry
+per click, with repeats expanded, stored column-wise in typed arrays. The
+click loop then only reads the arrays at the current step index and
+increments it, however long the sequence is. Since every repeat of a
+target adds an entry, a target repeats at most MAX_REPEAT times and a
+route has at most MAX_ROUTE_STEPS entries.
+"""
+from array import array
+
+from .backends import BUTTON_NAMES
+
+CLICK_TYPES = ('single', 'double')
+# Limits on the expanded route, which takes about 21 bytes per click
+MAX_REPEAT = 10000
+MAX_ROUTE_STEPS = 100000
+
+class Target:
+    """One entry of a click sequence."""
+    def __init__(self, x, y, button='left', click_type='single', dwell=0.0, repeat=1):
+        if button not in BUTTON_NAMES:
+            raise ValueError(f"Unknown mouse button: {button}")
+        if click_type not in CLICK_TYPES:
+            raise ValueError(f"Unknown click type: {click_type}")
+        if dwell < 0:
+            raise ValueError("Dwell time cannot be negative.")
+        if repeat < 1:
+            raise ValueError("Target repeat count must be a positive integer.")
+        if repeat > MAX_REPEAT:
+            raise ValueError(f"Target repeat count can be at most {MAX_REPEAT}.")
+        self.x = x
+        self.y = y
+        self.button = button
+        self.click_type = click_type
+        self.dwell = dwell
+        self.repeat = repeat
+
+    def __repr__(self):
+        return f"Target({self.format()})"
+
+    @classmethod
+    def parse(cls, text):
+        """Parses 'x,y[,button[,type[,dwell[,repeat]]]]'."""
+        fields = [field.strip() for field in text.split(',')]
+        if len(fields) < 2 or len(fields) > 6:
+            raise ValueError(f"Invalid sequence target: {text.strip()}")
+        try:
+            x, y = int(fields[0]), int(fields[1])
+            button = fields[2] if len(fields) > 2 and fields[2] else 'left'
+            click_type = fields[3] if len(fields) > 3 and fields[3] else 'single'
+            dwell = float(fields[4]) if len(fields) > 4 and fields[4] else 0.0
+            repeat = int(fields[5]) if len(fields) > 5 and fields[5] else 1
+        except ValueError:
+            raise ValueError(f"Invalid sequence target: {text.strip()}")
+        return cls(x, y, button, click_type, dwell, repeat)
+
+    def format(self):
+        """Formats the target the way parse() reads it, leaving out trailing defaults."""
+        fields = [str(self.x), str(self.y), self.button, self.click_type, f"{self.dwell:g}", str(self.repeat)]
+        defaults = [None, None, 'left', 'single', '0', '1']
+        while len(fields) > 2 and fields[-1] == defaults[len(fields) - 1]:
+            fields.pop()
+        return ','.join(fields)
+
+def parse_sequence(text, separator=';'):
+    """Parses a sequence string into a list of targets. Blank entries are ignored."""
+    return [Target.parse(entry) for entry in text.replace('\n', separator).split(separator) if entry.strip()]
+
+def format_sequence(targets, separator=';'):
+    """Formats targets as a sequence string."""
+    return separator.join(target.format() for target in targets)
+
+class Route:
+    """
+    A sequence flattened to one entry per click.
+
+    xs and ys hold the positions, buttons an index into button_names, counts
+    the clicks per step (2 for double clicks) and waits the time before the
+    next step, with 0 meaning the normal click interval.
+    """
+    def __init__(self, targets):
+        if not targets:
+            raise ValueError("Please add at least one sequence target first.")
+        if sum(target.repeat for target in targets) > MAX_ROUTE_STEPS:
+            raise ValueError(f"A sequence can have at most {MAX_ROUTE_STEPS} clicks, counting repeats.")
+        self.button_names = BUTTON_NAMES
+        self.xs = array('i')
+        self.ys = array('i')
+        self.buttons = array('B')
+        self.counts = array('B')
+        self.waits = array('d')
+        for target in targets:
+            button = self.button_names.index(target.button)
+            count = 2 if target.click_type == 'double' else 1
+            for repeat in range(target.repeat):
+                self.xs.append(target.x)
+                self.ys.append(target.y)
+                self.buttons.append(button)
+                self.counts.append(count)
+                self.waits.append(target.dwell if repeat == target.repeat - 1 else 0.0)
+
+    def __len__(self):
+        return len(self.xs)
@@ -0,0 +1,168 @@
+"""
+Deadline-based pacing for the click loop.
+"""
+import time
+
+# How much of each wait is spent busy-polling the clock in precise timing mode.
+# Sleeping is only accurate to roughly the OS timer granularity, so the final
+# stretch before a deadline is spun to get sub-millisecond accuracy.
+PRECISE_SPIN_THRESHOLD = 0.002
+
+# --- Deadline Scheduler ---
+class DeadlineScheduler:
+    """
+    Paces a loop against absolute deadlines on the monotonic clock.
+
+    Every tick is due at the previous deadline plus the interval, so the time
+    spent clicking and updating the status bar is absorbed by the next wait
+    instead of stretching the period, and the achieved rate does not drift on
+    long runs. Sleeping alone keeps each click within the OS timer granularity
+    (about 1 ms on Linux/macOS, up to ~15 ms on Windows) of its deadline; with
+    a spin threshold the last part of each wait busy-polls the clock, which
+    keeps clicks within a few microseconds of their deadline at the cost of CPU.
+
+    When the host stalls and whole ticks are missed, the catch-up policy decides
+    what happens: 'skip' drops the missed ticks and keeps the original phase,
+    'burst' fires up to max_burst of them back to back to restore the count.
+
+    If a wake event is given, waits block on it instead of sleeping and return
+    early as soon as it is set, so the owner can pause or stop the loop without
+    waiting out the rest of a long interval.
+    """
+    SKIP = 'skip'
+    BURST = 'burst'
+    CATCH_UP_POLICIES = (SKIP, BURST)
+
+    def __init__(self, spin_threshold=0.0, catch_up=SKIP, max_burst=10, clock=time.perf_counter, sleep=time.sleep, wake=None):
+        if catch_up not in self.CATCH_UP_POLICIES:
+            raise ValueError(f"Unknown catch-up policy: {catch_up}")
+        if spin_threshold < 0:
+            raise ValueError("Spin threshold cannot be negative.")
+        self.spin_threshold = spin_threshold
+        self.catch_up = catch_up
+        self.max_burst = max_burst
+        self.clock = clock
+        self.sleep = sleep
+        self.wake = wake
+        self.deadline = None
+        self.missed = 0
+
+    def reset(self, now=None):
+        """Anchors the schedule so that the next tick is due right away."""
+        self.deadline = self.clock() if now is None else now
+
+    def wait(self):
+        """
+        Blocks until the current deadline and returns how late it woke up, in
+        seconds, or None if the wait was cut short by the wake event.
+        """
+        if self.deadline is None:
+            self.reset()
+        deadline = self.deadline
+        clock = self.clock
+        spin = self.spin_threshold
+        wake = self.wake
+        # Sleep in a loop since sleep() is allowed to return early on some platforms
+        while True:
+            remaining = deadline - clock()
+            if remaining <= spin:
+                break
+            if wake is None:
+                self.sleep(remaining - spin)
+            elif wake.wait(remaining - spin):
+                return None
+        now = clock()
+        while now < deadline:
+            if wake is not None and wake.is_set():
+                return None
+            now = clock()
+        return now - deadline
+
+    def advance(self, interval):
+        """Moves the deadline one interval forward, applying the catch-up policy if behind."""
+        deadline = self.deadline + interval
+        behind = self.clock() - deadline
+        if interval > 0 and behind >= interval:
+            missed = int(behind / interval)
+            if self.catch_up == self.BURST:
+                # Replay missed ticks immediately, but never more than max_burst of them
+                missed = max(0, missed - self.max_burst)
+            deadline += missed * interval
+            self.missed += missed
+        self.deadline = deadline
+
+# --- Adaptive Rate Controller ---
+class RateController:
+    """
+    Closed-loop pacing for adaptive mode.
+
+    The plain scheduler trusts that waiting until each deadline gives the
+    configured rate. In adaptive mode the engine instead asks the controller,
+    after every click, how long to wait from that click's start until the
+    next one. The controller compares the time actually elapsed since the
+    first click with the sum of the intervals planned so far and corrects the
+    next wait by a proportional-integral term on that error. Oversleeping and
+    slow or jittery backend calls therefore shorten the following waits until
+    the long-run rate is back on target, without the bursts of the 'burst'
+    catch-up policy: a single wait is never changed by more than
+    max_correction of its planned length.
+
+    When the controller stays more than LIMIT_BEHIND intervals behind even
+    with the shortest waits it may use, the target can't be reached; limited
+    is then True and backend_cost (a moving average of the backend call
+    duration) tells how fast the backend could go. To avoid a long burst once
+    the backend speeds up again, the deficit is capped at MAX_DEFICIT intervals.
+    """
+    KP = 0.5
+    KI = 0.05
+    MAX_CORRECTION = 0.5
+    LIMIT_BEHIND = 3
+    MAX_DEFICIT = 10
+    COST_SMOOTHING = 0.05
+
+    def __init__(self, kp=KP, ki=KI, max_correction=MAX_CORRECTION):
+        self.kp = kp
+        self.ki = ki
+        self.max_correction = max_correction
+        self.backend_cost = 0.0
+        self.reset()
+
+    def reset(self):
+        """Starts a new measurement at the next click, e.g. after a pause."""
+        self.anchor = None
+        self.scheduled = 0.0
+        self.integral = 0.0
+        self.limited = False
+
+    def next_wait(self, now, planned, backend_cost):
+        """
+        Called after the click that started at now, whose backend calls took
+        backend_cost seconds. planned is the interval the settings ask for
+        before the next click; returns the wait to use instead, from now.
+        """
+        if self.anchor is None:
+            self.anchor = now
+            if not self.backend_cost:
+                self.backend_cost = backend_cost
+        self.backend_cost += (backend_cost - self.backend_cost) * self.COST_SMOOTHING
+        # Positive when this click came later than the plan
+        error = now - self.anchor - self.scheduled
+        if planned > 0:
+            if error > self.MAX_DEFICIT * planned:
+                self.anchor += error - self.MAX_DEFICIT * planned
+                error = self.MAX_DEFICIT * planned
+            if self.limited:
+                self.limited = error > planned
+            else:
+                self.limited = error > self.LIMIT_BEHIND * planned
+        self.scheduled += planned
+        if not self.limited:
+            # Stop integrating while the target is out of reach
+            self.integral += error
+        correction = self.kp * error + self.ki * self.integral
+        limit = self.max_correction * planned
+        if correction > limit:
+            correction = limit
+        elif correction < -limit:
+            correction = -limit
+        return planned - correction
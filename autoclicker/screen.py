@@ -0,0 +1,292 @@
+"""
+Screen-triggered clicking.
+
+A ScreenTrigger makes the engine watch a small screen region, sampled
+trigger_rate times a second, and react to it instead of clicking purely on
+the clock:
+
+* color: fires while any pixel of the region is within tolerance of a color.
+* template: fires while the region matches a template image (a binary PPM
+  file of the region's size) pixel for pixel, within tolerance.
+* change: fires once the region differs from how it looked at the last
+  click by more than tolerance in any channel of any pixel.
+
+With the 'click' action a due click waits until the trigger fires. With the
+'next' action (sequences only) clicks keep their rhythm on the current
+target, and the route moves on to the next target each time the trigger
+fires.
+
+Pixels come from a CaptureSource: ScreenCapture reads the real screen with
+mss or Pillow, and SyntheticScreen is an in-memory framebuffer for tests
+and benchmarks. RegionWatcher keeps the last frame it saw, so an unchanged
+frame costs one bytes comparison; for a changed frame only the pixels that
+changed are compared again, using NumPy when it is installed, and a running
+count of matching pixels is kept up to date.
+"""
+import threading
+import time
+
+from .intervals import _load_numpy
+
+TRIGGER_MODES = ('off', 'color', 'template', 'change')
+TRIGGER_ACTIONS = ('click', 'next')
+
+DEFAULT_RATE = 60.0
+
+def parse_region(text):
+    """Parses 'x,y,width,height' into a tuple of ints."""
+    try:
+        x, y, width, height = (int(part) for part in text.split(','))
+    except ValueError:
+        raise ValueError("Trigger region must be x,y,width,height.")
+    if x < 0 or y < 0 or width <= 0 or height <= 0:
+        raise ValueError("Trigger region must be on screen and at least one pixel.")
+    return x, y, width, height
+
+def parse_color(text):
+    """Parses '#rrggbb' or 'r,g,b' into an (r, g, b) tuple."""
+    text = text.strip()
+    try:
+        if text.startswith('#') and len(text) == 7:
+            color = tuple(int(text[i:i + 2], 16) for i in (1, 3, 5))
+        else:
+            color = tuple(int(part) for part in text.split(','))
+    except ValueError:
+        color = ()
+    if len(color) != 3 or not all(0 <= channel <= 255 for channel in color):
+        raise ValueError("Trigger color must be #rrggbb or r,g,b.")
+    return color
+
+def read_ppm(path):
+    """Reads a binary (P6) PPM image with 8-bit channels. Returns (width, height, RGB bytes)."""
+    try:
+        with open(path, 'rb') as image_file:
+            data = image_file.read()
+    except OSError as e:
+        raise ValueError(f"Could not read the trigger template: {e}")
+    # Header: magic, width, height and maxval separated by whitespace, with # comments
+    fields = []
+    position = 0
+    while len(fields) < 4:
+        while position < len(data) and data[position:position + 1].isspace():
+            position += 1
+        if data[position:position + 1] == b'#':
+            position = data.find(b'\n', position) + 1 or len(data)
+            continue
+        start = position
+        while position < len(data) and not data[position:position + 1].isspace():
+            position += 1
+        if start == position:
+            break
+        fields.append(data[start:position])
+    if len(fields) < 4 or fields[0] != b'P6' or fields[3] != b'255':
+        raise ValueError("Trigger template must be a binary PPM (P6) image with 8-bit channels.")
+    width, height = int(fields[1]), int(fields[2])
+    pixels = data[position + 1:position + 1 + width * height * 3]
+    if len(pixels) != width * height * 3:
+        raise ValueError("Trigger template image is truncated.")
+    return width, height, pixels
+
+class ScreenTrigger:
+    """
+    What to watch and how to react. region is (x, y, width, height); color is
+    an (r, g, b) tuple for color triggers and template the region's RGB bytes
+    for template triggers. tolerance is the largest difference per channel
+    still counted as equal.
+    """
+    def __init__(self, mode, region, color=None, template=None, tolerance=0, rate=DEFAULT_RATE, action='click'):
+        if mode not in TRIGGER_MODES or mode == 'off':
+            raise ValueError(f"Unknown trigger mode: {mode}")
+        if action not in TRIGGER_ACTIONS:
+            raise ValueError(f"Unknown trigger action: {action}")
+        if mode == 'color' and color is None:
+            raise ValueError("A color trigger needs a color.")
+        if mode == 'template' and (template is None or len(template) != region[2] * region[3] * 3):
+            raise ValueError("The trigger template must be the size of the region.")
+        if not 0 <= tolerance <= 255:
+            raise ValueError("Trigger tolerance must be between 0 and 255.")
+        if rate <= 0:
+            raise ValueError("Trigger rate must be positive.")
+        self.mode = mode
+        self.region = region
+        self.color = color
+        self.template = template
+        self.tolerance = tolerance
+        self.rate = rate
+        self.action = action
+
+class CaptureSource:
+    """Interface of a source of screen pixels."""
+    def grab(self, x, y, width, height):
+        """The region's pixels as RGB bytes, row by row."""
+        raise NotImplementedError
+
+class ScreenCapture(CaptureSource):
+    """
+    Reads the real screen with mss, or with Pillow's ImageGrab if mss isn't
+    installed. Both are optional and imported on first use; each thread
+    opens its own connection to the display.
+    """
+    def __init__(self):
+        self._local = threading.local()
+
+    def grab(self, x, y, width, height):
+        grab = getattr(self._local, 'grab', None)
+        if grab is None:
+            grab = self._local.grab = _open_grabber()
+        return grab(x, y, width, height)
+
+def _open_grabber():
+    try:
+        import mss
+    except ImportError:
+        try:
+            from PIL import ImageGrab
+        except ImportError:
+            raise RuntimeError("Screen triggers need the mss or Pillow package.")
+        return lambda x, y, width, height: ImageGrab.grab(bbox=(x, y, x + width, y + height)).convert('RGB').tobytes()
+    screen = mss.mss()
+    return lambda x, y, width, height: screen.grab({'left': x, 'top': y, 'width': width, 'height': height}).rgb
+
+class SyntheticScreen(CaptureSource):
+    """
+    An in-memory RGB framebuffer. fill() changes it from any thread and
+    remembers when in changed_at, so the time from a change to the click
+    reacting to it can be measured without a display.
+    """
+    def __init__(self, width, height, color=(0, 0, 0), clock=time.perf_counter):
+        self.width = width
+        self.height = height
+        self.clock = clock
+        self.pixels = bytearray(bytes(color) * (width * height))
+        self.changed_at = None
+        self.grabs = 0
+        self._lock = threading.Lock()
+
+    def fill(self, x, y, width, height, color):
+        """Paints a rectangle in one color."""
+        row = bytes(color) * width
+        with self._lock:
+            for line in range(y, y + height):
+                start = (line * self.width + x) * 3
+                self.pixels[start:start + len(row)] = row
+            self.changed_at = self.clock()
+
+    def grab(self, x, y, width, height):
+        if x + width > self.width or y + height > self.height:
+            raise ValueError("Trigger region is outside the screen.")
+        stride = self.width * 3
+        with self._lock:
+            self.grabs += 1
+            return b''.join(self.pixels[line * stride + x * 3:line * stride + (x + width) * 3]
+                            for line in range(y, y + height))
+
+class RegionWatcher:
+    """
+    Samples a ScreenTrigger's region from a CaptureSource and tells whether
+    the trigger fires. frames counts the samples taken and changed_frames
+    the ones that differed from the sample before.
+    """
+    def __init__(self, source, trigger, use_numpy=True):
+        self.source = source
+        self.trigger = trigger
+        self.region = trigger.region
+        self.pixel_count = trigger.region[2] * trigger.region[3]
+        self.frames = 0
+        self.changed_frames = 0
+        self._frame = None
+        # The last frame as an array, with NumPy
+        self._pixels = None
+        # Pixels within tolerance of their target: the color, the template or,
+        # for change triggers, the frame of the last consume()
+        self._close = 0
+        self._target = None
+        # Set by consume() in 'next' mode until the region stops matching
+        self._latched = False
+        self._numpy = _load_numpy() if use_numpy else None
+        if trigger.mode == 'color':
+            self._target = bytes(trigger.color) * self.pixel_count
+        elif trigger.mode == 'template':
+            self._target = bytes(trigger.template)
+        if self._numpy is not None:
+            self._flags = self._numpy.zeros(self.pixel_count, dtype=bool)
+            if self._target is not None:
+                self._target = self._as_pixels(self._target)
+
+    def _as_pixels(self, frame):
+        np = self._numpy
+        return np.frombuffer(frame, dtype=np.uint8).reshape(-1, 3).astype(np.int16)
+
+    def poll(self):
+        """Takes a sample and returns whether the trigger fires."""
+        frame = self.source.grab(*self.region)
+        self.frames += 1
+        if frame != self._frame:
+            self.changed_frames += 1
+            if self._target is None:
+                # First frame of a change trigger: it becomes the reference
+                if self._numpy is not None:
+                    self._pixels = self._target = self._as_pixels(frame)
+                    self._flags[:] = True
+                else:
+                    self._target = frame
+                self._close = self.pixel_count
+            elif self._numpy is not None:
+                self._update_numpy(frame)
+            else:
+                self._close = self._count_close(frame)
+            self._frame = frame
+        matched = self._matched()
+        if self._latched:
+            if matched:
+                return False
+            self._latched = False
+        return matched
+
+    def consume(self):
+        """
+        Called after acting on a firing. A change trigger then waits for the
+        region to change again; in 'next' mode a color or template trigger
+        waits for the region to stop matching before it can fire again.
+        """
+        if self.trigger.mode == 'change':
+            if self._frame is not None:
+                if self._numpy is not None:
+                    self._target = self._pixels
+                    self._flags[:] = True
+                else:
+                    self._target = self._frame
+                self._close = self.pixel_count
+        elif self.trigger.action == 'next':
+            self._latched = True
+
+    def _matched(self):
+        mode = self.trigger.mode
+        if mode == 'color':
+            return self._close > 0
+        if mode == 'template':
+            return self._close == self.pixel_count
+        return self._close < self.pixel_count
+
+    def _update_numpy(self, frame):
+        np = self._numpy
+        pixels = self._as_pixels(frame)
+        if self._pixels is None:
+            changed = slice(None)
+        else:
+            changed = np.flatnonzero((pixels != self._pixels).any(axis=1))
+        self._pixels = pixels
+        close = (np.abs(pixels[changed] - self._target[changed]) <= self.trigger.tolerance).all(axis=1)
+        flags = self._flags
+        self._close += int(np.count_nonzero(close)) - int(np.count_nonzero(flags[changed]))
+        flags[changed] = close
+
+    def _count_close(self, frame):
+        target = self._target
+        tolerance = self.trigger.tolerance
+        close = 0
+        for i in range(0, len(frame), 3):
+            if (abs(frame[i] - target[i]) <= tolerance and abs(frame[i + 1] - target[i + 1]) <= tolerance
+                    and abs(frame[i + 2] - target[i + 2]) <= tolerance):
+                close += 1
+        return close
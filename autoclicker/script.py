@@ -0,0 +1,267 @@
+"""
+Click scripts.
+
+A click script is a text file with one statement per line; '#' starts a
+comment. Durations are seconds, or milliseconds with an 'ms' suffix ('s' is
+also accepted):
+
+    move X Y                    move the cursor
+    click [BUTTON] [COUNT]      click left (default), right, middle, x1 or x2, COUNT times
+    double [BUTTON]             same as click BUTTON 2
+    hold BUTTON DURATION        press a button, wait, release it
+    press KEY [DURATION]        tap a key, or hold it down for DURATION
+    wait DURATION               pause
+    wait random MIN MAX [DIST]  random pause, DIST as for random intervals
+    repeat N ... end            run the statements in between N times
+    loop ... end                run them until clicking stops
+
+Blocks nest. Keys are named as for hotkeys: a character, a key name such as
+'enter' or 'f6', or '<vk>' for a virtual key code.
+
+compile_script() checks everything once, including button and key names,
+and flattens the script into a Program: parallel typed arrays of opcodes and
+their operands, with repeats turned into counter and jump ops. The engine
+runs a program with a small interpreter that only indexes those arrays, so
+no decision the script fixes is made again while clicking.
+
+The click settings of the GUI get the same treatment in the engine's click
+loop, which picks the steps of a click for the settings once before the
+run, so that interval and location changes during a run, adaptive rate,
+motion, screen triggers, key repeat and tracing keep working there.
+script_from_settings() writes those settings as a script that clicks the
+same way, as a starting point for one.
+"""
+from array import array
+
+from .backends import BUTTON_NAMES
+from .intervals import DISTRIBUTIONS
+from .keypress import key_name
+
+# Opcodes
+MOVE = 0        # a=x, b=y
+CLICK = 1       # a=button, b=count
+PRESS = 2       # a=button
+RELEASE = 3     # a=button
+KEY_DOWN = 4    # a=key
+KEY_UP = 5      # a=key
+WAIT = 6        # f=seconds
+WAIT_RANDOM = 7 # a=random source
+SET = 8         # a=counter, b=count
+LOOP = 9        # a=counter, b=target: decrement the counter and jump to target unless it reached 0
+JUMP = 10       # b=target
+# Most clicks one click statement may send; backends and session logs store the count in a byte
+MAX_CLICK_COUNT = 255
+
+OP_NAMES = ('move', 'click', 'press', 'release', 'key_down', 'key_up', 'wait', 'wait_random', 'set', 'loop', 'jump')
+
+class Program:
+    """
+    A compiled click script. Op i is ops[i] with operands a[i], b[i] and
+    f[i]; keys holds the key names KEY_DOWN and KEY_UP refer to, randoms the
+    (min, max, distribution) of every random wait, and counters is the
+    number of repeat counters the program needs.
+    """
+    def __init__(self):
+        self.ops = array('B')
+        self.a = array('i')
+        self.b = array('i')
+        self.f = array('d')
+        self.keys = []
+        self.randoms = []
+        self.counters = 0
+
+    def __len__(self):
+        return len(self.ops)
+
+    def emit(self, op, a=0, b=0, f=0.0):
+        """Appends an op and returns its index."""
+        self.ops.append(op)
+        self.a.append(a)
+        self.b.append(b)
+        self.f.append(f)
+        return len(self.ops) - 1
+
+    def key_index(self, name):
+        if name not in self.keys:
+            self.keys.append(name)
+        return self.keys.index(name)
+
+    def disassemble(self):
+        """The program as text, one op per line."""
+        lines = []
+        for index, (op, a, b, f) in enumerate(zip(self.ops, self.a, self.b, self.f)):
+            if op == MOVE:
+                operands = f"{a}, {b}"
+            elif op == CLICK:
+                operands = f"{BUTTON_NAMES[a]} x{b}"
+            elif op in (PRESS, RELEASE):
+                operands = BUTTON_NAMES[a]
+            elif op in (KEY_DOWN, KEY_UP):
+                operands = self.keys[a]
+            elif op == WAIT:
+                operands = f"{f:g} s"
+            elif op == WAIT_RANDOM:
+                low, high, distribution = self.randoms[a]
+                operands = f"{low:g}-{high:g} s {distribution}"
+            elif op == SET:
+                operands = f"counter {a} = {b}"
+            elif op == LOOP:
+                operands = f"counter {a} -> {b}"
+            else:
+                operands = f"-> {b}"
+            lines.append(f"{index:5}  {OP_NAMES[op]:<12}{operands}")
+        return '\n'.join(lines)
+
+def parse_duration(text):
+    """Parses '1.5', '1.5s' or '200ms' into seconds."""
+    text = text.lower()
+    scale = 1.0
+    if text.endswith('ms'):
+        text, scale = text[:-2], 0.001
+    elif text.endswith('s'):
+        text = text[:-1]
+    try:
+        value = float(text) * scale
+    except ValueError:
+        raise ValueError(f"Invalid duration: {text}")
+    if value < 0:
+        raise ValueError("Durations cannot be negative.")
+    return value
+
+def _button(name):
+    if name not in BUTTON_NAMES:
+        raise ValueError(f"Unknown mouse button: {name}")
+    return BUTTON_NAMES.index(name)
+
+def _count(text, what):
+    try:
+        count = int(text)
+    except ValueError:
+        count = 0
+    if count < 1:
+        raise ValueError(f"{what} must be a positive integer.")
+    return count
+
+def _compile_statement(program, words):
+    """Emits the ops of one statement other than repeat, loop and end."""
+    command, args = words[0].lower(), words[1:]
+    if command == 'move' and len(args) == 2:
+        try:
+            program.emit(MOVE, int(args[0]), int(args[1]))
+        except ValueError:
+            raise ValueError("move expects whole-number coordinates.")
+    elif command == 'click' and len(args) <= 2:
+        button = _button(args[0].lower()) if args else 0
+        count = _count(args[1], "Click count") if len(args) > 1 else 1
+        if count > MAX_CLICK_COUNT:
+            raise ValueError(f"Click count can be at most {MAX_CLICK_COUNT}; use repeat for more clicks.")
+        program.emit(CLICK, button, count)
+    elif command == 'double' and len(args) <= 1:
+        program.emit(CLICK, _button(args[0].lower()) if args else 0, 2)
+    elif command == 'hold' and len(args) == 2:
+        button = _button(args[0].lower())
+        program.emit(PRESS, button)
+        program.emit(WAIT, f=parse_duration(args[1]))
+        program.emit(RELEASE, button)
+    elif command == 'press' and len(args) in (1, 2):
+        key = program.key_index(key_name(args[0]))
+        program.emit(KEY_DOWN, key)
+        if len(args) == 2:
+            program.emit(WAIT, f=parse_duration(args[1]))
+        program.emit(KEY_UP, key)
+    elif command == 'wait' and len(args) == 1:
+        program.emit(WAIT, f=parse_duration(args[0]))
+    elif command == 'wait' and args and args[0].lower() == 'random' and len(args) in (3, 4):
+        low, high = parse_duration(args[1]), parse_duration(args[2])
+        if low <= 0 or low > high:
+            raise ValueError("Invalid random wait range.")
+        distribution = args[3].lower() if len(args) == 4 else 'uniform'
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown random distribution: {distribution}")
+        program.randoms.append((low, high, distribution))
+        program.emit(WAIT_RANDOM, len(program.randoms) - 1)
+    else:
+        raise ValueError(f"Invalid statement: {' '.join(words)}")
+
+def compile_script(text):
+    """Compiles script text into a Program. Raises ValueError naming the offending line."""
+    program = Program()
+    # One entry per open block: (line number, counter or None for loop, index of its first op)
+    blocks = []
+    for number, line in enumerate(text.splitlines(), 1):
+        words = line.split('#', 1)[0].split()
+        if not words:
+            continue
+        command = words[0].lower()
+        try:
+            if command == 'repeat' and len(words) == 2:
+                counter = program.counters
+                program.counters += 1
+                program.emit(SET, counter, _count(words[1], "Repeat count"))
+                blocks.append((number, counter, len(program)))
+            elif command == 'loop' and len(words) == 1:
+                blocks.append((number, None, len(program)))
+            elif command == 'end' and len(words) == 1:
+                if not blocks:
+                    raise ValueError("end without repeat or loop")
+                _, counter, start = blocks.pop()
+                if counter is None:
+                    program.emit(JUMP, b=start)
+                else:
+                    program.emit(LOOP, counter, start)
+            else:
+                _compile_statement(program, words)
+        except ValueError as e:
+            raise ValueError(f"Line {number}: {e}")
+    if blocks:
+        raise ValueError(f"Line {blocks[-1][0]}: block is never closed with end")
+    if not any(op == CLICK or op == PRESS or op == KEY_DOWN for op in program.ops):
+        raise ValueError("The script never clicks or presses anything.")
+    return program
+
+def read_script(path):
+    """Reads and compiles a script file."""
+    try:
+        with open(path) as script_file:
+            text = script_file.read()
+    except OSError as e:
+        raise ValueError(f"Could not read the script: {e}")
+    return compile_script(text)
+
+def script_from_settings(settings):
+    """Writes ClickSettings as a script that clicks the same way."""
+    if settings.keys is not None:
+        raise ValueError("Repeated key presses can't be written as a script.")
+    if settings.click_type == 'drag' and settings.route is None:
+        raise ValueError("Drag clicks can't be written as a script.")
+    if settings.random_enabled:
+        wait = f"wait random {settings.random_min:g} {settings.random_max:g} {settings.random_distribution}"
+    else:
+        wait = f"wait {settings.interval:g}"
+    lines = ["# Generated from the click settings"]
+    if settings.repeat_count is not None and settings.route is None:
+        lines.append(f"repeat {settings.repeat_count}")
+    else:
+        lines.append("loop")
+    route = settings.route
+    if route is not None:
+        # One entry per click, repeats already expanded
+        for x, y, button, count, dwell in zip(route.xs, route.ys, route.buttons, route.counts, route.waits):
+            lines.append(f"    move {x} {y}")
+            lines.append(f"    click {route.button_names[button]} {count}")
+            lines.append(f"    wait {dwell:g}" if dwell > 0 else f"    {wait}")
+    else:
+        if settings.fixed_position:
+            lines.append(f"    move {settings.fixed_position[0]} {settings.fixed_position[1]}")
+        if settings.click_type == 'hold':
+            lines.append(f"    hold {settings.button} {settings.hold_time:g}")
+        elif settings.click_type == 'burst':
+            # Separate clicks back to back, not one multi-click
+            lines.append(f"    repeat {settings.burst_count}")
+            lines.append(f"        click {settings.button}")
+            lines.append("    end")
+        else:
+            lines.append(f"    {'double' if settings.click_type == 'double' else 'click'} {settings.button}")
+        lines.append(f"    {wait}")
+    lines.append("end")
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,237 @@
+"""
+Per-session click logs.
+
+With a SessionLog attached, every run of the engine writes one file into the
+log directory, named after the local time it started. The file is a short
+header followed by fixed-size little-endian records:
+
+    header: magic, version, record size, wall-clock start (time.time())
+    double  t        seconds since the run started
+    float   lateness seconds the click was late against its deadline
+    int32   x, y     where it clicked
+    uint8   kind     CLICK, KEYS, PAUSE, RESUME or END
+    uint8   button   mouse button index; for END, 1 if the run stopped with an error
+    uint8   count    clicks (2 for a double click, up to 255); for KEYS, keys and chords pressed
+
+At 24 bytes a click, a week of clicking at 10 CPS is about 145 MB. Records
+are packed into a preallocated buffer that is appended to the file when it
+fills up, every few seconds, on pauses and at the end of the run, so a crash
+loses at most the last few seconds.
+
+summarize() reads any number of logs through mmap, a chunk at a time, and
+keeps only counters and histograms, so days of logs are summarized in
+constant memory: totals, clicks per time bucket, and lateness and interval
+percentiles.
+"""
+import mmap
+import os
+import struct
+import time
+
+from .metrics import LatencyHistogram
+
+MAGIC = b'ACLOG\x00\x00\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sHH4xd')
+RECORD = struct.Struct('<dfiiBBBx')
+SUFFIX = '.aclog'
+
+# Record kinds
+CLICK = 0
+PAUSE = 1
+RESUME = 2
+END = 3
+KEYS = 4
+
+# Seconds between writes of the buffer while clicking
+FLUSH_INTERVAL = 5.0
+
+class SessionLog:
+    """
+    Writes a log file per run into directory. Give it to a ClickEngine as
+    session_log; only the clicking thread writes to it.
+    """
+    def __init__(self, directory, buffer_records=4096, flush_interval=FLUSH_INTERVAL):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.path = None
+        self.records = 0
+        self._buffer = bytearray(RECORD.size * buffer_records)
+        self._offset = 0
+        self._file = None
+        self._start = 0.0
+        self._flushed = 0.0
+
+    def __getstate__(self):
+        # Only the directory crosses into an engine process; the child opens its own files
+        return {'directory': self.directory, 'flush_interval': self.flush_interval,
+                'buffer_records': len(self._buffer) // RECORD.size}
+
+    def __setstate__(self, state):
+        self.__init__(state['directory'], state['buffer_records'], state['flush_interval'])
+
+    @property
+    def active(self):
+        return self._file is not None
+
+    def begin(self, start):
+        """Creates the log file of a run that started at time.perf_counter() value start."""
+        os.makedirs(self.directory, exist_ok=True)
+        wall = time.time() - (time.perf_counter() - start)
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(wall))
+        self.path = os.path.join(self.directory, f"session-{stamp}-{int(wall * 1000) % 1000:03d}{SUFFIX}")
+        self._file = open(self.path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, wall))
+        self._start = start
+        self._flushed = start
+        self._offset = 0
+        self.records = 0
+
+    def _write(self, t, kind, lateness=0.0, x=0, y=0, button=0, count=0):
+        RECORD.pack_into(self._buffer, self._offset, t - self._start, lateness, x, y, kind, button, count)
+        self._offset += RECORD.size
+        self.records += 1
+        if self._offset == len(self._buffer) or t - self._flushed >= self.flush_interval:
+            self.flush(t)
+
+    def click(self, t, x, y, button, count, lateness):
+        """Logs a click that started at perf_counter() time t."""
+        self._write(t, CLICK, lateness, x, y, button, min(count, 255))
+
+    def keys(self, t, strokes, lateness):
+        """Logs a tick that pressed keys instead of clicking."""
+        self._write(t, KEYS, lateness, count=min(strokes, 255))
+
+    def pause(self, t):
+        self._write(t, PAUSE)
+        self.flush(t)
+
+    def resume(self, t):
+        self._write(t, RESUME)
+
+    def end(self, t, error=None):
+        """Logs the end of the run and closes the file."""
+        self._write(t, END, button=1 if error else 0)
+        self.flush(t)
+        self._file.close()
+        self._file = None
+
+    def flush(self, t=None):
+        """Appends the buffered records to the file."""
+        self._file.write(memoryview(self._buffer)[:self._offset])
+        self._file.flush()
+        self._offset = 0
+        self._flushed = time.perf_counter() if t is None else t
+
+def log_files(paths):
+    """Expands directories to the logs in them; returns the paths sorted by name, which is start time."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in os.listdir(path) if name.endswith(SUFFIX))
+        else:
+            files.append(path)
+    return sorted(files, key=os.path.basename)
+
+def read_log(path, chunk_records=65536):
+    """
+    Yields the wall-clock start of a log, then its (t, lateness, x, y, kind,
+    button, count) records. The file is mapped into memory and unpacked
+    chunk_records at a time, so only one chunk is ever copied. A partly
+    written last record is ignored.
+    """
+    with open(path, 'rb') as log_file:
+        size = os.fstat(log_file.fileno()).st_size
+        if size < HEADER.size:
+            raise ValueError(f"Not a session log: {path}")
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, version, record_size, wall = HEADER.unpack_from(data)
+            if magic != MAGIC or record_size != RECORD.size:
+                raise ValueError(f"Not a session log: {path}")
+            if version > VERSION:
+                raise ValueError(f"Session log {path} needs a newer version of the auto clicker.")
+            yield wall
+            end = size - (size - HEADER.size) % RECORD.size
+            chunk_size = RECORD.size * chunk_records
+            for offset in range(HEADER.size, end, chunk_size):
+                yield from RECORD.iter_unpack(data[offset:min(offset + chunk_size, end)])
+
+class SessionSummary:
+    """Totals over any number of session logs, in constant memory apart from one counter per bucket."""
+    def __init__(self, bucket=3600.0):
+        self.bucket = bucket
+        self.sessions = 0
+        self.errors = 0
+        self.unfinished = 0
+        self.clicks = 0
+        # Ticks that pressed keys instead of clicking, and the keys and chords they pressed
+        self.key_ticks = 0
+        self.keystrokes = 0
+        self.pauses = 0
+        self.clicking_time = 0.0
+        self.paused_time = 0.0
+        self.first = None
+        self.last = None
+        # Bucket start (wall-clock seconds) -> clicks and key ticks in it
+        self.buckets = {}
+        self.lateness = LatencyHistogram()
+        self.interval = LatencyHistogram()
+
+    def add(self, path):
+        """Adds one log file."""
+        records = read_log(path)
+        wall = next(records)
+        bucket = self.bucket
+        buckets = self.buckets
+        record_lateness = self.lateness.record
+        record_interval = self.interval.record
+        last_click = None
+        paused_at = None
+        paused = 0.0
+        t = 0.0
+        ended = False
+        clicks = 0
+        for t, lateness, x, y, kind, button, count in records:
+            if kind == CLICK or kind == KEYS:
+                if kind == CLICK:
+                    clicks += 1
+                else:
+                    self.key_ticks += 1
+                    self.keystrokes += count
+                record_lateness(lateness)
+                if last_click is not None:
+                    record_interval(t - last_click)
+                last_click = t
+                key = (wall + t) // bucket * bucket
+                buckets[key] = buckets.get(key, 0) + 1
+            elif kind == PAUSE:
+                self.pauses += 1
+                paused_at = t
+                last_click = None
+            elif kind == RESUME:
+                if paused_at is not None:
+                    paused += t - paused_at
+                    paused_at = None
+            elif kind == END:
+                ended = True
+                self.errors += button
+        if paused_at is not None:
+            paused += t - paused_at
+        self.sessions += 1
+        self.unfinished += not ended
+        self.clicks += clicks
+        self.paused_time += paused
+        self.clicking_time += t - paused
+        self.first = wall if self.first is None else min(self.first, wall)
+        self.last = wall + t if self.last is None else max(self.last, wall + t)
+
+    def average_cps(self):
+        """Clicks and key ticks per second of clicking time, leaving out pauses."""
+        return (self.clicks + self.key_ticks) / self.clicking_time if self.clicking_time > 0 else 0.0
+
+def summarize(paths, bucket=3600.0):
+    """Summarizes the logs at paths (files or directories of logs)."""
+    summary = SessionSummary(bucket)
+    for path in log_files(paths):
+        summary.add(path)
+    return summary
@@ -0,0 +1,366 @@
+"""
+Click settings shared by the GUI and the headless engine.
+
+Settings are stored in the [SETTINGS] section of auto_clicker_settings.cfg as
+plain strings. ClickSettings turns those strings into validated values the
+engine can run with, so the GUI and the command line accept exactly the same
+configuration.
+
+Named profiles live in [PROFILE <name>] sections of the same file and
+override the [SETTINGS] values; the 'profile' key of [SETTINGS] names the
+one in use, and the built-in Default profile is [SETTINGS] itself.
+"""
+import configparser
+import os
+import sys
+
+from .backends import BUTTON_NAMES
+from .intervals import DISTRIBUTIONS
+from .keypress import parse_keys
+from .motion import MOTION_STYLES
+from .routes import Route, parse_sequence
+from .scheduler import DeadlineScheduler
+from .screen import TRIGGER_MODES, ScreenTrigger, parse_color, parse_region, read_ppm
+from .script import read_script
+
+CONFIG_FILE = 'auto_clicker_settings.cfg'
+CONFIG_SECTION = 'SETTINGS'
+# Environment variable that points at a settings file to use instead of the usual one
+CONFIG_ENV = 'AUTOCLICKER_CONFIG'
+PROFILE_SECTION_PREFIX = 'PROFILE '
+DEFAULT_PROFILE = 'Default'
+# Click jobs that run side by side are stored in sections named "JOB <name>"
+JOB_SECTION_PREFIX = 'JOB '
+# Settings jobs can't use, so they don't inherit them from [SETTINGS]
+JOB_UNINHERITED = ('script', 'trigger', 'motion')
+
+# hold presses the button for hold_time, drag moves it to drag_to meanwhile,
+# and burst clicks burst_count times back to back
+CLICK_TYPES = ('single', 'double', 'hold', 'drag', 'burst')
+
+# Default value of every click-related key, as it would appear in the config file
+DEFAULTS = {
+    'interval': '1.0',
+    'interval_unit': 'seconds',
+    'click_type': 'single',
+    'mouse_button': 'left',
+    'hold_time': '0.1',
+    'drag_to': '',
+    'burst_count': '10',
+    'location': 'current',
+    'sequence': '',
+    'repeat': 'infinite',
+    'repeat_count': '100',
+    'pre_start_delay': '0',
+    'random_interval_enabled': 'False',
+    'random_interval_min': '0.1',
+    'random_interval_max': '0.5',
+    'random_distribution': 'uniform',
+    'random_seed': '',
+    'precise_timing': 'False',
+    'catch_up': DeadlineScheduler.SKIP,
+    'adaptive_rate': 'False',
+    'motion': 'off',
+    'motion_time': '0.15',
+    'motion_rate': '120',
+    'motion_jitter': '1.0',
+    'trigger': 'off',
+    'trigger_region': '',
+    'trigger_color': '',
+    'trigger_template': '',
+    'trigger_tolerance': '0',
+    'trigger_rate': '60',
+    'trigger_action': 'click',
+    'script': '',
+    'keys': '',
+}
+
+def get_click_interval(value_str, unit):
+    """Calculates the click interval in seconds from a numeric string and its unit."""
+    if not value_str:
+        raise ValueError("Click speed value cannot be empty.")
+    value = float(value_str)
+    if value <= 0: raise ValueError("Click speed value must be a positive number.")
+
+    unit = unit.lower()
+    if unit == 'seconds':
+        return value
+    elif unit == 'ms':
+        return value / 1000.0
+    elif unit == 'cps':
+        return 1.0 / value
+    elif unit == 'cpm':
+        return 60.0 / value
+    raise ValueError(f"Unknown click speed unit: {unit}")
+
+def user_config_dir():
+    """The per-user directory the settings are kept in."""
+    if sys.platform == 'win32':
+        base = os.environ.get('APPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Application Support')
+    else:
+        base = os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+    return os.path.join(base, 'autoclicker')
+
+def config_path():
+    """
+    Where the settings file is: the path in $AUTOCLICKER_CONFIG if set, else
+    auto_clicker_settings.cfg in the working directory if there is one
+    (earlier versions always kept it there), else the per-user config directory.
+    """
+    if os.environ.get(CONFIG_ENV):
+        return os.environ[CONFIG_ENV]
+    if os.path.exists(CONFIG_FILE):
+        return os.path.abspath(CONFIG_FILE)
+    return os.path.join(user_config_dir(), CONFIG_FILE)
+
+def profile_values(config, profile=None):
+    """
+    Merges the defaults, [SETTINGS] and the profile's section of a parsed
+    config. Without a profile name, the one selected in [SETTINGS] is used.
+    """
+    values = dict(DEFAULTS)
+    if config.has_section(CONFIG_SECTION):
+        values.update(config[CONFIG_SECTION])
+        if profile is None:
+            profile = config[CONFIG_SECTION].get('profile')
+    if profile and profile != DEFAULT_PROFILE:
+        section = PROFILE_SECTION_PREFIX + profile
+        if not config.has_section(section):
+            raise ValueError(f"Unknown profile: {profile}")
+        values.update(config[section])
+    return values
+
+def read_config(config_file=None, profile=None):
+    """
+    Reads the settings of a profile (by default the selected one) from a
+    config file, filling in defaults for missing keys.
+    """
+    config = configparser.ConfigParser()
+    config.read(config_path() if config_file is None else config_file)
+    return profile_values(config, profile)
+
+def read_jobs(config_file=None):
+    """
+    Reads the [JOB <name>] sections of a config file. A job starts from the
+    [SETTINGS] values, except for the script, trigger and motion that jobs
+    can't use, and overrides whichever keys its own section sets. Returns (name, values)
+    pairs in the order they appear in the file.
+    """
+    if config_file is None:
+        config_file = config_path()
+    config = configparser.ConfigParser()
+    config.read(config_file)
+    base = read_config(config_file, DEFAULT_PROFILE)
+    for key in JOB_UNINHERITED:
+        base[key] = DEFAULTS[key]
+    jobs = []
+    for section in config.sections():
+        if section.startswith(JOB_SECTION_PREFIX):
+            values = dict(base)
+            values.update(config[section])
+            jobs.append((section[len(JOB_SECTION_PREFIX):], values))
+    return jobs
+
+def is_true(value):
+    """Interprets a config string the same way ConfigParser.getboolean does."""
+    return str(value).strip().lower() in ('1', 'yes', 'true', 'on')
+
+class ClickSettings:
+    """
+    Validated settings for one clicking run.
+
+    Build it with from_config() from the string values stored in the config
+    file (or collected from the GUI); any invalid value raises ValueError with
+    a message suitable for showing to the user.
+    """
+    def __init__(self, interval, button='left', click_type='single', repeat_count=None, fixed_position=None,
+                 pre_start_delay=0.0, random_enabled=False, random_min=0.0, random_max=0.0,
+                 precise_timing=False, catch_up=DeadlineScheduler.SKIP, random_distribution='uniform', random_seed=None,
+                 route=None, adaptive_rate=False, motion='off', motion_time=0.15, motion_rate=120.0, motion_jitter=1.0,
+                 trigger=None, script=None, keys=None, hold_time=0.1, drag_to=None, burst_count=10):
+        self.interval = interval
+        self.button = button
+        self.click_type = click_type
+        self.repeat_count = repeat_count
+        self.fixed_position = fixed_position
+        self.pre_start_delay = pre_start_delay
+        self.random_enabled = random_enabled
+        self.random_min = random_min
+        self.random_max = random_max
+        self.precise_timing = precise_timing
+        self.catch_up = catch_up
+        self.random_distribution = random_distribution
+        self.random_seed = random_seed
+        # A routes.Route when clicking a sequence of targets; overrides the position, button and click type
+        self.route = route
+        # Pace clicks with a scheduler.RateController instead of fixed deadlines
+        self.adaptive_rate = adaptive_rate
+        # Humanized cursor movement to each target (see autoclicker.motion): the
+        # style, how long before the click it starts, moves per second and jitter in pixels
+        self.motion = motion
+        self.motion_time = motion_time
+        self.motion_rate = motion_rate
+        self.motion_jitter = motion_jitter
+        # A screen.ScreenTrigger when clicks wait for, or targets follow, a screen region
+        self.trigger = trigger
+        # A compiled script.Program that replaces the click loop
+        self.script = script
+        # A keypress.KeySequence pressed on every tick instead of clicking
+        self.keys = keys
+        # Seconds a hold or drag click keeps the button down, where a drag
+        # ends as an (x, y) tuple, and the clicks of a burst
+        self.hold_time = hold_time
+        self.drag_to = drag_to
+        self.burst_count = burst_count
+
+    @classmethod
+    def from_config(cls, values):
+        """Validates a mapping of config keys to strings and builds the settings from it."""
+        values = dict(DEFAULTS, **values)
+        interval = get_click_interval(values['interval'], values['interval_unit'])
+
+        pre_start_delay_str = values['pre_start_delay']
+        if not pre_start_delay_str: raise ValueError("Pre-start delay cannot be empty.")
+        pre_start_delay = float(pre_start_delay_str)
+        if pre_start_delay < 0: raise ValueError("Pre-start delay cannot be negative.")
+
+        random_enabled = is_true(values['random_interval_enabled'])
+        random_min, random_max = 0, 0
+        if random_enabled:
+            random_min_str = values['random_interval_min']
+            random_max_str = values['random_interval_max']
+            if not random_min_str or not random_max_str:
+                raise ValueError("Random interval values cannot be empty.")
+            random_min = float(random_min_str)
+            random_max = float(random_max_str)
+            if random_min <= 0 or random_max <= 0 or random_min > random_max:
+                raise ValueError("Invalid random interval range.")
+        random_distribution = values['random_distribution']
+        if random_distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown random distribution: {random_distribution}")
+        random_seed = None
+        if values['random_seed'].strip():
+            try:
+                random_seed = int(values['random_seed'])
+            except ValueError:
+                raise ValueError("Random seed must be a whole number.")
+            if random_seed < 0: raise ValueError("Random seed cannot be negative.")
+
+        button = values['mouse_button']
+        if button not in BUTTON_NAMES:
+            raise ValueError(f"Unknown mouse button: {button}")
+        click_type = values['click_type']
+        if click_type not in CLICK_TYPES:
+            raise ValueError(f"Unknown click type: {click_type}")
+        try:
+            hold_time = float(values['hold_time'])
+            burst_count = int(values['burst_count'])
+        except ValueError:
+            raise ValueError("Hold time and burst count must be numbers.")
+        if hold_time <= 0: raise ValueError("Hold time must be positive.")
+        if not 1 <= burst_count <= 1000: raise ValueError("Burst count must be between 1 and 1000.")
+        drag_to = None
+        if click_type == 'drag':
+            try:
+                x, y = values['drag_to'].split(',')
+                drag_to = (int(x), int(y))
+            except ValueError:
+                raise ValueError("Please set where the drag ends as x,y.")
+
+        fixed_position = None
+        if values['location'] == 'fixed':
+            try:
+                fixed_position = (int(values['fixed_location_x']), int(values['fixed_location_y']))
+            except (KeyError, ValueError):
+                raise ValueError("Please pick a fixed location first.")
+        route = None
+        if values['location'] == 'sequence':
+            route = Route(parse_sequence(values['sequence']))
+
+        repeat_count = None
+        if values['repeat'] == 'count':
+            repeat_count_str = values['repeat_count']
+            if not repeat_count_str: raise ValueError("Repeat count cannot be empty.")
+            repeat_count = int(repeat_count_str)
+            if repeat_count <= 0: raise ValueError("Repeat count must be a positive integer.")
+
+        catch_up = values['catch_up']
+        if catch_up not in DeadlineScheduler.CATCH_UP_POLICIES:
+            raise ValueError(f"Unknown catch-up policy: {catch_up}")
+
+        motion = values['motion']
+        if motion not in MOTION_STYLES:
+            raise ValueError(f"Unknown motion style: {motion}")
+        try:
+            motion_time = float(values['motion_time'])
+            motion_rate = float(values['motion_rate'])
+            motion_jitter = float(values['motion_jitter'])
+        except ValueError:
+            raise ValueError("Motion time, rate and jitter must be numbers.")
+        if motion_time <= 0 or motion_rate <= 0: raise ValueError("Motion time and rate must be positive.")
+        if motion_jitter < 0: raise ValueError("Motion jitter cannot be negative.")
+
+        trigger = None
+        if values['trigger'] not in TRIGGER_MODES:
+            raise ValueError(f"Unknown trigger mode: {values['trigger']}")
+        if values['trigger'] != 'off':
+            if not values['trigger_region'].strip(): raise ValueError("Please set a trigger region first.")
+            region = parse_region(values['trigger_region'])
+            color = parse_color(values['trigger_color']) if values['trigger'] == 'color' else None
+            template = None
+            if values['trigger'] == 'template':
+                if not values['trigger_template'].strip(): raise ValueError("Please pick a trigger template image.")
+                width, height, template = read_ppm(values['trigger_template'])
+                if (width, height) != region[2:]:
+                    raise ValueError(f"The trigger template is {width}x{height} but the region is {region[2]}x{region[3]}.")
+            try:
+                tolerance = int(values['trigger_tolerance'])
+                trigger_rate = float(values['trigger_rate'])
+            except ValueError:
+                raise ValueError("Trigger tolerance and rate must be numbers.")
+            if values['trigger_action'] == 'next' and route is None:
+                raise ValueError("Switching targets on a trigger needs a sequence.")
+            trigger = ScreenTrigger(values['trigger'], region, color, template, tolerance, trigger_rate,
+                                    values['trigger_action'])
+
+        script = read_script(values['script']) if values['script'].strip() else None
+
+        keys = None
+        if values['keys'].strip():
+            keys = parse_keys(values['keys'])
+            if route is not None:
+                raise ValueError("Key presses can't be combined with a sequence.")
+            if script is not None:
+                raise ValueError("Key presses can't be combined with a click script.")
+
+        return cls(interval, button, click_type, repeat_count, fixed_position, pre_start_delay,
+                   random_enabled, random_min, random_max, is_true(values['precise_timing']), catch_up,
+                   random_distribution, random_seed, route, is_true(values['adaptive_rate']),
+                   motion, motion_time, motion_rate, motion_jitter, trigger, script, keys,
+                   hold_time, drag_to, burst_count)
+
+    def update(self, **changes):
+        """
+        Changes the interval (in seconds) or the fixed position (an (x, y)
+        tuple, or None for the cursor position) in place. The engines read
+        both on every click, so this retargets a run in progress; they run
+        with their own copy, so cached settings are never changed by it.
+        """
+        for name, value in changes.items():
+            if self.script is not None:
+                raise ValueError("Settings can't be changed while running a script.")
+            if name == 'interval':
+                if self.random_enabled:
+                    raise ValueError("The interval can't be changed while random intervals are on.")
+                value = float(value)
+                if not value > 0: raise ValueError("Click speed value must be a positive number.")
+            elif name == 'fixed_position':
+                if self.route is not None:
+                    raise ValueError("The location can't be changed while clicking a sequence.")
+                if value is not None:
+                    value = (int(value[0]), int(value[1]))
+            else:
+                raise ValueError(f"Unknown setting: {name}")
+            setattr(self, name, value)
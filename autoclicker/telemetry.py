@@ -0,0 +1,97 @@
+"""
+Status reporting from the click engine to whatever displays it.
+
+The clicking thread never calls into the GUI. It publishes state changes to
+a StatusChannel and counts clicks in a plain integer. Readers poll both at
+their own pace, for example 20 times a second from the Tk event loop, so the
+click rate and the redraw rate are independent and a fast engine cannot flood
+the UI with stale updates.
+
+Nothing here takes a lock. Publishing swaps in one immutable tuple, which
+is a single atomic reference assignment, and transitions are also appended
+to a bounded deque, whose append and popleft are thread-safe. Readers that
+would rather be woken than poll, like an asyncio event loop, can subscribe a
+listener, which is called on every state change but never per click.
+"""
+import time
+from collections import deque, namedtuple
+
+# What a reader sees at one poll
+Status = namedtuple('Status', ['state', 'detail', 'clicks', 'cps', 'average_cps', 'error'])
+
+class StatusChannel:
+    """
+    Latest engine state plus a short queue of the transitions that led to it.
+
+    States are 'idle', 'starting' (detail is the pre-start delay), 'clicking',
+    'paused' (detail is the pause latency in seconds), 'limited' (clicking,
+    but the backend is too slow for the target rate; detail is the rate it
+    allows) and 'stopped'. error holds the message of the exception that
+    ended the last run, if any.
+    """
+    def __init__(self, max_events=64):
+        self._record = ('idle', None, None)
+        self._events = deque(maxlen=max_events)
+        self._listeners = ()
+
+    def publish(self, state, detail=None, error=None):
+        """Called by the engine whenever its state changes."""
+        record = (state, detail, error)
+        self._record = record
+        self._events.append(record)
+        for listener in self._listeners:
+            listener(state, detail, error)
+
+    def subscribe(self, listener):
+        """
+        Calls listener(state, detail, error) after every publish, on the
+        publishing thread, so it must be quick and must not block; handing
+        the call to another thread, e.g. with loop.call_soon_threadsafe, is
+        the usual thing to do.
+        """
+        # Replaced, not mutated, so a publish in progress keeps iterating the old tuple
+        self._listeners = self._listeners + (listener,)
+
+    def unsubscribe(self, listener):
+        self._listeners = tuple(other for other in self._listeners if other is not listener)
+
+    def current(self):
+        """Returns the latest (state, detail, error) tuple."""
+        return self._record
+
+    def drain(self):
+        """Returns the (state, detail, error) transitions published since the last drain, oldest first."""
+        events = []
+        popleft = self._events.popleft
+        while True:
+            try:
+                events.append(popleft())
+            except IndexError:
+                return events
+
+class StatusPoller:
+    """
+    Builds Status snapshots of an engine for a reader that polls it regularly.
+
+    The instantaneous CPS is the number of clicks since the previous poll
+    divided by the time since then, so it needs no work from the clicking thread.
+    """
+    def __init__(self, engine, clock=time.perf_counter):
+        self.engine = engine
+        self.clock = clock
+        self._last_clicks = 0
+        self._last_time = clock()
+
+    def poll(self):
+        """Returns a Status snapshot of the engine right now."""
+        engine = self.engine
+        state, detail, error = engine.status.current()
+        now = self.clock()
+        clicks = engine.clicks_done
+        elapsed = now - self._last_time
+        delta = clicks - self._last_clicks
+        # A new run resets the counter
+        cps = delta / elapsed if delta >= 0 and elapsed > 0 and state in ('clicking', 'limited') else 0.0
+        self._last_clicks = clicks
+        self._last_time = now
+        return Status(state, detail, clicks, cps, engine.achieved_cps(), error)
@@ -0,0 +1,136 @@
+"""
+Per-phase tracing of the click loop.
+
+When clicks come out slower than configured, the engine's histograms show
+that something is late but not which part of the loop the time went to. A
+PhaseTrace given to a ClickEngine records, for every click, the
+time.perf_counter() value at each phase boundary:
+
+    deadline    when the click was due
+    wait_start  the loop started waiting for it
+    woke        the wait returned (woke - deadline is the sleep overshoot)
+    moved       the cursor move returned (same as woke without one)
+    clicked     the click call returned
+    recorded    the metrics were recorded and the next interval chosen
+    scheduled   the next deadline was set
+
+Rows go into one preallocated array of doubles used as a ring buffer, so
+tracing never allocates and keeps only the last capacity clicks of a long
+run. Without a trace the engine skips every timestamp, so tracing costs
+nothing unless it is switched on.
+
+The trace can be saved as CSV (one row per click, with the phase durations
+in microseconds) or as Chrome trace event JSON, which chrome://tracing and
+Perfetto show as a timeline with one slice per phase.
+"""
+import json
+from array import array
+
+FIELDS = ('deadline', 'wait_start', 'woke', 'moved', 'clicked', 'recorded', 'scheduled')
+FIELD_COUNT = len(FIELDS)
+# Phase name -> (start field, end field)
+PHASES = (
+    ('wait', 'wait_start', 'woke'),
+    ('move', 'woke', 'moved'),
+    ('click', 'moved', 'clicked'),
+    ('bookkeeping', 'clicked', 'recorded'),
+    ('schedule', 'recorded', 'scheduled'),
+)
+DEFAULT_CAPACITY = 100000
+
+class PhaseTrace:
+    """
+    Ring buffer of phase timestamps for the last capacity clicks.
+
+    If path is set, the engine saves the trace there when a run ends, in
+    Chrome trace format if the path ends in .json and as CSV otherwise.
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY, path=None):
+        if capacity <= 0:
+            raise ValueError("Trace capacity must be a positive integer.")
+        self.capacity = capacity
+        self.path = path
+        self.rows = array('d', [0.0]) * (capacity * FIELD_COUNT)
+        self.count = 0
+        self._next = 0
+        self._end = len(self.rows)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def clear(self):
+        self.count = 0
+        self._next = 0
+
+    def record(self, deadline, wait_start, woke, moved, clicked, recorded, scheduled):
+        """Stores the phase boundaries of one click. Called by the engine."""
+        rows = self.rows
+        i = self._next
+        rows[i] = deadline
+        rows[i + 1] = wait_start
+        rows[i + 2] = woke
+        rows[i + 3] = moved
+        rows[i + 4] = clicked
+        rows[i + 5] = recorded
+        rows[i + 6] = scheduled
+        i += FIELD_COUNT
+        self._next = 0 if i == self._end else i
+        self.count += 1
+
+    def iter_rows(self):
+        """Yields the recorded rows as tuples in FIELDS order, oldest first."""
+        rows = self.rows
+        start = self._next if self.count > self.capacity else 0
+        for n in range(len(self)):
+            i = (start + n * FIELD_COUNT) % self._end
+            yield tuple(rows[i:i + FIELD_COUNT])
+
+    def phase_means(self):
+        """Mean duration of each phase in seconds, plus 'late' for the mean sleep overshoot."""
+        totals = dict.fromkeys([name for name, _, _ in PHASES] + ['late'], 0.0)
+        index = {field: i for i, field in enumerate(FIELDS)}
+        count = 0
+        for row in self.iter_rows():
+            count += 1
+            for name, start, end in PHASES:
+                totals[name] += row[index[end]] - row[index[start]]
+            totals['late'] += row[index['woke']] - row[index['deadline']]
+        return {name: total / count for name, total in totals.items()} if count else totals
+
+    def save(self, path=None):
+        """Writes the trace to path (default: self.path); .json gets Chrome trace format, anything else CSV."""
+        path = path or self.path
+        if path.lower().endswith('.json'):
+            self.save_chrome(path)
+        else:
+            self.save_csv(path)
+
+    def save_csv(self, path):
+        index = {field: i for i, field in enumerate(FIELDS)}
+        with open(path, 'w') as trace_file:
+            columns = ['click'] + list(FIELDS) + [f'{name}_us' for name, _, _ in PHASES] + ['late_us']
+            trace_file.write(','.join(columns) + '\n')
+            first = self.count - len(self)
+            for n, row in enumerate(self.iter_rows()):
+                durations = [(row[index[end]] - row[index[start]]) * 1e6 for _, start, end in PHASES]
+                durations.append((row[index['woke']] - row[index['deadline']]) * 1e6)
+                trace_file.write(f"{first + n}," + ','.join(f"{value:.9f}" for value in row) + ','
+                                 + ','.join(f"{value:.3f}" for value in durations) + '\n')
+
+    def save_chrome(self, path):
+        """Writes Chrome trace events: one complete ('X') event per phase per click, times in microseconds."""
+        index = {field: i for i, field in enumerate(FIELDS)}
+        events = []
+        origin = None
+        first = self.count - len(self)
+        for n, row in enumerate(self.iter_rows()):
+            if origin is None:
+                origin = row[index['wait_start']]
+            for name, start, end in PHASES:
+                event = {'name': name, 'ph': 'X', 'pid': 1, 'tid': 1,
+                         'ts': (row[index[start]] - origin) * 1e6, 'dur': (row[index[end]] - row[index[start]]) * 1e6}
+                if name == 'wait':
+                    event['args'] = {'click': first + n, 'late_us': (row[index['woke']] - row[index['deadline']]) * 1e6}
+                events.append(event)
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)